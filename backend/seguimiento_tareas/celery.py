@@ -12,10 +12,26 @@ app.autodiscover_tasks()
 from celery.schedules import crontab
 
 app.conf.beat_schedule = {
-    'check-tasks-every-minute': {
-        'task': 'tareas.tasks.check_task_due_dates',
+    'fire-due-reminders': {
+        'task': 'tareas.tasks.fire_due_reminders',
         'schedule': 10
     },
+    'dispatch-pending-emails': {
+        'task': 'tareas.tasks.dispatch_pending_emails',
+        'schedule': 60
+    },
+    'reconcile-unread-notifications': {
+        'task': 'tareas.tasks.reconcile_unread_notifications',
+        'schedule': 600
+    },
+    'fail-stale-imports': {
+        'task': 'tareas.tasks.fail_stale_task_imports',
+        'schedule': 300
+    },
+    'archive-old-notifications': {
+        'task': 'tareas.tasks.archive_old_notifications',
+        'schedule': crontab(hour=3, minute=30)
+    },
 }
 
 
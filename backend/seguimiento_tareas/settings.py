@@ -107,6 +107,9 @@ DATABASES = {
         'PASSWORD': 'seguimiento_pass',
         'HOST': 'db',
         'PORT': '3306',
+        # Cada request en una transacción: el outbox de emails se
+        # despacha recién cuando hace commit
+        'ATOMIC_REQUESTS': True,
     }
 }
 
@@ -155,20 +158,99 @@ REST_FRAMEWORK = {
 'DEFAULT_RENDERER_CLASSES': [ 'rest_framework.renderers.JSONRenderer', #'rest_framework.renderers.TemplateHTMLRenderer', 
                              'rest_framework.renderers.BrowsableAPIRenderer', 
                                ], 
-'DEFAULT_AUTHENTICATION_CLASSES': [ 'rest_framework.authentication.SessionAuthentication', 'rest_framework_simplejwt.authentication.JWTAuthentication', ], 
+'DEFAULT_AUTHENTICATION_CLASSES': [ 'rest_framework.authentication.SessionAuthentication', 'users.authentication.VersionedJWTAuthentication', ], 
 'DEFAULT_PERMISSION_CLASSES': ( 'rest_framework.permissions.AllowAny', ) }
 
+# Paginación por cursor (opcional) de tareas, comentarios y notificaciones.
+# Solo se activa si el cliente manda ?cursor= o ?page_size=
+KEYSET_PAGINATION = {
+    "PAGE_SIZE": 50,
+    "MAX_PAGE_SIZE": 200,
+}
+
 # =========================
 # SIMPLE JWT (CLAVE)
 # =========================
 SIMPLE_JWT = {
-    "ACCESS_TOKEN_LIFETIME": timedelta(minutes=5),
+    # El claim "ver" permite invalidar tokens al cambiar rol, contraseña
+    # o baja del usuario, así el access puede durar más que 5 minutos
+    "ACCESS_TOKEN_LIFETIME": timedelta(minutes=30),
     "REFRESH_TOKEN_LIFETIME": timedelta(days=1),
 
     "ROTATE_REFRESH_TOKENS": True,
     "BLACKLIST_AFTER_ROTATION": False,
 
     "AUTH_HEADER_TYPES": ("Bearer",),
+
+    "TOKEN_OBTAIN_SERIALIZER": "users.tokens.RoleTokenObtainPairSerializer",
+    "TOKEN_REFRESH_SERIALIZER": "users.tokens.VersionedTokenRefreshSerializer",
+}
+
+# Email primero (una consulta); usuario + contraseña para el admin y /api/token/
+AUTHENTICATION_BACKENDS = [
+    "users.backends.EmailBackend",
+    "django.contrib.auth.backends.ModelBackend",
+]
+
+
+# =========================
+# CACHE (REDIS)
+# =========================
+# Estadísticas del dashboard, contadores de no leídas, etc.
+CACHES = {
+    "default": {
+        "BACKEND": "django.core.cache.backends.redis.RedisCache",
+        "LOCATION": "redis://redis:6379/2",
+    }
+}
+
+
+# Rol / perfil por usuario: LRU en cada proceso + Redis
+PROFILE_CACHE = {
+    "TIMEOUT": 3600,      # segundos en Redis
+    "LOCAL_SIZE": 2048,   # usuarios en el LRU de cada proceso
+    "LOCAL_TTL": 5,       # segundos que un worker confía en su copia local
+}
+
+
+# =========================
+# DASHBOARD
+# =========================
+# Segundos que se cachean las estadísticas de /api/tasks/stats/ por usuario
+TASK_STATS_CACHE_TIMEOUT = 30
+
+# Respuesta de /api/tasks/ por usuario; se invalida al subir la versión
+# de visibilidad (tareas/list_cache.py). El timeout acota lo que puede
+# quedar viejo lo que no sube la versión (nombre o rol de otro usuario)
+TASK_LIST_CACHE = {
+    "TIMEOUT": 300,
+}
+
+# Exportación de /api/tasks/export/: filas por consulta
+TASK_EXPORT = {
+    "CHUNK_SIZE": 2000,
+}
+
+# Búsqueda de tareas y comentarios (?search=). "auto" usa FULLTEXT en
+# MySQL y el índice invertido SearchToken en el resto (SQLite en desarrollo)
+TASK_SEARCH = {
+    "BACKEND": "auto",       # auto | fulltext | index
+    "MIN_TERM_LENGTH": 2,    # solo índice invertido; en MySQL manda innodb_ft_min_token_size
+}
+
+# Importación de tareas desde CSV (Celery)
+TASK_IMPORT = {
+    "BATCH_SIZE": 500,    # filas por transacción
+    "MAX_ERRORS": 500,    # errores por fila que se guardan en el job
+    "STALE_AFTER": 900,   # segundos sin avanzar para dar el job por caído
+}
+
+# Requests idénticos concurrentes esperan un solo cálculo (tareas/single_flight.py)
+SINGLE_FLIGHT = {
+    "LOCK_TIMEOUT": 30,      # segundos: si el worker muere, el lock vence solo
+    "WAIT_TIMEOUT": 10,      # segundos que se espera antes de calcular directo
+    "POLL_INTERVAL": 0.05,   # segundos entre consultas del resultado
+    "RESULT_TTL": 10,        # segundos que queda el resultado para los que esperan
 }
 
 
@@ -231,7 +313,53 @@ CELERY_ACCEPT_CONTENT = ["json"]
 CELERY_TASK_SERIALIZER = "json"
 CELERY_RESULT_BACKEND = "redis://redis:6379/0"
 
+# Los emails van a su propia cola para no demorar los recordatorios
+CELERY_TASK_ROUTES = {
+    "tareas.tasks.deliver_email": {"queue": "emails"},
+    "tareas.tasks.deliver_email_batch": {"queue": "emails"},
+}
+
+# Recordatorios por bloque en fire_due_reminders
+DUE_DATE_CHECK_CHUNK_SIZE = 500
+
+# Etapas de recordatorio por prioridad, en días respecto a due_date
+# (-3 = tres días antes, 0 = el día del vencimiento, 1 = ya vencida)
+TASK_REMINDER_POLICIES = {
+    "alta": [-3, -1, 0, 1, 3],
+    "media": [-1, 0, 1],
+    "baja": [0, 1],
+}
+
+# Hora local a la que se disparan los recordatorios de cada día
+TASK_REMINDER_HOUR = 8
+
+# Eventos en tiempo real (/api/events/). Para tests:
+# "LAYER": "tareas.realtime.InMemoryChannelLayer"
+REALTIME = {
+    "LAYER": "tareas.realtime.RedisChannelLayer",
+    "REDIS_URL": "redis://redis:6379/1",
+    "HEARTBEAT": 15,   # segundos entre pings del stream
+}
+
+# Outbox de emails (tareas.tasks.deliver_email)
+EMAIL_OUTBOX = {
+    "MAX_ATTEMPTS": 5,            # después queda como "fallido"
+    "RETRY_BACKOFF": 30,          # segundos del primer reintento
+    "RETRY_BACKOFF_MAX": 3600,
+    "STALE_AFTER": 300,           # pendientes sin despachar se reencolan
+    "DISPATCH_BATCH_SIZE": 500,
+}
+
 
+# =========================
+# RETENCIÓN DE NOTIFICACIONES
+# =========================
+NOTIFICATION_RETENTION = {
+    "READ_AFTER_DAYS": 30,        # leídas más viejas pasan al archivo
+    "UNREAD_AFTER_DAYS": 180,     # None = las no leídas no se archivan
+    "CHUNK_SIZE": 500,            # filas por transacción
+    "MAX_CHUNKS_PER_RUN": 200,
+}
 
 # =========================
 # EMAIL BACKEND (CONSOLE)
@@ -1,3 +1,26 @@
 from django.contrib import admin
 
-# Register your models here.
+from .models import EmailOutbox
+from .tasks import deliver_email
+
+
+@admin.register(EmailOutbox)
+class EmailOutboxAdmin(admin.ModelAdmin):
+    list_display = ("subject", "recipient_email", "status", "attempts", "created_at", "sent_at")
+    list_filter = ("status",)
+    search_fields = ("recipient_email", "subject")
+    actions = ["retry_emails"]
+
+    @admin.action(description="Reintentar envío")
+    def retry_emails(self, request, queryset):
+        email_ids = list(queryset.filter(status__in=["pendiente", "fallido"]).values_list("id", flat=True))
+        EmailOutbox.objects.filter(id__in=email_ids).update(
+            status="pendiente",
+            attempts=0,
+            next_attempt_at=None
+        )
+
+        for email_id in email_ids:
+            deliver_email.delay(email_id)
+
+        self.message_user(request, f"{len(email_ids)} emails reencolados")
@@ -0,0 +1,163 @@
+# tareas/bulk.py
+from collections import defaultdict
+
+from django.db import transaction
+from django.utils import timezone
+
+from .bulk_insert import bulk_insert
+from .events import emit_many, TaskCreated, TaskDelegated, StatusChanged
+from .list_cache import bump_visibility_versions, task_audience
+from .models import Task, TaskDelegation, TaskVisibility
+from .realtime import publish_task_change
+from .search import index_tasks
+from .reminders import OPEN_STATUS, schedule_many_task_reminders
+from .visibility import sync_task_visibility
+
+
+# =========================
+# EFECTOS QUE NO DISPARAN LAS SEÑALES
+# =========================
+# update() y bulk_create() no mandan post_save: lo que hacen los
+# receivers de signals.py (visibilidad, cache de listados, tiempo real)
+# se hace acá una vez para todo el lote.
+def publish_task_changes(task_ids, action):
+    def publish():
+        users_by_task = defaultdict(list)
+        rows = TaskVisibility.objects.filter(task_id__in=task_ids).values_list("task_id", "user_id")
+        for task_id, user_id in rows:
+            users_by_task[task_id].append(user_id)
+
+        for task_id in task_ids:
+            publish_task_change(task_id, action, users_by_task[task_id])
+
+    transaction.on_commit(publish)
+
+
+def after_bulk_write(task_ids, action, audience=frozenset(), users_changed=False):
+    """
+    `audience` son los usuarios que veían las tareas antes del cambio:
+    si cambió un usuario de la tarea, los que dejaron de verla también
+    tienen que refrescar su listado.
+    """
+    if users_changed:
+        sync_task_visibility(task_ids)
+
+    if action == "created":
+        index_tasks(task_ids)
+
+    bump_visibility_versions(set(audience) | task_audience(task_ids))
+    publish_task_changes(task_ids, action)
+
+
+def result(task, outcome):
+    return {"id": task.id, "result": outcome}
+
+
+# =========================
+# CAMBIO DE ESTADO
+# =========================
+def bulk_change_status(tasks, new_status, actor):
+    changed = [task for task in tasks if task.status != new_status]
+    results = [result(task, "unchanged") for task in tasks if task.status == new_status]
+
+    if not changed:
+        return results
+
+    ids = [task.id for task in changed]
+    old_status = {task.id: task.status for task in changed}
+    now = timezone.now()
+
+    # Mismo valor para todas: un UPDATE ... WHERE id IN (...)
+    Task.objects.filter(id__in=ids).update(status=new_status, updated_at=now)
+
+    for task in changed:
+        task.status = new_status
+        task.updated_at = now
+
+    reopened = {
+        task.id for task in changed
+        if old_status[task.id] not in OPEN_STATUS and new_status in OPEN_STATUS
+    }
+    schedule_many_task_reminders(changed, catch_up_ids=reopened)
+    after_bulk_write(ids, "updated")
+
+    # Un solo despacho para todo el lote: un bulk_create por tabla
+    emit_many(
+        StatusChanged(
+            task=task,
+            actor=actor,
+            old_status=old_status[task.id],
+            new_status=new_status
+        )
+        for task in changed
+    )
+    results += [result(task, "updated") for task in changed]
+
+    return results
+
+
+# =========================
+# DELEGAR / REASIGNAR
+# =========================
+def bulk_move(tasks, field, to_user, actor):
+    """
+    Delegación (`delegated_to`, como TaskSerializer.update) o
+    reasignación (`assigned_to`, como TaskViewSet.delegate). En los dos
+    casos queda una fila de historial por tarea.
+    """
+    changed = [task for task in tasks if getattr(task, f"{field}_id") != to_user.id]
+    results = [result(task, "unchanged") for task in tasks if getattr(task, f"{field}_id") == to_user.id]
+
+    if not changed:
+        return results
+
+    ids = [task.id for task in changed]
+    audience = task_audience(ids)
+    now = timezone.now()
+
+    TaskDelegation.objects.bulk_create([
+        TaskDelegation(task=task, from_user=actor, to_user=to_user)
+        for task in changed
+    ])
+    Task.objects.filter(id__in=ids).update(**{field: to_user, "updated_at": now})
+
+    for task in changed:
+        setattr(task, field, to_user)
+        task.updated_at = now
+
+    after_bulk_write(ids, "updated", audience=audience, users_changed=True)
+
+    emit_many(TaskDelegated(task=task, actor=actor, to_user=to_user) for task in changed)
+    results += [result(task, "updated") for task in changed]
+
+    return results
+
+
+# =========================
+# ALTA
+# =========================
+def bulk_create_tasks(items, actor):
+    """
+    `items` son (índice, datos validados, usuario asignado). Devuelve
+    los resultados en el mismo orden.
+    """
+    tasks = [
+        Task(created_by=actor, assigned_to=assigned_to or actor, **data)
+        for _, data, assigned_to in items
+    ]
+    if not tasks:
+        return []
+
+    # Los ids hacen falta para visibilidad, recordatorios y eventos
+    bulk_insert(tasks)
+
+    ids = [task.id for task in tasks]
+    schedule_many_task_reminders(tasks, catch_up_ids=set(ids))
+    after_bulk_write(ids, "created", users_changed=True)
+
+    emit_many(TaskCreated(task=task, actor=actor) for task in tasks)
+
+    return [
+        {"index": index, **result(task, "created")}
+        for (index, _, _), task in zip(items, tasks)
+    ]
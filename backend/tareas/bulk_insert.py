@@ -0,0 +1,35 @@
+# tareas/bulk_insert.py
+from django.db import connection
+
+
+BATCH_SIZE = 500
+
+
+def bulk_insert(objs, batch_size=BATCH_SIZE):
+    """
+    bulk_create que siempre deja los pk cargados. MySQL no los devuelve,
+    pero un INSERT ... VALUES de varias filas ("simple insert") recibe ids
+    consecutivos desde LAST_INSERT_ID(), en cualquier innodb_autoinc_lock_mode:
+    se leen en la misma conexión, después de cada bloque, y se asignan en orden.
+    """
+    objs = list(objs)
+    if not objs:
+        return objs
+
+    model = type(objs[0])
+
+    for start in range(0, len(objs), batch_size):
+        chunk = objs[start:start + batch_size]
+        model.objects.bulk_create(chunk)
+
+        if chunk[0].pk is not None:
+            continue
+
+        with connection.cursor() as cursor:
+            cursor.execute("SELECT LAST_INSERT_ID(), @@auto_increment_increment")
+            first_id, step = cursor.fetchone()
+
+        for offset, obj in enumerate(chunk):
+            obj.pk = first_id + offset * step
+
+    return objs
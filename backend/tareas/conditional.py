@@ -0,0 +1,52 @@
+# tareas/conditional.py
+import hashlib
+
+from django.core.exceptions import ImproperlyConfigured
+from django.utils.cache import get_conditional_response, patch_cache_control, patch_vary_headers
+from django.utils.http import quote_etag
+
+
+class ConditionalListMixin:
+    """
+    GET condicional para los listados que el frontend consulta cada
+    pocos segundos. Antes de serializar se calcula un validador barato
+    (un aggregate sobre el queryset); si el cliente manda el mismo ETag
+    se responde 304 sin tocar el serializer.
+
+    Las vistas definen list_validator(request, queryset), que devuelve
+    cualquier tupla que cambie cuando cambia el listado.
+
+    Solo hay ETag: Last-Modified tiene resolución de un segundo y no se
+    mueve con bajas ni con tareas que dejan de verse, así que no se manda
+    y un If-Modified-Since suelto no alcanza para un 304.
+    """
+
+    list_validator = None
+
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+        if cls.list_validator is None:
+            raise ImproperlyConfigured(f"{cls.__name__} tiene que definir list_validator")
+
+    def get_list_etag(self, request, parts):
+        raw = "|".join(str(part) for part in (request.user.pk, request.get_full_path(), *parts))
+        return quote_etag(hashlib.sha1(raw.encode()).hexdigest())
+
+    def list(self, request, *args, **kwargs):
+        queryset = self.filter_queryset(self.get_queryset())
+        etag = self.get_list_etag(request, self.list_validator(request, queryset))
+
+        not_modified = get_conditional_response(request, etag=etag)
+        if not_modified is not None:
+            return self.add_validator_headers(not_modified, etag)
+
+        response = super().list(request, *args, **kwargs)
+        return self.add_validator_headers(response, etag)
+
+    def add_validator_headers(self, response, etag):
+        response["ETag"] = etag
+
+        # El navegador guarda la respuesta pero revalida en cada poll
+        patch_cache_control(response, private=True, no_cache=True)
+        patch_vary_headers(response, ["Authorization"])
+        return response
@@ -17,3 +17,4 @@ def send_task_email(subject, message, recipient_email):
         recipient_list=[recipient_email],
         fail_silently=False
     )
+
@@ -0,0 +1,370 @@
+# tareas/events.py
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from uuid import uuid4
+
+from asgiref.local import Local
+from django.contrib.auth.models import User
+from django.db import transaction
+
+from .models import Task, Comment, TaskAttachment, Notification, EmailOutbox, TaskImportJob
+from .bulk_insert import bulk_insert
+from .realtime import publish_notifications
+from .unread import add_unread
+
+
+# =========================
+# EVENTOS DE DOMINIO
+# =========================
+@dataclass
+class TaskCreated:
+    task: Task
+    actor: User
+
+
+@dataclass
+class TaskDelegated:
+    task: Task
+    actor: User
+    to_user: User
+
+
+@dataclass
+class StatusChanged:
+    task: Task
+    actor: User
+    old_status: str
+    new_status: str
+
+
+@dataclass
+class TaskUpdated:
+    task: Task
+    actor: User
+    changes: list = field(default_factory=list)
+
+
+@dataclass
+class CommentAdded:
+    comment: Comment
+    actor: User
+
+
+@dataclass
+class AttachmentAdded:
+    attachment: TaskAttachment
+    actor: User
+
+
+@dataclass
+class TasksImported:
+    job: TaskImportJob
+    actor: User
+    assignee: User
+    count: int
+    first_task: Task
+
+
+@dataclass
+class Notice:
+    """
+    Lo que un evento le genera a un usuario: una notificación
+    (si `notify`) y/o un email (si hay `subject`). La notificación
+    guarda solo tipo, actor y `params`; el texto se arma al leerla.
+    """
+    user: User
+    task: Task
+    type: str
+    actor: User = None
+    params: dict = field(default_factory=dict)
+    notify: bool = True
+    subject: str = None
+    body: str = None
+
+    @property
+    def key(self):
+        return (self.user.id, self.task.id, self.type)
+
+
+# =========================
+# REGLAS DE DESTINATARIOS
+# =========================
+HANDLERS = {}
+
+
+def handles(event_class):
+    def register(handler):
+        HANDLERS[event_class] = handler
+        return handler
+    return register
+
+
+def involved_users(task, exclude=None):
+    users = {u for u in [task.created_by, task.assigned_to, task.delegated_to] if u}
+    users.discard(exclude)
+    return users
+
+
+def email_body(user, text):
+    return f"Hola {user.username},\n\n{text}\n\nIngresá al sistema para más detalles."
+
+
+@handles(TaskCreated)
+def on_task_created(event):
+    task, actor = event.task, event.actor
+
+    # Al asignado, aunque sea el mismo que la creó
+    if task.assigned_to:
+        yield Notice(
+            user=task.assigned_to,
+            task=task,
+            type="nueva",
+            actor=actor,
+            subject="Nueva tarea asignada",
+            body=email_body(
+                task.assigned_to,
+                f"Se te asignó una nueva tarea: {task.title}\n\nCreada por: {actor.username}"
+            ),
+        )
+
+    yield Notice(
+        user=actor,
+        task=task,
+        type="creada",
+        actor=actor,
+    )
+
+
+@handles(TaskDelegated)
+def on_task_delegated(event):
+    task, actor, to_user = event.task, event.actor, event.to_user
+
+    yield Notice(
+        user=to_user,
+        task=task,
+        type="delegacion",
+        actor=actor,
+        subject="Tarea delegada",
+        body=email_body(
+            to_user,
+            f"La tarea '{task.title}' fue delegada a vos.\n\nDelegada por: {actor.username}"
+        ),
+    )
+
+    if actor != to_user:
+        yield Notice(
+            user=actor,
+            task=task,
+            type="delegacion",
+            actor=actor,
+            params={"to": to_user.id},
+        )
+
+
+@handles(StatusChanged)
+def on_status_changed(event):
+    task = event.task
+
+    # Quien cambió el estado no se entera de su propio cambio
+    for user in involved_users(task, exclude=event.actor):
+        yield Notice(
+            user=user,
+            task=task,
+            type="estado",
+            actor=event.actor,
+            params={"old": event.old_status, "new": event.new_status},
+        )
+
+
+@handles(TaskUpdated)
+def on_task_updated(event):
+    task = event.task
+
+    # Solo email: los cambios de estado ya generan su notificación
+    for user in involved_users(task):
+        yield Notice(
+            user=user,
+            task=task,
+            type="actualizada",
+            notify=False,
+            subject=f"Tarea actualizada: {task.title}",
+            body=email_body(
+                user,
+                f"La tarea '{task.title}' ha sido actualizada:\n\n" + "\n".join(event.changes)
+            ),
+        )
+
+
+@handles(CommentAdded)
+def on_comment_added(event):
+    task = event.comment.task
+
+    if task.assigned_to:
+        yield Notice(
+            user=task.assigned_to,
+            task=task,
+            type="comentario",
+            actor=event.actor,
+        )
+
+
+@handles(AttachmentAdded)
+def on_attachment_added(event):
+    task, actor = event.attachment.task, event.actor
+    file_name = event.attachment.file.name.split('/')[-1]
+
+    for user in involved_users(task):
+        yield Notice(
+            user=user,
+            task=task,
+            type="archivo",
+            actor=actor,
+            params={"file": file_name},
+            subject=f"Nuevo archivo adjunto: {task.title}",
+            body=email_body(
+                user,
+                f"{actor.username} agregó un nuevo archivo a la tarea:\n"
+                f"Título: {task.title}\n"
+                f"Archivo: {file_name}"
+            ),
+        )
+
+
+@handles(TasksImported)
+def on_tasks_imported(event):
+    # Resumen por asignado: la notificación apunta a la primera tarea
+    if event.assignee == event.actor:
+        return
+
+    yield Notice(
+        user=event.assignee,
+        task=event.first_task,
+        type="importacion",
+        actor=event.actor,
+        params={"count": event.count, "job": event.job.id},
+        subject="Nuevas tareas asignadas",
+        body=email_body(
+            event.assignee,
+            f"{event.actor.username} te asignó {event.count} tareas nuevas por importación."
+        ),
+    )
+
+
+# =========================
+# DESPACHO
+# =========================
+def build_notices(events):
+    """
+    Avisos de los eventos, uno por (usuario, tarea, tipo).
+    """
+    notices = {}
+    for event in events:
+        for notice in HANDLERS[type(event)](event):
+            # El último gana: refleja el estado final de la tarea
+            notices[notice.key] = notice
+    return notices
+
+
+def dispatch(events):
+    """
+    Escribe las notificaciones y los emails de los eventos con un
+    bulk_insert por tabla. Corre dentro de la transacción de quien emite:
+    notificaciones y outbox se confirman o se descartan junto con el
+    cambio que los generó. Solo el contador, el tiempo real y Celery
+    esperan al commit.
+    """
+    notifications, emails = [], []
+
+    for n in build_notices(events).values():
+        if n.notify:
+            notifications.append(
+                Notification(user=n.user, task=n.task, type=n.type, actor=n.actor, params=n.params)
+            )
+        if n.subject and n.user.email:
+            emails.append(
+                EmailOutbox(recipient_email=n.user.email, subject=n.subject[:255], message=n.body, task=n.task)
+            )
+
+    from .tasks import deliver_email_batch
+
+    with transaction.atomic():
+        # El contador y el tiempo real usan los pk
+        bulk_insert(notifications)
+        if notifications:
+            # bulk_create no dispara post_save: se avisa a mano
+            transaction.on_commit(lambda: add_unread(notifications))
+            transaction.on_commit(lambda: publish_notifications(notifications))
+
+        if emails:
+            batch = uuid4().hex
+            for email in emails:
+                email.batch = batch
+            bulk_insert(emails)
+            transaction.on_commit(lambda: deliver_email_batch.delay(batch))
+
+
+_state = Local()
+
+
+@contextmanager
+def collect_events():
+    """
+    Junta los eventos emitidos adentro del bloque y los despacha una sola
+    vez al salir, sin excepción: una consulta por tabla aunque un request
+    emita varios eventos, y un aviso por (usuario, tarea, tipo).
+    Anidado, se suma al bloque de afuera. Vaciar la lista descarta lo emitido.
+
+    Lo emitido dentro de un savepoint que vuelve atrás y se atrapa adentro
+    del bloque se despacha igual: ese código tiene que emitir después.
+    """
+    events = getattr(_state, "events", None)
+    if events is not None:
+        yield events
+        return
+
+    events = _state.events = []
+    try:
+        yield events
+    finally:
+        _state.events = None
+
+    if events:
+        dispatch(events)
+
+
+class CollectEventsMixin:
+    """
+    Un solo despacho de eventos por request, dentro de la transacción de
+    ATOMIC_REQUESTS (un middleware corre afuera, después del commit).
+    Si la vista terminó en error no se despacha nada.
+    """
+
+    def dispatch(self, request, *args, **kwargs):
+        with collect_events() as events:
+            response = super().dispatch(request, *args, **kwargs)
+            # `exception` lo marca DRF; un 304 o un streaming no lo tienen
+            if getattr(response, "exception", False):
+                events.clear()
+        return response
+
+
+def emit_many(events):
+    """
+    Registra eventos de dominio. Dentro de collect_events() esperan al
+    final del bloque; si no, se despachan en el momento. Las operaciones
+    masivas emiten todos sus eventos en una llamada.
+    """
+    events = list(events)
+    if not events:
+        return
+
+    collected = getattr(_state, "events", None)
+    if collected is not None:
+        collected.extend(events)
+        return
+
+    dispatch(events)
+
+
+def emit(event):
+    emit_many([event])
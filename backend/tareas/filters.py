@@ -0,0 +1,47 @@
+# tareas/filters.py
+from rest_framework import serializers
+from rest_framework.filters import BaseFilterBackend
+
+from .serializers import TaskListFilterSerializer
+
+
+# Campos por los que se puede ordenar: todos tienen índice (campo, id)
+ORDERING_FIELDS = ["created_at", "due_date", "start_date"]
+DEFAULT_ORDERING = "-created_at"
+
+
+def get_ordering(request):
+    """
+    (campo, descendente) según ?ordering=campo o ?ordering=-campo.
+    Fuera de la lista blanca es un 400, no un orden ignorado.
+    """
+    value = request.query_params.get("ordering", "").strip() or DEFAULT_ORDERING
+    field = value.lstrip("-")
+
+    if field not in ORDERING_FIELDS or value.count("-") > 1:
+        raise serializers.ValidationError({
+            "ordering": [f"Valores posibles: {', '.join(ORDERING_FIELDS)} (con - para descendente)."]
+        })
+
+    return field, value.startswith("-")
+
+
+def order_by_args(field, descending):
+    # El id desempata: el orden es total y sirve para paginar por cursor
+    if descending:
+        return f"-{field}", "-id"
+    return field, "id"
+
+
+class TaskFilterBackend(BaseFilterBackend):
+    """
+    Filtros y orden del listado de tareas en la base: el cliente baja
+    solo las filas que va a mostrar.
+    """
+
+    def filter_queryset(self, request, queryset, view):
+        serializer = TaskListFilterSerializer(data=request.query_params)
+        serializer.is_valid(raise_exception=True)
+
+        queryset = serializer.filter_queryset(queryset)
+        return queryset.order_by(*order_by_args(*get_ordering(request)))
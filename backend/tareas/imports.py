@@ -0,0 +1,213 @@
+# tareas/imports.py
+import csv
+import io
+from datetime import timedelta
+from itertools import islice
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.db import transaction
+from django.db.models import Q
+from django.db.models.functions import Lower
+from django.utils import timezone
+
+from .bulk import after_bulk_write
+from .bulk_insert import bulk_insert
+from .events import emit_many, TasksImported
+from .models import Task, TaskImportJob
+from .reminders import schedule_many_task_reminders
+from .serializers import TaskImportRowSerializer
+
+
+REQUIRED_COLUMNS = {"title", "due_date"}
+
+
+class TaskImportError(Exception):
+    pass
+
+
+# =========================
+# LECTURA DEL CSV
+# =========================
+def open_rows(job):
+    """
+    (número de fila, dict) del CSV del job, sin cargarlo entero.
+    Las columnas se normalizan a minúsculas y las celdas vacías se omiten
+    para que tomen el valor por defecto.
+    """
+    with job.file.open("rb") as raw:
+        reader = csv.DictReader(io.TextIOWrapper(raw, encoding="utf-8-sig", newline=""))
+        columns = {(name or "").strip().lower() for name in reader.fieldnames or []}
+
+        missing = REQUIRED_COLUMNS - columns
+        if missing:
+            raise TaskImportError(f"Faltan columnas: {', '.join(sorted(missing))}")
+
+        # La fila 1 es el encabezado
+        for number, row in enumerate(reader, start=2):
+            yield number, {
+                (key or "").strip().lower(): value.strip()
+                for key, value in row.items()
+                if isinstance(value, str) and value.strip()
+            }
+
+
+def count_rows(job):
+    return sum(1 for _ in open_rows(job))
+
+
+def resolve_users(identifiers):
+    """
+    Usuarios por username o email (sin distinguir mayúsculas) con una
+    sola consulta por bloque. Las claves del resultado van en minúsculas.
+    """
+    identifiers = {identifier.lower() for identifier in identifiers}
+    if not identifiers:
+        return {}
+
+    # LOWER() en las dos puntas: no depende de la collation de la base
+    users = User.objects.annotate(
+        username_lower=Lower("username"),
+        email_lower=Lower("email"),
+    ).filter(
+        Q(username_lower__in=identifiers) | Q(email_lower__in=identifiers)
+    ).order_by("id")
+
+    found = {}
+    for user in users:
+        for key in (user.username, user.email):
+            if key:
+                found.setdefault(key.lower(), user)
+    return found
+
+
+# =========================
+# BLOQUES
+# =========================
+def import_batch(job, rows, assignees):
+    """
+    Valida un bloque de filas, crea las tareas válidas con bulk_create y
+    acumula en `assignees` cuántas le tocaron a cada usuario. No emite un
+    evento por tarea: el aviso es uno por asignado al final del job.
+    Devuelve (creadas, errores).
+    """
+    valid, errors = [], []
+
+    for number, row in rows:
+        serializer = TaskImportRowSerializer(data=row)
+        if serializer.is_valid():
+            valid.append((number, serializer.validated_data))
+        else:
+            errors.append({"row": number, "errors": serializer.errors})
+
+    users = resolve_users({data["assignee"] for _, data in valid if data.get("assignee")})
+
+    tasks = []
+    for number, data in valid:
+        data = dict(data)
+        identifier = data.pop("assignee", None)
+
+        assigned_to = job.created_by
+        if identifier:
+            assigned_to = users.get(identifier.lower())
+            if assigned_to is None:
+                errors.append({"row": number, "errors": {"assignee": ["Usuario inexistente"]}})
+                continue
+
+        data.setdefault("start_date", timezone.localdate())
+        tasks.append(Task(created_by=job.created_by, assigned_to=assigned_to, **data))
+
+    if not tasks:
+        return 0, errors
+
+    with transaction.atomic():
+        bulk_insert(tasks)
+
+        ids = [task.id for task in tasks]
+        schedule_many_task_reminders(tasks, catch_up_ids=set(ids))
+        after_bulk_write(ids, "created", users_changed=True)
+
+    for task in tasks:
+        summary = assignees.setdefault(task.assigned_to_id, [task.assigned_to, 0, task])
+        summary[1] += 1
+
+    return len(tasks), errors
+
+
+def fail_stale_imports(now=None):
+    """
+    Marca como fallidos los jobs "procesando" que no avanzan hace más de
+    TASK_IMPORT["STALE_AFTER"] segundos (el worker murió a mitad de
+    camino). Los bloques confirmados quedan; el job dice hasta dónde llegó.
+    """
+    now = now or timezone.now()
+    stale = now - timedelta(seconds=settings.TASK_IMPORT["STALE_AFTER"])
+
+    return TaskImportJob.objects.filter(status="procesando", updated_at__lt=stale).update(
+        status="fallido",
+        last_error="La importación dejó de avanzar (el worker se detuvo)",
+        finished_at=now,
+        updated_at=now
+    )
+
+
+def run_import(job):
+    """
+    Procesa el CSV por bloques de TASK_IMPORT["BATCH_SIZE"] filas. Cada
+    bloque es su propia transacción y deja el progreso guardado, así el
+    endpoint de estado lo ve avanzar.
+    """
+    config = settings.TASK_IMPORT
+
+    TaskImportJob.objects.filter(id=job.id).update(
+        status="procesando",
+        started_at=timezone.now(),
+        updated_at=timezone.now(),
+        total_rows=count_rows(job)
+    )
+
+    rows = open_rows(job)
+    assignees = {}
+    processed = created = error_count = 0
+    errors = []
+
+    while True:
+        batch = list(islice(rows, config["BATCH_SIZE"]))
+        if not batch:
+            break
+
+        batch_created, batch_errors = import_batch(job, batch, assignees)
+
+        processed += len(batch)
+        created += batch_created
+        error_count += len(batch_errors)
+        errors.extend(batch_errors[:config["MAX_ERRORS"] - len(errors)])
+
+        TaskImportJob.objects.filter(id=job.id).update(
+            processed_rows=processed,
+            created_count=created,
+            error_count=error_count,
+            errors=errors,
+            updated_at=timezone.now()
+        )
+
+    # Un aviso (notificación + email) por asignado, no uno por tarea
+    with transaction.atomic():
+        emit_many(
+            TasksImported(
+                job=job,
+                actor=job.created_by,
+                assignee=user,
+                count=count,
+                first_task=first_task
+            )
+            for user, count, first_task in assignees.values()
+        )
+
+        TaskImportJob.objects.filter(id=job.id).update(
+            status="completado",
+            finished_at=timezone.now(),
+            updated_at=timezone.now()
+        )
+
+    return created
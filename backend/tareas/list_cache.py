@@ -0,0 +1,146 @@
+# tareas/list_cache.py
+import hashlib
+import time
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.cache import get_conditional_response
+from rest_framework.response import Response
+
+from users.profile_cache import get_user_role
+
+from .models import TaskVisibility
+
+
+HITS_KEY = "tareas:list_cache:hits"
+MISSES_KEY = "tareas:list_cache:misses"
+
+
+def version_key(user_id):
+    return f"tareas:visibility_version:{user_id}"
+
+
+# =========================
+# VERSIÓN DE VISIBILIDAD
+# =========================
+def initial_version():
+    # Si Redis pierde la clave, la nueva versión nunca coincide con una vieja
+    return int(time.time() * 1000)
+
+
+def get_visibility_version(user_id):
+    key = version_key(user_id)
+
+    version = cache.get(key)
+    if version is None:
+        cache.add(key, initial_version(), timeout=None)
+        version = cache.get(key)
+    return version
+
+
+def bump_visibility_versions(user_ids):
+    """
+    Cambia la versión de los usuarios indicados: sus listados cacheados
+    dejan de usarse. Se sube ahora y otra vez al hacer commit, para que
+    un request concurrente no guarde el listado viejo con la versión nueva.
+    """
+    user_ids = {user_id for user_id in user_ids if user_id}
+    if not user_ids:
+        return
+
+    def bump():
+        for user_id in user_ids:
+            try:
+                cache.incr(version_key(user_id))
+            except ValueError:
+                cache.set(version_key(user_id), initial_version(), timeout=None)
+
+    bump()
+    transaction.on_commit(bump)
+
+
+def task_audience(task_ids):
+    """
+    Usuarios que ven las tareas: creador, asignado, delegado e historial
+    de delegaciones (todo eso ya está en TaskVisibility).
+    """
+    return set(
+        TaskVisibility.objects.filter(task_id__in=task_ids).values_list("user_id", flat=True)
+    )
+
+
+# =========================
+# CONTADORES
+# =========================
+def count(key):
+    try:
+        cache.incr(key)
+    except ValueError:
+        cache.add(key, 0, timeout=None)
+        cache.incr(key)
+
+
+def list_cache_stats():
+    hits = cache.get(HITS_KEY) or 0
+    misses = cache.get(MISSES_KEY) or 0
+    total = hits + misses
+    return {
+        "hits": hits,
+        "misses": misses,
+        "hit_ratio": round(hits / total, 4) if total else None,
+    }
+
+
+def reset_list_cache_stats():
+    cache.delete_many([HITS_KEY, MISSES_KEY])
+
+
+# =========================
+# MIXIN
+# =========================
+class CachedListMixin:
+    """
+    Guarda la respuesta del listado por usuario, rol, URL y versión de
+    visibilidad. Mientras nadie toque una tarea que el usuario ve, el poll
+    se resuelve con una lectura de Redis, sin consultas ni serializer.
+    Va antes de ConditionalListMixin: el ETag queda guardado con la respuesta.
+    """
+
+    def get_list_cache_key(self, request):
+        user = request.user
+        raw = "|".join([
+            str(user.pk),
+            str(get_user_role(user)),
+            str(get_visibility_version(user.pk)),
+            request.build_absolute_uri(),
+        ])
+        # v2: se guarda (etag, data), sin Last-Modified
+        return "tareas:list:v2:" + hashlib.sha1(raw.encode()).hexdigest()
+
+    def list(self, request, *args, **kwargs):
+        # La clave se arma antes de consultar: si alguien escribe mientras
+        # tanto, la respuesta queda guardada con la versión anterior
+        key = self.get_list_cache_key(request)
+
+        cached = cache.get(key)
+        if cached is not None:
+            count(HITS_KEY)
+            etag, data = cached
+
+            not_modified = get_conditional_response(request, etag=etag)
+            response = not_modified if not_modified is not None else Response(data)
+            return self.add_validator_headers(response, etag)
+
+        count(MISSES_KEY)
+        response = super().list(request, *args, **kwargs)
+
+        # Un 304 no trae datos para guardar
+        if response.status_code == 200:
+            cache.set(
+                key,
+                (response["ETag"], response.data),
+                settings.TASK_LIST_CACHE["TIMEOUT"]
+            )
+
+        return response
@@ -0,0 +1,131 @@
+import random
+import time
+from datetime import date, timedelta
+
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Q
+
+from tareas.models import Task, TaskDelegation
+from tareas.visibility import visible_tasks, sync_task_visibility
+
+
+class Rollback(Exception):
+    pass
+
+
+class Command(BaseCommand):
+    help = (
+        "Compara el listado de tareas de admin con el OR de cinco "
+        "condiciones + DISTINCT contra el semi-join sobre TaskVisibility. "
+        "Carga datos sintéticos dentro de una transacción que se descarta al final."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--tasks", type=int, default=100_000)
+        parser.add_argument("--delegations", type=int, default=1_000_000)
+        parser.add_argument("--users", type=int, default=200)
+        parser.add_argument("--repeat", type=int, default=5)
+        parser.add_argument("--batch-size", type=int, default=5000)
+        parser.add_argument(
+            "--keep",
+            action="store_true",
+            help="Confirmar los datos sintéticos en vez de descartarlos."
+        )
+
+    def handle(self, *args, **options):
+        try:
+            with transaction.atomic():
+                self.run(options)
+                if not options["keep"]:
+                    raise Rollback()
+        except Rollback:
+            self.stdout.write("Datos sintéticos descartados.")
+
+    def run(self, options):
+        random.seed(1)
+        batch_size = options["batch_size"]
+
+        self.stdout.write("Creando datos...")
+        users = self.create_users(options["users"])
+        user_ids = [u.id for u in users]
+        first_task_id = self.create_tasks(options["tasks"], user_ids, batch_size)
+        task_ids = list(
+            Task.objects.filter(id__gte=first_task_id).values_list("id", flat=True)
+        )
+        self.create_delegations(options["delegations"], task_ids, user_ids, batch_size)
+
+        self.stdout.write("Calculando visibilidad...")
+        for start in range(0, len(task_ids), batch_size):
+            sync_task_visibility(task_ids[start:start + batch_size])
+
+        admin = users[0]
+        old = Task.objects.filter(
+            Q(created_by=admin) |
+            Q(assigned_to=admin) |
+            Q(delegated_to=admin) |
+            Q(delegations__from_user=admin) |
+            Q(delegations__to_user=admin)
+        ).distinct()
+        new = visible_tasks(admin)
+
+        for label, queryset in (("OR + DISTINCT", old), ("TaskVisibility", new)):
+            page = queryset.order_by("-created_at", "-id")
+            self.report(label + " (primera página)", lambda: list(page[:50]), options["repeat"])
+            self.report(label + " (count)", queryset.count, options["repeat"])
+
+    def report(self, label, func, repeat):
+        timings = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            func()
+            timings.append((time.perf_counter() - start) * 1000)
+
+        timings.sort()
+        self.stdout.write(
+            f"{label:<40} mediana {timings[len(timings) // 2]:8.1f} ms   "
+            f"máx {timings[-1]:8.1f} ms"
+        )
+
+    # =========================
+    # DATOS SINTÉTICOS
+    # =========================
+    def create_users(self, count):
+        prefix = f"bench_{int(time.time())}"
+        User.objects.bulk_create([
+            User(username=f"{prefix}_{i}", email=f"{prefix}_{i}@bench.local")
+            for i in range(count)
+        ])
+        return list(User.objects.filter(username__startswith=prefix).order_by("id"))
+
+    def create_tasks(self, count, user_ids, batch_size):
+        today = date.today()
+        first_id = (Task.objects.order_by("-id").values_list("id", flat=True).first() or 0) + 1
+
+        for start in range(0, count, batch_size):
+            Task.objects.bulk_create([
+                Task(
+                    title=f"Tarea {start + i}",
+                    description="benchmark",
+                    start_date=today,
+                    due_date=today + timedelta(days=random.randint(-30, 30)),
+                    created_by_id=random.choice(user_ids),
+                    assigned_to_id=random.choice(user_ids),
+                    delegated_to_id=random.choice(user_ids) if random.random() < 0.3 else None,
+                )
+                for i in range(min(batch_size, count - start))
+            ])
+
+        return first_id
+
+    def create_delegations(self, count, task_ids, user_ids, batch_size):
+        for start in range(0, count, batch_size):
+            TaskDelegation.objects.bulk_create([
+                TaskDelegation(
+                    task_id=random.choice(task_ids),
+                    from_user_id=random.choice(user_ids),
+                    to_user_id=random.choice(user_ids),
+                )
+                for _ in range(min(batch_size, count - start))
+            ])
@@ -0,0 +1,89 @@
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand, CommandError
+from django.db.models import Q
+from django.utils import timezone
+
+from tareas.models import Task, Notification, TaskReminder
+from tareas.visibility import visible_tasks
+from tareas.read_state import unread_notifications
+
+
+class Command(BaseCommand):
+    help = (
+        "Imprime el EXPLAIN de las consultas más frecuentes "
+        "(recordatorios, notificaciones, login, listado de tareas) "
+        "para revisar que usen índices y no recorran toda la tabla."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--user",
+            type=int,
+            help="Id del usuario para las consultas por usuario (por defecto el primero)."
+        )
+        parser.add_argument(
+            "--format",
+            help="Formato del EXPLAIN que soporte la base (ej. TREE o JSON en MySQL)."
+        )
+        parser.add_argument(
+            "--analyze",
+            action="store_true",
+            help="Ejecuta la consulta y muestra tiempos reales (EXPLAIN ANALYZE)."
+        )
+
+    def handle(self, *args, **options):
+        user = self.get_user(options["user"])
+
+        explain_options = {}
+        if options["format"]:
+            explain_options["format"] = options["format"]
+        if options["analyze"]:
+            explain_options["analyze"] = True
+
+        queries = [
+            (
+                "fire_due_reminders: recordatorios a disparar",
+                TaskReminder.objects.filter(fire_at__lte=timezone.now()).order_by("fire_at", "id")[:500],
+            ),
+            (
+                "Notificaciones del usuario",
+                Notification.objects.filter(user=user).order_by("-created_at", "-id"),
+            ),
+            (
+                "Notificaciones no leídas del usuario",
+                unread_notifications(user.id).order_by("-created_at"),
+            ),
+            (
+                "Login por email",
+                # La misma consulta que users.backends.EmailBackend
+                User.objects.filter(email__iexact=user.email).order_by("id")[:1],
+            ),
+            (
+                "Tareas del empleado",
+                Task.objects.filter(
+                    Q(assigned_to=user) | Q(delegated_to=user)
+                ).order_by("-created_at", "-id"),
+            ),
+            (
+                "Tareas del admin (TaskVisibility)",
+                visible_tasks(user).order_by("-created_at", "-id"),
+            ),
+        ]
+
+        for title, queryset in queries:
+            self.stdout.write(self.style.MIGRATE_HEADING(title))
+            self.stdout.write(str(queryset.query))
+            self.stdout.write(queryset.explain(**explain_options))
+            self.stdout.write("")
+
+    def get_user(self, user_id):
+        if user_id is None:
+            user = User.objects.order_by("id").first()
+            if user is None:
+                raise CommandError("No hay usuarios; indicá uno con --user")
+            return user
+
+        try:
+            return User.objects.get(id=user_id)
+        except User.DoesNotExist:
+            raise CommandError(f"No existe el usuario {user_id}")
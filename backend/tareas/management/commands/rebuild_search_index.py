@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from tareas.models import Task, Comment
+from tareas.search import index_tasks, index_comments, use_fulltext
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula el índice invertido de búsqueda (SearchToken) de todas "
+        "las tareas y comentarios. Con FULLTEXT (MySQL) no hace falta."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=1000,
+            help="Cantidad de tareas o comentarios por bloque."
+        )
+
+    def handle(self, *args, **options):
+        if use_fulltext():
+            self.stdout.write("La búsqueda usa FULLTEXT: no hay índice que reconstruir.")
+            return
+
+        chunk_size = options["chunk_size"]
+
+        for model, index in ((Task, index_tasks), (Comment, index_comments)):
+            ids = list(model.objects.order_by("id").values_list("id", flat=True))
+            for start in range(0, len(ids), chunk_size):
+                index(ids[start:start + chunk_size])
+
+            self.stdout.write(f"{model._meta.verbose_name_plural}: {len(ids)} indexados")
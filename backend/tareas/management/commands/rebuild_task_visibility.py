@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand
+
+from tareas.models import Task
+from tareas.visibility import sync_task_visibility
+
+
+class Command(BaseCommand):
+    help = (
+        "Recalcula la tabla TaskVisibility a partir de las tareas y su "
+        "historial de delegaciones. Sirve como carga inicial y para reparar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--chunk-size",
+            type=int,
+            default=2000,
+            help="Cantidad de tareas por bloque (una transacción por bloque)."
+        )
+        parser.add_argument(
+            "--task",
+            type=int,
+            action="append",
+            dest="task_ids",
+            help="Recalcular solo esta tarea (se puede repetir)."
+        )
+
+    def handle(self, *args, **options):
+        if options["task_ids"]:
+            rows = sync_task_visibility(options["task_ids"])
+            self.stdout.write(self.style.SUCCESS(
+                f"{len(options['task_ids'])} tareas, {rows} filas de visibilidad"
+            ))
+            return
+
+        chunk_size = options["chunk_size"]
+        last_id = 0
+        total_tasks = 0
+        total_rows = 0
+
+        while True:
+            task_ids = list(
+                Task.objects.filter(id__gt=last_id)
+                .order_by("id")
+                .values_list("id", flat=True)[:chunk_size]
+            )
+            if not task_ids:
+                break
+
+            total_rows += sync_task_visibility(task_ids)
+            total_tasks += len(task_ids)
+            last_id = task_ids[-1]
+
+            self.stdout.write(f"  ... {total_tasks} tareas (hasta id {last_id})")
+
+        self.stdout.write(self.style.SUCCESS(
+            f"{total_tasks} tareas, {total_rows} filas de visibilidad"
+        ))
@@ -0,0 +1,26 @@
+from django.core.management.base import BaseCommand
+
+from tareas.list_cache import list_cache_stats, reset_list_cache_stats
+
+
+class Command(BaseCommand):
+    help = "Muestra los aciertos y fallos del cache de /api/tasks/ (contadores en Redis)."
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--reset",
+            action="store_true",
+            help="Poner los contadores en cero después de mostrarlos."
+        )
+
+    def handle(self, *args, **options):
+        stats = list_cache_stats()
+        ratio = f"{stats['hit_ratio']:.1%}" if stats["hit_ratio"] is not None else "-"
+
+        self.stdout.write(
+            f"Aciertos: {stats['hits']}   Fallos: {stats['misses']}   Tasa de acierto: {ratio}"
+        )
+
+        if options["reset"]:
+            reset_list_cache_stats()
+            self.stdout.write("Contadores reiniciados.")
@@ -0,0 +1,84 @@
+# Generated by Django 5.2.8 on 2026-10-18 15:11
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+TASK_REASONS = {
+    'created_by_id': 'creador',
+    'assigned_to_id': 'asignado',
+    'delegated_to_id': 'delegado',
+}
+
+DELEGATION_REASONS = {
+    'from_user_id': 'delegacion_origen',
+    'to_user_id': 'delegacion_destino',
+}
+
+CHUNK_SIZE = 2000
+
+
+def backfill_visibility(apps, schema_editor):
+    """
+    Carga inicial por bloques de ids. Para reparar más adelante
+    está el comando rebuild_task_visibility.
+    """
+    Task = apps.get_model('tareas', 'Task')
+    TaskDelegation = apps.get_model('tareas', 'TaskDelegation')
+    TaskVisibility = apps.get_model('tareas', 'TaskVisibility')
+
+    last_id = 0
+    while True:
+        tasks = list(
+            Task.objects.filter(id__gt=last_id).order_by('id')
+            .values('id', *TASK_REASONS)[:CHUNK_SIZE]
+        )
+        if not tasks:
+            break
+
+        task_ids = [task['id'] for task in tasks]
+        rows = set()
+
+        for task in tasks:
+            for field, reason in TASK_REASONS.items():
+                if task[field]:
+                    rows.add((task[field], task['id'], reason))
+
+        delegations = TaskDelegation.objects.filter(
+            task_id__in=task_ids
+        ).values('task_id', *DELEGATION_REASONS)
+        for delegation in delegations:
+            for field, reason in DELEGATION_REASONS.items():
+                if delegation[field]:
+                    rows.add((delegation[field], delegation['task_id'], reason))
+
+        TaskVisibility.objects.bulk_create(
+            [TaskVisibility(user_id=u, task_id=t, reason=r) for u, t, r in rows],
+            ignore_conflicts=True
+        )
+        last_id = task_ids[-1]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tareas', '0002_hot_query_indexes'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskVisibility',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('reason', models.CharField(choices=[('creador', 'Creó la tarea'), ('asignado', 'Asignado'), ('delegado', 'Delegado'), ('delegacion_origen', 'Delegó la tarea'), ('delegacion_destino', 'Recibió una delegación')], max_length=20)),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='visibility', to='tareas.task')),
+                ('user', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_visibility', to=settings.AUTH_USER_MODEL)),
+            ],
+            options={
+                'constraints': [models.UniqueConstraint(fields=('user', 'task', 'reason'), name='task_visibility_unique')],
+            },
+        ),
+        migrations.RunPython(backfill_visibility, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,18 @@
+# Generated by Django 5.2.8 on 2026-10-18 15:16
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tareas', '0004_email_outbox'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='emailoutbox',
+            name='batch',
+            field=models.CharField(blank=True, db_index=True, max_length=32),
+        ),
+    ]
@@ -0,0 +1,124 @@
+# Generated by Django 5.2.8 on 2026-10-18 15:18
+
+from datetime import datetime, time, timedelta
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.utils import timezone
+
+
+CHUNK_SIZE = 2000
+
+# Copia de la política y la hora al momento de esta migración: no se
+# importa tareas.reminders porque puede cambiar después. Si el proyecto
+# las sobreescribe en settings, se respeta.
+REMINDER_POLICIES = {
+    "alta": [-3, -1, 0, 1, 3],
+    "media": [-1, 0, 1],
+    "baja": [0, 1],
+}
+REMINDER_HOUR = 8
+
+
+def reminder_policy(priority):
+    policies = getattr(settings, 'TASK_REMINDER_POLICIES', REMINDER_POLICIES)
+    return sorted(set(policies.get(priority, policies["media"])))
+
+
+def fire_time(due_date, offset_days):
+    hour = getattr(settings, 'TASK_REMINDER_HOUR', REMINDER_HOUR)
+    day = due_date + timedelta(days=offset_days)
+    return timezone.make_aware(datetime.combine(day, time(hour)))
+
+
+def schedule_open_tasks(apps, schema_editor):
+    """
+    Programa los recordatorios futuros de las tareas abiertas. Si el
+    aviso de hoy o el de vencida todavía no se había mandado con los
+    flags viejos, se programa para ya.
+    """
+    Task = apps.get_model('tareas', 'Task')
+    TaskReminder = apps.get_model('tareas', 'TaskReminder')
+
+    now = timezone.now()
+    today = timezone.localdate()
+    last_id = 0
+
+    while True:
+        tasks = list(
+            Task.objects.filter(id__gt=last_id, status__in=['pendiente', 'en_progreso'])
+            .order_by('id')
+            .values('id', 'priority', 'due_date', 'reminder_due_soon_sent', 'reminder_expired_sent')[:CHUNK_SIZE]
+        )
+        if not tasks:
+            break
+
+        reminders = []
+        for task in tasks:
+            offsets = set()
+            for offset in reminder_policy(task['priority']):
+                fire_at = fire_time(task['due_date'], offset)
+                if fire_at > now:
+                    offsets.add(offset)
+                    reminders.append(TaskReminder(task_id=task['id'], offset_days=offset, fire_at=fire_at))
+
+            pending = None
+            if task['due_date'] < today and not task['reminder_expired_sent']:
+                pending = 1
+            elif task['due_date'] == today and not task['reminder_due_soon_sent']:
+                pending = 0
+
+            if pending is not None and pending not in offsets:
+                reminders.append(TaskReminder(task_id=task['id'], offset_days=pending, fire_at=now))
+
+        TaskReminder.objects.bulk_create(reminders, ignore_conflicts=True)
+        last_id = tasks[-1]['id']
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tareas', '0005_email_outbox_batch'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='TaskReminder',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('offset_days', models.SmallIntegerField()),
+                ('fire_at', models.DateTimeField()),
+            ],
+        ),
+        migrations.AddField(
+            model_name='taskreminder',
+            name='task',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reminders', to='tareas.task'),
+        ),
+        migrations.AddIndex(
+            model_name='taskreminder',
+            index=models.Index(fields=['fire_at', 'id'], name='reminder_fire_at_idx'),
+        ),
+        migrations.AddConstraint(
+            model_name='taskreminder',
+            constraint=models.UniqueConstraint(fields=('task', 'offset_days'), name='task_reminder_unique'),
+        ),
+        migrations.RunPython(schedule_open_tasks, migrations.RunPython.noop),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_expired_reminder_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='task',
+            name='task_due_soon_reminder_idx',
+        ),
+        migrations.RemoveField(
+            model_name='task',
+            name='reminder_due_soon_sent',
+        ),
+        migrations.RemoveField(
+            model_name='task',
+            name='reminder_expired_sent',
+        ),
+    ]
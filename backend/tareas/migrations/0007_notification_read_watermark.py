@@ -0,0 +1,102 @@
+# Generated by Django 5.2.8 on 2026-10-18 15:24
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+from django.db.models import Max, Min, Q
+
+
+def build_watermarks(apps, schema_editor):
+    """
+    Pasa is_read a marca de agua + excepciones. La marca queda justo
+    antes de la primera no leída de cada usuario, así no hace falta
+    ninguna excepción "no leída" y solo se guardan las leídas sueltas
+    que estén por encima.
+    """
+    Notification = apps.get_model('tareas', 'Notification')
+    NotificationReadState = apps.get_model('tareas', 'NotificationReadState')
+    NotificationReadMark = apps.get_model('tareas', 'NotificationReadMark')
+
+    summary = (
+        Notification.objects.order_by().values('user_id')
+        .annotate(last=Max('id'), first_unread=Min('id', filter=Q(is_read=False)))
+    )
+
+    for row in summary:
+        if row['first_unread'] is None:
+            watermark = row['last']
+        else:
+            watermark = row['first_unread'] - 1
+
+        NotificationReadState.objects.create(user_id=row['user_id'], last_read_id=watermark)
+
+        read_ids = Notification.objects.filter(
+            user_id=row['user_id'], is_read=True, id__gt=watermark
+        ).values_list('id', flat=True)
+        NotificationReadMark.objects.bulk_create([
+            NotificationReadMark(user_id=row['user_id'], notification_id=notification_id, is_read=True)
+            for notification_id in read_ids
+        ])
+
+
+def restore_is_read(apps, schema_editor):
+    Notification = apps.get_model('tareas', 'Notification')
+    NotificationReadState = apps.get_model('tareas', 'NotificationReadState')
+    NotificationReadMark = apps.get_model('tareas', 'NotificationReadMark')
+
+    for state in NotificationReadState.objects.all():
+        Notification.objects.filter(user_id=state.user_id, id__lte=state.last_read_id).update(is_read=True)
+
+    for is_read in (True, False):
+        ids = NotificationReadMark.objects.filter(is_read=is_read).values('notification_id')
+        Notification.objects.filter(id__in=ids).update(is_read=is_read)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('auth', '0012_alter_user_first_name_max_length'),
+        ('tareas', '0006_task_reminders'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='NotificationReadMark',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('is_read', models.BooleanField(default=True)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='NotificationReadState',
+            fields=[
+                ('user', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='notification_read_state', serialize=False, to=settings.AUTH_USER_MODEL)),
+                ('last_read_id', models.PositiveBigIntegerField(default=0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+        migrations.AddField(
+            model_name='notificationreadmark',
+            name='notification',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='read_marks', to='tareas.notification'),
+        ),
+        migrations.AddField(
+            model_name='notificationreadmark',
+            name='user',
+            field=models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='notification_read_marks', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.AddConstraint(
+            model_name='notificationreadmark',
+            constraint=models.UniqueConstraint(fields=('user', 'notification'), name='notif_read_mark_unique'),
+        ),
+        migrations.RunPython(build_watermarks, restore_is_read),
+        migrations.RemoveIndex(
+            model_name='notification',
+            name='notif_user_unread_idx',
+        ),
+        migrations.RemoveField(
+            model_name='notification',
+            name='is_read',
+        ),
+    ]
@@ -0,0 +1,23 @@
+# Generated by Django 5.2.8 on 2026-10-18 15:38
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tareas', '0008_archived_notifications'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='archivednotification',
+            name='type',
+            field=models.CharField(choices=[('nueva', 'Nueva tarea'), ('delegacion', 'Tarea delegada'), ('estado', 'Estado actualizado'), ('comentario', 'Nuevo comentario'), ('vencimiento', 'Próxima a vencer'), ('creada', 'Tarea creada'), ('archivo', 'Archivo adjunto')], max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='type',
+            field=models.CharField(choices=[('nueva', 'Nueva tarea'), ('delegacion', 'Tarea delegada'), ('estado', 'Estado actualizado'), ('comentario', 'Nuevo comentario'), ('vencimiento', 'Próxima a vencer'), ('creada', 'Tarea creada'), ('archivo', 'Archivo adjunto')], max_length=20),
+        ),
+    ]
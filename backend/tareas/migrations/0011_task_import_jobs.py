@@ -0,0 +1,45 @@
+# Generated by Django 5.2.8 on 2026-10-18 16:40
+
+import django.db.models.deletion
+import tareas.validators
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tareas', '0010_structured_notifications'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='archivednotification',
+            name='type',
+            field=models.CharField(choices=[('nueva', 'Nueva tarea'), ('delegacion', 'Tarea delegada'), ('estado', 'Estado actualizado'), ('comentario', 'Nuevo comentario'), ('vencimiento', 'Próxima a vencer'), ('creada', 'Tarea creada'), ('archivo', 'Archivo adjunto'), ('importacion', 'Tareas importadas')], max_length=20),
+        ),
+        migrations.AlterField(
+            model_name='notification',
+            name='type',
+            field=models.CharField(choices=[('nueva', 'Nueva tarea'), ('delegacion', 'Tarea delegada'), ('estado', 'Estado actualizado'), ('comentario', 'Nuevo comentario'), ('vencimiento', 'Próxima a vencer'), ('creada', 'Tarea creada'), ('archivo', 'Archivo adjunto'), ('importacion', 'Tareas importadas')], max_length=20),
+        ),
+        migrations.CreateModel(
+            name='TaskImportJob',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('file', models.FileField(upload_to='task_imports/', validators=[tareas.validators.validate_file_size, tareas.validators.validate_file_extension])),
+                ('status', models.CharField(choices=[('pendiente', 'Pendiente'), ('procesando', 'Procesando'), ('completado', 'Completado'), ('fallido', 'Fallido')], default='pendiente', max_length=20)),
+                ('total_rows', models.PositiveIntegerField(default=0)),
+                ('processed_rows', models.PositiveIntegerField(default=0)),
+                ('created_count', models.PositiveIntegerField(default=0)),
+                ('error_count', models.PositiveIntegerField(default=0)),
+                ('errors', models.JSONField(blank=True, default=list)),
+                ('last_error', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('started_at', models.DateTimeField(blank=True, null=True)),
+                ('finished_at', models.DateTimeField(blank=True, null=True)),
+                ('created_by', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='task_imports', to=settings.AUTH_USER_MODEL)),
+            ],
+        ),
+    ]
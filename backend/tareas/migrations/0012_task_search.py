@@ -0,0 +1,49 @@
+# Generated by Django 5.2.8 on 2026-10-18 17:20
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+# FULLTEXT solo existe en MySQL; en SQLite se usa el índice invertido (SearchToken)
+FULLTEXT_INDEXES = [
+    ("tareas_task", "task_fulltext_idx", "title, description"),
+    ("tareas_comment", "comment_fulltext_idx", "message"),
+]
+
+
+def add_fulltext_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "mysql":
+        return
+    for table, name, columns in FULLTEXT_INDEXES:
+        schema_editor.execute(f"ALTER TABLE {table} ADD FULLTEXT INDEX {name} ({columns})")
+
+
+def drop_fulltext_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != "mysql":
+        return
+    for table, name, _ in FULLTEXT_INDEXES:
+        schema_editor.execute(f"ALTER TABLE {table} DROP INDEX {name}")
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('tareas', '0011_task_import_jobs'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='SearchToken',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('term', models.CharField(max_length=64)),
+                ('weight', models.PositiveIntegerField(default=1)),
+                ('comment', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='tareas.comment')),
+                ('task', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='search_tokens', to='tareas.task')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['term', 'task'], name='search_term_task_idx'), models.Index(fields=['term', 'comment'], name='search_term_comment_idx')],
+            },
+        ),
+        migrations.RunPython(add_fulltext_indexes, drop_fulltext_indexes),
+    ]
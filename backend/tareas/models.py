@@ -61,12 +61,19 @@ class Task(models.Model):
     updated_at = models.DateTimeField(auto_now=True)
 
 
-    # Campos para controlar notificaciones automáticas
-    reminder_due_soon_sent = models.BooleanField(default=False)
-    reminder_expired_sent = models.BooleanField(default=False)
-
-    
-    #reminder_sent = models.BooleanField(default=False)  # ← nuevo campo
+    # Los recordatorios automáticos viven en TaskReminder (tareas/reminders.py)
+
+    class Meta:
+        indexes = [
+            # Listados ordenados por (created_at, id) y paginación por cursor
+            models.Index(fields=["created_at", "id"], name="task_created_idx"),
+            # ?ordering=due_date / start_date y rangos de fechas (tareas/filters.py)
+            models.Index(fields=["due_date", "id"], name="task_due_idx"),
+            models.Index(fields=["start_date", "id"], name="task_start_idx"),
+            # ?status= / ?priority= con rango de vencimiento, y ?overdue=
+            models.Index(fields=["status", "due_date"], name="task_status_due_idx"),
+            models.Index(fields=["priority", "due_date"], name="task_priority_due_idx"),
+        ]
 
 
 
@@ -96,10 +103,88 @@ class TaskDelegation(models.Model):
 
     delegated_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Última delegación de cada tarea (delegated_by)
+            models.Index(fields=["task", "delegated_at"], name="delegation_task_date_idx"),
+        ]
+
     def __str__(self):
         return f"{self.task.title} → {self.to_user}"
 
 
+# =========================
+# RECORDATORIOS PROGRAMADOS
+# =========================
+class TaskReminder(models.Model):
+    """
+    Recordatorio pendiente de una tarea, ordenado por hora de disparo.
+    fire_due_reminders solo lee los que ya vencieron y los borra al enviarlos.
+    """
+
+    task = models.ForeignKey(
+        Task,
+        related_name='reminders',
+        on_delete=models.CASCADE
+    )
+
+    # Días respecto a due_date: -3 = tres días antes, 0 = el día, 1 = vencida
+    offset_days = models.SmallIntegerField()
+    fire_at = models.DateTimeField()
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["task", "offset_days"],
+                name="task_reminder_unique"
+            ),
+        ]
+        indexes = [
+            models.Index(fields=["fire_at", "id"], name="reminder_fire_at_idx"),
+        ]
+
+
+# =========================
+# VISIBILIDAD (MATERIALIZADA)
+# =========================
+class TaskVisibility(models.Model):
+    """
+    Una fila por cada motivo por el que un usuario ve una tarea.
+    Se mantiene desde tareas/visibility.py; reemplaza el OR de cinco
+    condiciones + DISTINCT del listado de admin.
+    """
+
+    REASON_CHOICES = [
+        ('creador', 'Creó la tarea'),
+        ('asignado', 'Asignado'),
+        ('delegado', 'Delegado'),
+        ('delegacion_origen', 'Delegó la tarea'),
+        ('delegacion_destino', 'Recibió una delegación'),
+    ]
+
+    user = models.ForeignKey(
+        User,
+        related_name='task_visibility',
+        on_delete=models.CASCADE
+    )
+
+    task = models.ForeignKey(
+        Task,
+        related_name='visibility',
+        on_delete=models.CASCADE
+    )
+
+    reason = models.CharField(max_length=20, choices=REASON_CHOICES)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(
+                fields=["user", "task", "reason"],
+                name="task_visibility_unique"
+            ),
+        ]
+
+
 # =========================
 # COMENTARIOS
 # =========================
@@ -118,6 +203,12 @@ class Comment(models.Model):
     message = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(fields=["task", "created_at"], name="comment_task_created_idx"),
+            models.Index(fields=["created_at", "id"], name="comment_created_idx"),
+        ]
+
 
 # =========================
 # ARCHIVOS ADJUNTOS
@@ -170,6 +261,9 @@ class Notification(models.Model):
         ('estado', 'Estado actualizado'),
         ('comentario', 'Nuevo comentario'),
         ('vencimiento', 'Próxima a vencer'),
+        ('creada', 'Tarea creada'),
+        ('archivo', 'Archivo adjunto'),
+        ('importacion', 'Tareas importadas'),
     ]
 
     user = models.ForeignKey(
@@ -188,13 +282,269 @@ class Notification(models.Model):
         choices=NOTIF_TYPE_CHOICES
     )
 
-    message = models.CharField(max_length=255)
+    # El texto se arma al leer (notification_text.py) a partir del tipo,
+    # la tarea, quién la originó y `params` (estados, archivo, etapa...).
+    actor = models.ForeignKey(
+        User,
+        null=True,
+        blank=True,
+        related_name='+',
+        on_delete=models.SET_NULL
+    )
+    params = models.JSONField(default=dict, blank=True)
 
-    is_read = models.BooleanField(default=False)
+    # Solo filas viejas: texto ya armado antes de `params`
+    message = models.CharField(max_length=255, blank=True, default="")
+
+    # El estado leído/no leído no se guarda en la fila: se deriva de
+    # NotificationReadState y NotificationReadMark (ver read_state.py)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            # Listado del usuario ordenado por fecha (y cursor)
+            models.Index(fields=["user", "created_at", "id"], name="notif_user_created_idx"),
+        ]
+
+    def __str__(self):
+        return self.message or f"{self.type} #{self.task_id}"
+
+
+class NotificationReadState(models.Model):
+    """
+    Marca de agua de lectura: toda notificación del usuario con
+    id <= last_read_id se considera leída. "Marcar todas" es una sola
+    escritura sobre esta fila.
+    """
+
+    user = models.OneToOneField(
+        User,
+        primary_key=True,
+        related_name='notification_read_state',
+        on_delete=models.CASCADE
+    )
+
+    last_read_id = models.PositiveBigIntegerField(default=0)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.user.username} leyó hasta {self.last_read_id}"
+
+
+class NotificationReadMark(models.Model):
+    """
+    Estado explícito de una notificación respecto de la marca de agua:
+    leída (is_read=True) o vuelta a no leída (is_read=False). Pisa a
+    last_read_id en los dos sentidos. Se vacía en cada "marcar todas".
+    """
+
+    user = models.ForeignKey(
+        User,
+        related_name='notification_read_marks',
+        on_delete=models.CASCADE
+    )
+
+    notification = models.ForeignKey(
+        Notification,
+        related_name='read_marks',
+        on_delete=models.CASCADE
+    )
+
+    is_read = models.BooleanField(default=True)
+
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=["user", "notification"], name="notif_read_mark_unique"),
+        ]
+
+
+class ArchivedNotification(models.Model):
+    """
+    Historial frío de notificaciones. Las filas se mueven desde
+    Notification por el job de retención y conservan su id original.
+    """
+
+    id = models.BigIntegerField(primary_key=True)
+
+    user = models.ForeignKey(
+        User,
+        related_name='archived_notifications',
+        on_delete=models.CASCADE
+    )
+
+    # La tarea puede borrarse después; el historial queda igual
+    task = models.ForeignKey(
+        Task,
+        null=True,
+        blank=True,
+        related_name='archived_notifications',
+        on_delete=models.SET_NULL
+    )
+
+    type = models.CharField(
+        max_length=20,
+        choices=Notification.NOTIF_TYPE_CHOICES
+    )
+
+    message = models.CharField(max_length=255)
+    is_read = models.BooleanField(default=True)
+    created_at = models.DateTimeField()
+    archived_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["user", "created_at", "id"], name="archived_user_created_idx"),
+        ]
+
     def __str__(self):
         return self.message
 
 
-#dddddddd
\ No newline at end of file
+# =========================
+# EMAILS (OUTBOX)
+# =========================
+class EmailOutbox(models.Model):
+    """
+    Email pendiente de envío. Se escribe dentro de la transacción del
+    request y lo envía Celery (tareas.tasks.deliver_email) después del commit.
+    """
+
+    STATUS_CHOICES = [
+        ('pendiente', 'Pendiente'),
+        ('enviando', 'Enviando'),
+        ('enviado', 'Enviado'),
+        ('fallido', 'Fallido'),
+    ]
+
+    recipient_email = models.EmailField()
+    subject = models.CharField(max_length=255)
+    message = models.TextField()
+
+    task = models.ForeignKey(
+        Task,
+        related_name='emails',
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True
+    )
+
+    # Lote de envío masivo (recordatorios); vacío para emails sueltos
+    batch = models.CharField(max_length=32, blank=True, db_index=True)
+
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='pendiente'
+    )
+    attempts = models.PositiveIntegerField(default=0)
+    last_error = models.TextField(blank=True)
+    next_attempt_at = models.DateTimeField(null=True, blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    sent_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            # Barrido de pendientes (dispatch_pending_emails)
+            models.Index(fields=["status", "next_attempt_at"], name="outbox_status_next_idx"),
+        ]
+
+    def __str__(self):
+        return f"{self.subject} → {self.recipient_email} ({self.status})"
+
+
+# =========================
+# BÚSQUEDA (ÍNDICE INVERTIDO)
+# =========================
+class SearchToken(models.Model):
+    """
+    Índice invertido para la búsqueda cuando la base no tiene FULLTEXT
+    (SQLite en desarrollo). Una fila por término y documento: la tarea
+    (comment vacío) o uno de sus comentarios. Lo mantiene tareas/search.py.
+    """
+
+    term = models.CharField(max_length=64)
+
+    task = models.ForeignKey(
+        Task,
+        related_name='search_tokens',
+        on_delete=models.CASCADE
+    )
+
+    comment = models.ForeignKey(
+        Comment,
+        null=True,
+        blank=True,
+        related_name='search_tokens',
+        on_delete=models.CASCADE
+    )
+
+    # Apariciones del término (las del título pesan doble)
+    weight = models.PositiveIntegerField(default=1)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["term", "task"], name="search_term_task_idx"),
+            models.Index(fields=["term", "comment"], name="search_term_comment_idx"),
+        ]
+
+
+# =========================
+# IMPORTACIÓN DE TAREAS (CSV)
+# =========================
+class TaskImportJob(models.Model):
+    """
+    Importación de un CSV de tareas. La procesa Celery
+    (tareas.tasks.import_tasks_csv) por bloques y va dejando acá el
+    progreso y los errores por fila.
+    """
+
+    STATUS_CHOICES = [
+        ('pendiente', 'Pendiente'),
+        ('procesando', 'Procesando'),
+        ('completado', 'Completado'),
+        ('fallido', 'Fallido'),
+    ]
+
+    file = models.FileField(
+        upload_to='task_imports/',
+        validators=[
+            validate_file_size,
+            validate_file_extension
+        ]
+    )
+
+    created_by = models.ForeignKey(
+        User,
+        related_name='task_imports',
+        on_delete=models.CASCADE
+    )
+
+    status = models.CharField(
+        max_length=20,
+        choices=STATUS_CHOICES,
+        default='pendiente'
+    )
+
+    total_rows = models.PositiveIntegerField(default=0)
+    processed_rows = models.PositiveIntegerField(default=0)
+    created_count = models.PositiveIntegerField(default=0)
+    error_count = models.PositiveIntegerField(default=0)
+
+    # [{"row": n, "errors": {...}}], con tope (TASK_IMPORT["MAX_ERRORS"])
+    errors = models.JSONField(default=list, blank=True)
+    last_error = models.TextField(blank=True)
+
+    created_at = models.DateTimeField(auto_now_add=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+    # Se mueve con cada bloque: sin avance, fail_stale_imports lo da por caído
+    updated_at = models.DateTimeField(auto_now=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "updated_at"], name="import_status_updated_idx"),
+        ]
+
+    def __str__(self):
+        return f"Importación #{self.id} ({self.status})"
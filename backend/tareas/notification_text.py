@@ -0,0 +1,93 @@
+# tareas/notification_text.py
+from django.contrib.auth.models import User
+
+from .models import Task
+from .reminders import stage_text
+
+
+STATUS_LABELS = dict(Task._meta.get_field("status").choices)
+
+
+# =========================
+# PLANTILLAS
+# =========================
+# (tipo, variante) -> texto. Vive en memoria: cambiar un texto (o
+# traducirlo) no requiere tocar las filas guardadas.
+TEMPLATES = {
+    ("nueva", None): "Nueva tarea asignada: {title}",
+    ("creada", None): "Creaste la tarea: {title}",
+    ("delegacion", "recibida"): "La tarea '{title}' fue delegada por {actor}",
+    ("delegacion", "enviada"): "Delegaste la tarea '{title}' a {to}",
+    ("estado", None): "La tarea '{title}' cambió de estado: {old} → {new}",
+    ("comentario", None): "Nuevo comentario en: {title}",
+    ("archivo", None): "{actor} agregó un archivo '{file}' a la tarea: {title}",
+    ("importacion", None): "{actor} te asignó {count} tareas nuevas por importación",
+    ("vencimiento", "creador"): "La tarea '{title}' que creaste para {assigned} {when}.",
+    ("vencimiento", "asignado"): "Tienes la tarea '{title}' que {when}.",
+    ("vencimiento", "delegado"): "La tarea '{title}' delegada a ti {when}.",
+    ("vencimiento", None): "La tarea '{title}' {when}.",
+}
+
+
+def template_variant(notification):
+    task = notification.task
+
+    if notification.type == "delegacion":
+        return "enviada" if "to" in notification.params else "recibida"
+
+    if notification.type == "vencimiento":
+        if notification.user_id == task.created_by_id:
+            return "creador"
+        if notification.user_id == task.assigned_to_id:
+            return "asignado"
+        if notification.user_id == task.delegated_to_id:
+            return "delegado"
+
+    return None
+
+
+# =========================
+# RENDER
+# =========================
+def referenced_user_ids(notifications):
+    """
+    Usuarios citados en `params` (por ahora solo "to" de delegación),
+    para resolver todos los nombres con una consulta.
+    """
+    return {n.params["to"] for n in notifications if n.params.get("to")}
+
+
+def load_usernames(user_ids):
+    if not user_ids:
+        return {}
+    return dict(User.objects.filter(id__in=user_ids).values_list("id", "username"))
+
+
+def render_notification(notification, usernames=None):
+    # Filas anteriores a `params`: el texto quedó guardado
+    if notification.message:
+        return notification.message
+
+    params = notification.params or {}
+    task = notification.task
+
+    if usernames is None:
+        usernames = load_usernames(referenced_user_ids([notification]))
+
+    values = {
+        "title": task.title,
+        "actor": notification.actor.username if notification.actor else "Alguien",
+        "to": usernames.get(params.get("to"), "otro usuario"),
+        "assigned": task.assigned_to.username if task.assigned_to else "N/A",
+        "old": STATUS_LABELS.get(params.get("old"), params.get("old")),
+        "new": STATUS_LABELS.get(params.get("new"), params.get("new")),
+        "file": params.get("file", ""),
+        "count": params.get("count", 0),
+        "when": stage_text(params["offset"])[1] if "offset" in params else "",
+    }
+
+    template = TEMPLATES.get(
+        (notification.type, template_variant(notification)),
+        TEMPLATES.get((notification.type, None), "{title}")
+    )
+    return template.format_map(values)[:255]
@@ -0,0 +1,149 @@
+# tareas/pagination.py
+import base64
+import binascii
+import json
+
+from django.conf import settings
+from django.db.models import Q
+from django.utils.dateparse import parse_date, parse_datetime
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination, PageNumberPagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class KeysetPagination(BasePagination):
+    """
+    Paginación por cursor sobre (created_at, id), de más nuevo a más viejo.
+    Si la vista define get_keyset_ordering() -> (campo, descendente), el
+    cursor sigue ese orden (p. ej. ?ordering=due_date en tareas).
+
+    Es opcional: si el cliente no manda `cursor` ni `page_size` la lista
+    se devuelve completa como antes, para no romper clientes existentes.
+    """
+
+    cursor_query_param = "cursor"
+    page_size_query_param = "page_size"
+    invalid_cursor_message = "Cursor inválido"
+
+    def get_config(self, key):
+        return settings.KEYSET_PAGINATION[key]
+
+    def paginate_queryset(self, queryset, request, view=None):
+        params = request.query_params
+        if self.cursor_query_param not in params and self.page_size_query_param not in params:
+            return None
+
+        self.request = request
+        self.page_size = self.get_page_size(request)
+
+        self.field, descending = self.get_ordering(view)
+        if descending:
+            queryset = queryset.order_by(f"-{self.field}", "-id")
+        else:
+            queryset = queryset.order_by(self.field, "id")
+
+        cursor = params.get(self.cursor_query_param)
+        if cursor:
+            value, pk = self.decode_cursor(cursor, queryset.model)
+            lookup = "lt" if descending else "gt"
+            queryset = queryset.filter(
+                Q(**{f"{self.field}__{lookup}": value}) |
+                Q(**{self.field: value, f"id__{lookup}": pk})
+            )
+
+        # Se pide una fila de más para saber si hay página siguiente
+        rows = list(queryset[:self.page_size + 1])
+        self.has_next = len(rows) > self.page_size
+        rows = rows[:self.page_size]
+
+        self.next_cursor = self.encode_cursor(rows[-1]) if self.has_next else None
+        return rows
+
+    def get_ordering(self, view):
+        if view is not None and hasattr(view, "get_keyset_ordering"):
+            return view.get_keyset_ordering()
+        return "created_at", True
+
+    def get_page_size(self, request):
+        page_size = self.get_config("PAGE_SIZE")
+        try:
+            page_size = int(request.query_params.get(self.page_size_query_param, page_size))
+        except (TypeError, ValueError):
+            pass
+
+        return max(1, min(page_size, self.get_config("MAX_PAGE_SIZE")))
+
+    def get_next_link(self):
+        if not self.next_cursor:
+            return None
+
+        url = self.request.build_absolute_uri()
+        url = replace_query_param(url, self.cursor_query_param, self.next_cursor)
+        return replace_query_param(url, self.page_size_query_param, self.page_size)
+
+    def get_paginated_response(self, data):
+        return Response({
+            "next": self.get_next_link(),
+            "next_cursor": self.next_cursor,
+            "results": data,
+        })
+
+    def get_paginated_response_schema(self, schema):
+        return {
+            "type": "object",
+            "required": ["results"],
+            "properties": {
+                "next": {"type": "string", "nullable": True, "format": "uri"},
+                "next_cursor": {"type": "string", "nullable": True},
+                "results": schema,
+            },
+        }
+
+    # =========================
+    # CURSOR OPACO
+    # =========================
+    # El campo va en el cursor: uno de otro orden no se puede reutilizar.
+    # Los cursores viejos ([created_at, id]) siguen valiendo.
+    def encode_cursor(self, obj):
+        payload = [getattr(obj, self.field).isoformat(), obj.pk]
+        if self.field != "created_at":
+            payload.insert(0, self.field)
+
+        payload = json.dumps(payload, separators=(",", ":")).encode()
+        return base64.urlsafe_b64encode(payload).decode().rstrip("=")
+
+    def decode_cursor(self, cursor, model):
+        try:
+            padded = cursor + "=" * (-len(cursor) % 4)
+            payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+            field, value, pk = payload if len(payload) == 3 else ["created_at", *payload]
+            pk = int(pk)
+
+            if field != self.field:
+                raise ValueError(field)
+
+            if model._meta.get_field(field).get_internal_type() == "DateField":
+                value = parse_date(value)
+            else:
+                value = parse_datetime(value)
+        except (binascii.Error, TypeError, ValueError, UnicodeDecodeError):
+            raise NotFound(self.invalid_cursor_message)
+
+        if value is None:
+            raise NotFound(self.invalid_cursor_message)
+
+        return value, pk
+
+
+class SearchPagination(PageNumberPagination):
+    """
+    Resultados de búsqueda: van por relevancia, no por fecha, así que se
+    paginan por número de página (siempre, con el tamaño de KEYSET_PAGINATION).
+    """
+
+    page_size_query_param = "page_size"
+
+    def __init__(self):
+        self.page_size = settings.KEYSET_PAGINATION["PAGE_SIZE"]
+        self.max_page_size = settings.KEYSET_PAGINATION["MAX_PAGE_SIZE"]
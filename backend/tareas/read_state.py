@@ -0,0 +1,93 @@
+# tareas/read_state.py
+from django.db import transaction
+from django.db.models import (
+    BigIntegerField, BooleanField, Case, Exists, Max, OuterRef, Q, Subquery, Value, When
+)
+from django.db.models.functions import Coalesce
+
+from .models import Notification, NotificationReadState, NotificationReadMark
+
+
+def unread_filter():
+    """
+    Q de "no leída" para cualquier queryset de Notification:
+    por encima de la marca de agua y sin marca de leída, o con una
+    marca explícita de no leída.
+    """
+    watermark = NotificationReadState.objects.filter(
+        user=OuterRef("user")
+    ).values("last_read_id")
+    marks = NotificationReadMark.objects.filter(notification=OuterRef("pk"))
+
+    above_watermark = Q(id__gt=Coalesce(Subquery(watermark), 0, output_field=BigIntegerField()))
+
+    return (
+        (above_watermark & ~Exists(marks.filter(is_read=True)))
+        | Exists(marks.filter(is_read=False))
+    )
+
+
+def with_read_state(queryset):
+    """
+    Agrega `is_read` calculado, para el serializer y los filtros.
+    """
+    return queryset.annotate(
+        is_read=Case(
+            When(unread_filter(), then=Value(False)),
+            default=Value(True),
+            output_field=BooleanField()
+        )
+    )
+
+
+def unread_notifications(user_id):
+    return Notification.objects.filter(user_id=user_id).filter(unread_filter())
+
+
+@transaction.atomic
+def set_read_state(user_id, notification_ids, is_read=True):
+    """
+    Marca como leídas (o no leídas) las notificaciones indicadas del
+    usuario. Devuelve cuántas cambiaron.
+
+    Dos sentencias: un SELECT ... FOR UPDATE que filtra las del usuario
+    con su estado actual (bloquea las filas, así dos cambios concurrentes
+    no cuentan dos veces la misma), y un único INSERT ... ON DUPLICATE KEY
+    UPDATE con la marca de cada una. La marca se guarda aunque coincida
+    con la marca de agua: es redundante pero correcta, y "marcar todas"
+    las descarta igual.
+    """
+    rows = list(
+        with_read_state(
+            Notification.objects.select_for_update().filter(user_id=user_id, id__in=notification_ids)
+        ).values_list("id", "is_read")
+    )
+    if not rows:
+        return 0
+
+    NotificationReadMark.objects.bulk_create(
+        [
+            NotificationReadMark(user_id=user_id, notification_id=notification_id, is_read=is_read)
+            for notification_id, _ in rows
+        ],
+        update_conflicts=True,
+        unique_fields=["user", "notification"],
+        update_fields=["is_read"],
+    )
+
+    return sum(1 for _, current in rows if current != is_read)
+
+
+@transaction.atomic
+def mark_all_read(user_id):
+    """
+    Mueve la marca de agua a la última notificación del usuario y
+    descarta las excepciones: no se toca ninguna fila de Notification.
+    """
+    last_id = Notification.objects.filter(user_id=user_id).aggregate(last=Max("id"))["last"]
+
+    NotificationReadState.objects.update_or_create(
+        user_id=user_id,
+        defaults={"last_read_id": last_id or 0}
+    )
+    NotificationReadMark.objects.filter(user_id=user_id).delete()
@@ -0,0 +1,161 @@
+# tareas/realtime.py
+import asyncio
+import json
+import logging
+import threading
+from collections import defaultdict
+
+from django.conf import settings
+from django.core.serializers.json import DjangoJSONEncoder
+from django.core.signals import setting_changed
+from django.dispatch import receiver
+from django.utils.module_loading import import_string
+
+
+logger = logging.getLogger(__name__)
+
+
+def user_channel(user_id):
+    return f"tareas:user:{user_id}"
+
+
+# =========================
+# CAPAS DE CANALES
+# =========================
+class RedisChannelLayer:
+    """
+    Fan-out entre workers con pub/sub del Redis que ya usa Celery.
+    Publicar es sincrónico (se llama desde vistas y señales);
+    suscribirse es async (lo usa el stream SSE).
+    """
+
+    def __init__(self, url):
+        self.url = url
+        self._client = None
+
+    @property
+    def client(self):
+        if self._client is None:
+            import redis
+            self._client = redis.Redis.from_url(self.url)
+        return self._client
+
+    def publish(self, channel, message):
+        self.client.publish(channel, json.dumps(message, cls=DjangoJSONEncoder))
+
+    async def subscribe(self, channel):
+        import redis.asyncio
+
+        client = redis.asyncio.Redis.from_url(self.url)
+        pubsub = client.pubsub()
+        await pubsub.subscribe(channel)
+
+        try:
+            async for item in pubsub.listen():
+                if item["type"] == "message":
+                    yield json.loads(item["data"])
+        finally:
+            await pubsub.unsubscribe(channel)
+            await pubsub.aclose()
+            await client.aclose()
+
+
+class InMemoryChannelLayer:
+    """
+    Reemplazo en memoria para tests y desarrollo con un solo proceso.
+    Guarda además lo publicado en `sent` para poder inspeccionarlo.
+    """
+
+    def __init__(self, **kwargs):
+        self.sent = []
+        self._subscribers = defaultdict(set)
+        self._lock = threading.Lock()
+
+    def publish(self, channel, message):
+        self.sent.append((channel, message))
+
+        with self._lock:
+            subscribers = list(self._subscribers[channel])
+
+        for loop, queue in subscribers:
+            loop.call_soon_threadsafe(queue.put_nowait, message)
+
+    async def subscribe(self, channel):
+        subscriber = (asyncio.get_running_loop(), asyncio.Queue())
+
+        with self._lock:
+            self._subscribers[channel].add(subscriber)
+
+        try:
+            while True:
+                yield await subscriber[1].get()
+        finally:
+            with self._lock:
+                self._subscribers[channel].discard(subscriber)
+
+    def flush(self):
+        self.sent.clear()
+
+
+_layer = None
+
+
+def get_channel_layer():
+    global _layer
+
+    if _layer is None:
+        config = settings.REALTIME
+        layer_class = import_string(config["LAYER"])
+        _layer = layer_class(url=config.get("REDIS_URL"))
+
+    return _layer
+
+
+@receiver(setting_changed)
+def reset_channel_layer(setting=None, **kwargs):
+    global _layer
+    if setting in (None, "REALTIME"):
+        _layer = None
+
+
+# =========================
+# EVENTOS
+# =========================
+def publish_to_users(user_ids, event, data):
+    """
+    Publica un evento a cada usuario. Si Redis no está disponible se
+    descarta: el cliente vuelve a sincronizar al reconectarse.
+    """
+    layer = get_channel_layer()
+    message = {"event": event, "data": data}
+
+    for user_id in set(user_ids):
+        if user_id is None:
+            continue
+        try:
+            layer.publish(user_channel(user_id), message)
+        except Exception:
+            logger.exception("No se pudo publicar el evento %s", event)
+
+
+def publish_notifications(notifications):
+    """
+    Avisa a cada destinatario que tiene una notificación nueva.
+    Sirve tanto para create() como para bulk_create().
+    """
+    from .notification_text import load_usernames, referenced_user_ids, render_notification
+
+    usernames = load_usernames(referenced_user_ids(notifications))
+
+    for notification in notifications:
+        publish_to_users([notification.user_id], "notification", {
+            "id": notification.id,
+            "task": notification.task_id,
+            "type": notification.type,
+            "message": render_notification(notification, usernames),
+            "created_at": notification.created_at,
+        })
+
+
+def publish_task_change(task_id, action, user_ids):
+    publish_to_users(user_ids, "task", {"id": task_id, "action": action})
@@ -0,0 +1,112 @@
+# tareas/reminders.py
+from datetime import datetime, time, timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+
+from .models import TaskReminder
+
+
+OPEN_STATUS = ['pendiente', 'en_progreso']
+
+
+def reminder_policy(priority):
+    """
+    Etapas (en días respecto a due_date) configuradas para una prioridad.
+    """
+    policies = settings.TASK_REMINDER_POLICIES
+    return sorted(set(policies.get(priority, policies["media"])))
+
+
+def fire_time(due_date, offset_days):
+    """
+    Hora local a la que se dispara una etapa.
+    """
+    day = due_date + timedelta(days=offset_days)
+    return timezone.make_aware(datetime.combine(day, time(settings.TASK_REMINDER_HOUR)))
+
+
+def build_reminders(task, catch_up=True, now=None):
+    """
+    Recordatorios futuros de la tarea según su prioridad. Si `catch_up`
+    es True, la etapa más reciente que ya pasó se dispara enseguida
+    (por ejemplo al crear una tarea que ya está vencida).
+    """
+    if task.status not in OPEN_STATUS:
+        return []
+
+    now = now or timezone.now()
+    reminders = []
+    missed = None
+
+    for offset in reminder_policy(task.priority):
+        fire_at = fire_time(task.due_date, offset)
+        if fire_at > now:
+            reminders.append(TaskReminder(task=task, offset_days=offset, fire_at=fire_at))
+        else:
+            missed = offset
+
+    if catch_up and missed is not None:
+        reminders.append(TaskReminder(task=task, offset_days=missed, fire_at=now))
+
+    return reminders
+
+
+def schedule_task_reminders(task, catch_up=True):
+    """
+    Reemplaza los recordatorios pendientes de la tarea. Se llama cuando
+    cambia due_date, la prioridad o el estado.
+    """
+    with transaction.atomic():
+        TaskReminder.objects.filter(task=task).delete()
+        TaskReminder.objects.bulk_create(build_reminders(task, catch_up=catch_up))
+
+
+def schedule_many_task_reminders(tasks, catch_up_ids=()):
+    """
+    schedule_task_reminders para muchas tareas a la vez (operaciones
+    masivas): un DELETE y un INSERT en total.
+    """
+    tasks = list(tasks)
+    if not tasks:
+        return
+
+    now = timezone.now()
+    reminders = [
+        reminder
+        for task in tasks
+        for reminder in build_reminders(task, catch_up=task.id in catch_up_ids, now=now)
+    ]
+
+    with transaction.atomic():
+        TaskReminder.objects.filter(task_id__in=[task.id for task in tasks]).delete()
+        TaskReminder.objects.bulk_create(reminders)
+
+
+def stage_text(offset_days):
+    """
+    (asunto, texto) de una etapa para armar el mensaje.
+    """
+    if offset_days < -1:
+        return "Tarea próxima a vencer", f"vence en {-offset_days} días"
+    if offset_days == -1:
+        return "Tarea próxima a vencer", "vence mañana"
+    if offset_days == 0:
+        return "Tarea por vencer hoy", "vence hoy"
+    if offset_days == 1:
+        return "Tarea vencida", "ha vencido"
+    return "Tarea vencida", f"venció hace {offset_days} días"
+
+
+def reschedule_task_reminders(task, old_due_date, old_priority, old_status):
+    """
+    Reprograma si cambió algo que afecta a los recordatorios. Solo se
+    recupera una etapa ya pasada si cambió due_date o se reabrió la tarea,
+    para no repetir un aviso ya enviado.
+    """
+    due_changed = old_due_date != task.due_date
+    reopened = old_status not in OPEN_STATUS and task.status in OPEN_STATUS
+
+    if due_changed or old_priority != task.priority or old_status != task.status:
+        schedule_task_reminders(task, catch_up=due_changed or reopened)
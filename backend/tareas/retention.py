@@ -0,0 +1,72 @@
+# tareas/retention.py
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
+from django.utils import timezone
+
+from .models import Notification, ArchivedNotification
+from .notification_text import load_usernames, referenced_user_ids, render_notification
+from .read_state import with_read_state
+from .unread import invalidate_unread
+
+
+def retention_filter(now=None):
+    """
+    Q de las notificaciones que ya deben pasar al archivo según
+    NOTIFICATION_RETENTION (se aplica sobre un queryset con is_read).
+    """
+    config = settings.NOTIFICATION_RETENTION
+    now = now or timezone.now()
+
+    expired = Q(is_read=True, created_at__lt=now - timedelta(days=config["READ_AFTER_DAYS"]))
+
+    if config.get("UNREAD_AFTER_DAYS") is not None:
+        expired |= Q(created_at__lt=now - timedelta(days=config["UNREAD_AFTER_DAYS"]))
+
+    return expired
+
+
+def archive_notifications_chunk(chunk_size, now=None):
+    """
+    Mueve un bloque de notificaciones vencidas al archivo en una
+    transacción corta: copia con bulk_create y borra por id. El archivo
+    guarda el texto ya armado, así no depende de que la tarea siga
+    existiendo. Devuelve cuántas se movieron.
+    """
+    with transaction.atomic():
+        notifications = list(
+            with_read_state(Notification.objects.select_related("task__assigned_to", "actor"))
+            .filter(retention_filter(now))
+            .order_by("id")
+            .select_for_update(skip_locked=True, of=("self",))
+            [:chunk_size]
+        )
+        if not notifications:
+            return 0
+
+        usernames = load_usernames(referenced_user_ids(notifications))
+
+        ArchivedNotification.objects.bulk_create(
+            [
+                ArchivedNotification(
+                    id=n.id,
+                    user_id=n.user_id,
+                    task_id=n.task_id,
+                    type=n.type,
+                    message=render_notification(n, usernames),
+                    is_read=n.is_read,
+                    created_at=n.created_at,
+                )
+                for n in notifications
+            ],
+            ignore_conflicts=True
+        )
+        Notification.objects.filter(id__in=[n.id for n in notifications]).delete()
+
+        # Si se archivaron no leídas, el contador de esos usuarios cambió
+        for user_id in {n.user_id for n in notifications if not n.is_read}:
+            transaction.on_commit(lambda user_id=user_id: invalidate_unread(user_id))
+
+    return len(notifications)
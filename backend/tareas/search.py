@@ -0,0 +1,232 @@
+# tareas/search.py
+import re
+import unicodedata
+from collections import Counter
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.db.models import Exists, OuterRef, Q, Subquery, Sum, Value
+from django.db.models.expressions import RawSQL
+from django.db.models.functions import Coalesce
+
+from .models import Task, Comment, SearchToken
+from .pagination import SearchPagination
+
+
+TERM_RE = re.compile(r"\w+")
+MODES = ["natural", "boolean"]
+
+# Columnas del índice FULLTEXT (migración 0012)
+TASK_COLUMNS = ["title", "description"]
+COMMENT_COLUMNS = ["message"]
+
+
+def use_fulltext():
+    backend = settings.TASK_SEARCH["BACKEND"]
+    if backend == "auto":
+        return connection.vendor == "mysql"
+    return backend == "fulltext"
+
+
+# =========================
+# TÉRMINOS
+# =========================
+def normalize(text):
+    # "Revisión" y "revision" son el mismo término
+    text = unicodedata.normalize("NFKD", text or "")
+    return "".join(c for c in text if not unicodedata.combining(c)).lower()
+
+
+def tokenize(text):
+    min_length = settings.TASK_SEARCH["MIN_TERM_LENGTH"]
+    return [term[:64] for term in TERM_RE.findall(normalize(text)) if len(term) >= min_length]
+
+
+def parse_query(query, mode):
+    """
+    [(término, operador, prefijo)]. En modo boolean se respetan, como en
+    MySQL, "+" (obligatorio), "-" (excluido) y "*" al final (prefijo).
+    """
+    if mode != "boolean":
+        return [(term, "", False) for term in tokenize(query)]
+
+    terms = []
+    for word in query.split():
+        operator = word[0] if word[0] in "+-" else ""
+        prefix = word.endswith("*")
+        terms += [(term, operator, prefix) for term in tokenize(word)]
+    return terms
+
+
+# =========================
+# ÍNDICE INVERTIDO (SIN FULLTEXT)
+# =========================
+def build_tokens(text, **document):
+    return [
+        SearchToken(term=term, weight=weight, **document)
+        for term, weight in Counter(tokenize(text)).items()
+    ]
+
+
+def index_tasks(task_ids):
+    """
+    Reescribe los términos de título y descripción de las tareas.
+    Con FULLTEXT no hace nada: el índice lo mantiene MySQL.
+    """
+    task_ids = list(task_ids)
+    if use_fulltext() or not task_ids:
+        return
+
+    tokens = []
+    for task_id, title, description in Task.objects.filter(id__in=task_ids).values_list(
+        "id", "title", "description"
+    ):
+        # El título pesa doble
+        tokens += build_tokens(f"{title} {title} {description}", task_id=task_id)
+
+    with transaction.atomic():
+        SearchToken.objects.filter(task_id__in=task_ids, comment__isnull=True).delete()
+        SearchToken.objects.bulk_create(tokens)
+
+
+def index_comments(comment_ids):
+    comment_ids = list(comment_ids)
+    if use_fulltext() or not comment_ids:
+        return
+
+    tokens = []
+    for comment_id, task_id, message in Comment.objects.filter(id__in=comment_ids).values_list(
+        "id", "task_id", "message"
+    ):
+        tokens += build_tokens(message, task_id=task_id, comment_id=comment_id)
+
+    with transaction.atomic():
+        SearchToken.objects.filter(comment_id__in=comment_ids).delete()
+        SearchToken.objects.bulk_create(tokens)
+
+
+def no_results(queryset):
+    # Con search_rank igual: después se ordena por relevancia
+    return queryset.annotate(search_rank=Value(0)).none()
+
+
+def term_filter(terms):
+    match = Q()
+    for term, _, prefix in terms:
+        match |= Q(term__startswith=term) if prefix else Q(term=term)
+    return match
+
+
+def search_index(queryset, query, mode, document):
+    """
+    Relevancia = suma de pesos de los términos que coinciden. `document`
+    es "task" (tareas) o "comment" (comentarios).
+    """
+    terms = parse_query(query, mode)
+    positive = [term for term in terms if term[1] != "-"]
+    if not positive:
+        return no_results(queryset)
+
+    tokens = SearchToken.objects.filter(**{document: OuterRef("pk")})
+    if document == "task":
+        tokens = tokens.filter(comment__isnull=True)
+
+    rank = tokens.filter(term_filter(positive)).values(document).annotate(
+        total=Sum("weight")
+    ).values("total")[:1]
+
+    queryset = queryset.annotate(
+        search_rank=Coalesce(Subquery(rank), 0)
+    ).filter(search_rank__gt=0)
+
+    for term in terms:
+        if term[1] == "+":
+            queryset = queryset.filter(Exists(tokens.filter(term_filter([term]))))
+        elif term[1] == "-":
+            queryset = queryset.exclude(Exists(tokens.filter(term_filter([term]))))
+
+    return queryset
+
+
+# =========================
+# FULLTEXT (MYSQL)
+# =========================
+def boolean_query(query):
+    """
+    Rearma la consulta en modo boolean solo con términos ya tokenizados
+    y los operadores que se admiten (+, -, * final). Comillas, paréntesis
+    u operadores sueltos ("foo, +-) son error de sintaxis en MySQL.
+    """
+    return " ".join(
+        f"{operator}{term}{'*' if prefix else ''}"
+        for term, operator, prefix in parse_query(query, "boolean")
+    )
+
+
+def search_fulltext(queryset, query, mode, columns):
+    if mode == "boolean":
+        query = boolean_query(query)
+        if not query:
+            return no_results(queryset)
+
+    quote = connection.ops.quote_name
+    table = quote(queryset.model._meta.db_table)
+    match = ", ".join(f"{table}.{quote(column)}" for column in columns)
+    modifier = "IN BOOLEAN MODE" if mode == "boolean" else "IN NATURAL LANGUAGE MODE"
+
+    rank = RawSQL(f"MATCH ({match}) AGAINST (%s {modifier})", [query])
+    return queryset.annotate(search_rank=rank).filter(search_rank__gt=0)
+
+
+# =========================
+# BÚSQUEDA
+# =========================
+def search_tasks(queryset, query, mode="natural"):
+    if use_fulltext():
+        queryset = search_fulltext(queryset, query, mode, TASK_COLUMNS)
+    else:
+        queryset = search_index(queryset, query, mode, "task")
+    return queryset.order_by("-search_rank", "-id")
+
+
+def search_comments(queryset, query, mode="natural"):
+    if use_fulltext():
+        queryset = search_fulltext(queryset, query, mode, COMMENT_COLUMNS)
+    else:
+        queryset = search_index(queryset, query, mode, "comment")
+    return queryset.order_by("-search_rank", "-id")
+
+
+class SearchMixin:
+    """
+    ?search=texto (y ?search_mode=natural|boolean) en un ViewSet. Con
+    búsqueda los resultados van por relevancia y se paginan por número
+    de página; sin ella todo queda como estaba.
+    """
+
+    search_function = None
+
+    def get_search(self):
+        query = self.request.query_params.get("search", "").strip()
+        mode = self.request.query_params.get("search_mode", "natural")
+        return query, mode if mode in MODES else "natural"
+
+    def search_queryset(self, queryset, query, mode):
+        return self.search_function(queryset, query, mode)
+
+    def filter_queryset(self, queryset):
+        queryset = super().filter_queryset(queryset)
+
+        query, mode = self.get_search()
+        if query:
+            queryset = self.search_queryset(queryset, query, mode)
+        return queryset
+
+    @property
+    def paginator(self):
+        if not hasattr(self, "_paginator"):
+            if self.get_search()[0]:
+                self._paginator = SearchPagination()
+            else:
+                self._paginator = self.pagination_class() if self.pagination_class else None
+        return self._paginator
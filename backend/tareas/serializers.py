@@ -1,14 +1,23 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from django.shortcuts import get_object_or_404
-from .emails import send_task_email
+from django.db.models import Q
+from django.utils import timezone
+from users.profile_cache import get_user_role
+from .notification_text import load_usernames, referenced_user_ids, render_notification
+from .events import (
+    emit, TaskCreated, TaskDelegated, StatusChanged, TaskUpdated, CommentAdded, AttachmentAdded
+)
+from .reminders import schedule_task_reminders, reschedule_task_reminders
 
 from .models import (
     Task,
     TaskDelegation,
     Comment,
     TaskAttachment,
-    Notification
+    Notification,
+    ArchivedNotification,
+    TaskImportJob
 )
 
 # =========================
@@ -22,10 +31,7 @@ class UserSerializer(serializers.ModelSerializer):
         fields = ["id", "username", "email", "role"]
 
     def get_role(self, obj):
-        try:
-            return obj.userprofile.role
-        except:
-            return None
+        return get_user_role(obj)
 
 
 # =========================
@@ -80,37 +86,10 @@ class TaskSerializer(serializers.ModelSerializer):
             validated_data["assigned_to"] = request.user
 
         task = Task.objects.create(**validated_data)
+        schedule_task_reminders(task)
 
-        #  Notificación
-        if task.assigned_to:
-            Notification.objects.create(
-                user=task.assigned_to,
-                task=task,
-                type="nueva",
-                message=f"Nueva tarea asignada: {task.title}"
-            )
-            # **Enviar correo**
-            if task.assigned_to.email:
-                try:
-                    send_task_email(
-                        subject="Nueva tarea asignada",
-                        message=(
-                            f"Hola {task.assigned_to.username},\n\n"
-                            f"Se te asignó una nueva tarea: {task.title}\n\n"
-                            f"Creada por: {request.user.username}\n"
-                            f"Ingresá al sistema para más detalles."
-                        ),
-                        recipient_email=task.assigned_to.email
-                    )
-                except Exception as e:
-                    print(f"No se pudo enviar email: {e}")
-                    Notification.objects.create(
-                        user=request.user,
-                        task=task,
-                        type="error",
-                        message=f"No se pudo enviar email a {task.assigned_to.username}"
-                    )
-        
+        # Notificación y email (events.py decide destinatarios)
+        emit(TaskCreated(task=task, actor=request.user))
 
         return task
 
@@ -152,77 +131,29 @@ class TaskSerializer(serializers.ModelSerializer):
 
                 instance.delegated_to = new_user
 
-                Notification.objects.create(
-                    user=new_user,
-                    task=instance,
-                    type="delegacion",
-                    message=f"La tarea '{instance.title}' fue delegada por {request.user.username}"
-                )
-
-                Notification.objects.create(
-                    user=request.user,
-                    task=instance,
-                    type="delegacion",
-                    message=f"Delegaste la tarea '{instance.title}' a {new_user.username}"
-                )
-
-                # Enviar email al usuario delegado
-                if new_user.email:
-                    try:
-                        send_task_email(
-                            subject="Tarea delegada",
-                            message=(
-                                f"Hola {new_user.username},\n\n"
-                                f"La tarea '{instance.title}' fue delegada a vos.\n\n"
-                                f"Delegada por: {request.user.username}\n\n"
-                                f"Ingresá al sistema para verla."
-                            ),
-                            recipient_email=new_user.email
-                        )
-                    except Exception as e:
-                        print(f"No se pudo enviar email a {new_user.email}: {e}")
-                        Notification.objects.create(
-                            user=request.user,
-                            task=instance,
-                            type="error",
-                            message=f"No se pudo enviar email a {new_user.username}"
-                        )
+                emit(TaskDelegated(task=instance, actor=request.user, to_user=new_user))
 
         instance.save()
 
+        reschedule_task_reminders(
+            instance,
+            old_due_date=old_data["due_date"],
+            old_priority=old_data["priority"],
+            old_status=old_data["status"]
+        )
+
         # =========================
-        # NOTIFICACIÓN POR CAMBIO DE ESTADO (AL CREADOR)
+        # NOTIFICACIÓN POR CAMBIO DE ESTADO
         # =========================
         if old_data["status"] != instance.status:
-            notified_users = set()
-
-            # creador
-            if instance.created_by:
-                notified_users.add(instance.created_by)
-
-            # asignado
-            if instance.assigned_to:
-                notified_users.add(instance.assigned_to)
-
-            # delegado
-            if instance.delegated_to:
-                notified_users.add(instance.delegated_to)
-
-            for user in notified_users:
-                Notification.objects.create(
-                    user=user,
-                    task=instance,
-                    type="estado",
-                    message=(
-                        f"La tarea '{instance.title}' cambió de estado: "
-                        f"{old_data['status']} → {instance.status}"
-                    )
-                )
-
-
-
-
-        # --- Enviar correo si cambió algún campo importante ---
+            emit(StatusChanged(
+                task=instance,
+                actor=request.user,
+                old_status=old_data["status"],
+                new_status=instance.status
+            ))
+
+        # --- Email si cambió algún campo importante ---
         changes = []
         for field in ["title", "description", "status", "priority", "due_date"]:
             old = old_data[field]
@@ -231,37 +162,7 @@ class TaskSerializer(serializers.ModelSerializer):
                 changes.append(f"{field.capitalize()}: {old} → {new}")
 
         if changes:
-            emailed_users = set()
-
-            if instance.created_by and instance.created_by.email:
-                emailed_users.add(instance.created_by)
-
-            if instance.assigned_to and instance.assigned_to.email:
-                emailed_users.add(instance.assigned_to)
-
-            if instance.delegated_to and instance.delegated_to.email:
-                emailed_users.add(instance.delegated_to)
-
-            for user in emailed_users:
-                try:
-                    send_task_email(
-                        subject=f"Tarea actualizada: {instance.title}",
-                        message=(
-                            f"Hola {user.username},\n\n"
-                            f"La tarea '{instance.title}' ha sido actualizada:\n\n"
-                            + "\n".join(changes) +
-                            "\n\nIngresá al sistema para ver los detalles."
-                        ),
-                        recipient_email=user.email
-                    )
-                except Exception as e:
-                    print(f"No se pudo enviar email a {user.email}: {e}")
-                    Notification.objects.create(
-                        user=request.user,
-                        task=instance,
-                        type="error",
-                        message=f"No se pudo enviar email a {user.username}"
-                    )
+            emit(TaskUpdated(task=instance, actor=request.user, changes=changes))
 
         return instance
 
@@ -275,7 +176,11 @@ class TaskSerializer(serializers.ModelSerializer):
         if not request or obj.delegated_to != request.user:
             return None
 
-        delegation = obj.delegations.order_by("-delegated_at").first()
+        # TaskViewSet ya trae la última delegación con un prefetch
+        if hasattr(obj, "latest_delegations"):
+            delegation = obj.latest_delegations[0] if obj.latest_delegations else None
+        else:
+            delegation = obj.delegations.order_by("-delegated_at").first()
         if delegation and delegation.from_user:
             return UserSerializer(delegation.from_user).data
 
@@ -296,13 +201,7 @@ class CommentSerializer(serializers.ModelSerializer):
         validated_data["user"] = self.context["request"].user
         comment = super().create(validated_data)
 
-        if comment.task.assigned_to:
-            Notification.objects.create(
-                user=comment.task.assigned_to,
-                task=comment.task,
-                type="comentario",
-                message=f"Nuevo comentario en: {comment.task.title}"
-            )
+        emit(CommentAdded(comment=comment, actor=comment.user))
 
         return comment
 
@@ -423,46 +322,9 @@ class TaskAttachmentSerializer(serializers.ModelSerializer):
         validated_data["uploaded_by"] = uploader
 
         attachment = super().create(validated_data)
-        task = attachment.task
-
-        # ----------------------------
-        # Notificación interna
-        # ----------------------------
-        involved_users = {u for u in [task.assigned_to, task.created_by, task.delegated_to] if u}
-
-        for user in involved_users:
-            Notification.objects.create(
-                user=user,
-                task=task,
-                type="archivo",
-                message=f"{uploader.username} agregó un archivo '{attachment.file.name.split('/')[-1]}' a la tarea: {task.title}"
-            )
 
-        # ----------------------------
-        # Enviar email a todos los involucrados
-        # ----------------------------
-        for user in involved_users:
-            if user.email:
-                try:
-                    send_task_email(
-                        subject=f"Nuevo archivo adjunto: {task.title}",
-                        message=(
-                            f"Hola {user.username},\n\n"
-                            f"{uploader.username} agregó un nuevo archivo a la tarea:\n"
-                            f"Título: {task.title}\n"
-                            f"Archivo: {attachment.file.name.split('/')[-1]}\n\n"
-                            "Ingresá al sistema para verlo."
-                        ),
-                        recipient_email=user.email
-                    )
-                except Exception as e:
-                    print(f"No se pudo enviar email a {user.email}: {e}")
-                    Notification.objects.create(
-                        user=uploader,
-                        task=task,
-                        type="error",
-                        message=f"No se pudo enviar email a {user.username}"
-                    )
+        # Notificación interna + email a los involucrados
+        emit(AttachmentAdded(attachment=attachment, actor=uploader))
 
         return attachment
 
@@ -480,9 +342,25 @@ class TaskDetailSerializer(TaskSerializer):
 # =========================
 # NOTIFICATION SERIALIZER
 # =========================
+class NotificationListSerializer(serializers.ListSerializer):
+    """
+    Resuelve de una vez los nombres citados en `params` de toda la página.
+    """
+
+    def to_representation(self, data):
+        notifications = list(data.all() if hasattr(data, "all") else data)
+        self.child.context["usernames"] = load_usernames(referenced_user_ids(notifications))
+        return super().to_representation(notifications)
+
+
 class NotificationSerializer(serializers.ModelSerializer):
+    # Anotado por read_state.with_read_state
+    is_read = serializers.BooleanField(read_only=True)
+    message = serializers.SerializerMethodField()
+
     class Meta:
         model = Notification
+        list_serializer_class = NotificationListSerializer
         fields = [
             "id",
             "user",
@@ -492,3 +370,300 @@ class NotificationSerializer(serializers.ModelSerializer):
             "is_read",
             "created_at"
         ]
+
+    def get_message(self, obj):
+        return render_notification(obj, self.context.get("usernames"))
+
+
+class ArchivedNotificationSerializer(serializers.ModelSerializer):
+    class Meta:
+        model = ArchivedNotification
+        fields = [
+            "id",
+            "task",
+            "type",
+            "message",
+            "is_read",
+            "created_at",
+            "archived_at"
+        ]
+
+
+class NotificationBulkActionSerializer(serializers.Serializer):
+    """
+    Acción masiva sobre las notificaciones del usuario: por lista de ids
+    y/o por filtros (tipo, tarea, anteriores a una fecha).
+    """
+
+    ACTION_CHOICES = ["read", "unread", "delete"]
+    FILTER_FIELDS = ["ids", "type", "task", "older_than"]
+
+    action = serializers.ChoiceField(choices=ACTION_CHOICES)
+    ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+        allow_empty=False,
+        max_length=1000
+    )
+    type = serializers.ChoiceField(choices=Notification.NOTIF_TYPE_CHOICES, required=False)
+    task = serializers.IntegerField(required=False)
+    older_than = serializers.DateTimeField(required=False)
+
+    def validate(self, data):
+        # Sin ningún criterio sería "todas": para eso está mark-all-read
+        if not any(field in data for field in self.FILTER_FIELDS):
+            raise serializers.ValidationError(
+                "Debes indicar ids o al menos un filtro (type, task, older_than)."
+            )
+        return data
+
+    def filter_queryset(self, queryset):
+        data = self.validated_data
+        if "ids" in data:
+            queryset = queryset.filter(id__in=data["ids"])
+        if "type" in data:
+            queryset = queryset.filter(type=data["type"])
+        if "task" in data:
+            queryset = queryset.filter(task_id=data["task"])
+        if "older_than" in data:
+            queryset = queryset.filter(created_at__lt=data["older_than"])
+        return queryset
+
+
+# =========================
+# FILTROS DEL LISTADO DE TAREAS
+# =========================
+class CommaListField(serializers.ListField):
+    """
+    Lista desde la query string: ?status=a,b o ?status=a&status=b.
+    """
+
+    def to_internal_value(self, data):
+        if isinstance(data, str):
+            data = [data]
+        values = [value.strip() for item in data for value in str(item).split(",") if value.strip()]
+        return super().to_internal_value(values)
+
+
+class TaskListFilterSerializer(serializers.Serializer):
+    """
+    Filtros de GET /tasks/. Todos son opcionales y se combinan con AND;
+    los rangos de fecha incluyen los extremos. Cada uno tiene su índice
+    (Task.Meta.indexes o el índice de la FK).
+    """
+
+    status = CommaListField(
+        child=serializers.ChoiceField(choices=Task._meta.get_field("status").choices),
+        required=False,
+        allow_empty=False
+    )
+    priority = CommaListField(
+        child=serializers.ChoiceField(choices=Task._meta.get_field("priority").choices),
+        required=False,
+        allow_empty=False
+    )
+    due_from = serializers.DateField(required=False)
+    due_to = serializers.DateField(required=False)
+    start_from = serializers.DateField(required=False)
+    start_to = serializers.DateField(required=False)
+    assigned_to = serializers.IntegerField(required=False)
+    delegated_to = serializers.IntegerField(required=False)
+    created_by = serializers.IntegerField(required=False)
+    # Vencida = due_date anterior a hoy y sin completar (como isOverdue del front)
+    overdue = serializers.BooleanField(required=False, allow_null=True, default=None)
+
+    def validate(self, data):
+        for start, end in (("due_from", "due_to"), ("start_from", "start_to")):
+            if start in data and end in data and data[start] > data[end]:
+                raise serializers.ValidationError({end: f"Debe ser igual o posterior a {start}."})
+        return data
+
+    def filter_queryset(self, queryset):
+        data = self.validated_data
+
+        if "status" in data:
+            queryset = queryset.filter(status__in=data["status"])
+        if "priority" in data:
+            queryset = queryset.filter(priority__in=data["priority"])
+        if "due_from" in data:
+            queryset = queryset.filter(due_date__gte=data["due_from"])
+        if "due_to" in data:
+            queryset = queryset.filter(due_date__lte=data["due_to"])
+        if "start_from" in data:
+            queryset = queryset.filter(start_date__gte=data["start_from"])
+        if "start_to" in data:
+            queryset = queryset.filter(start_date__lte=data["start_to"])
+        if "assigned_to" in data:
+            queryset = queryset.filter(assigned_to_id=data["assigned_to"])
+        if "delegated_to" in data:
+            queryset = queryset.filter(delegated_to_id=data["delegated_to"])
+        if "created_by" in data:
+            queryset = queryset.filter(created_by_id=data["created_by"])
+
+        if data.get("overdue") is not None:
+            overdue = Q(due_date__lt=timezone.localdate()) & ~Q(status="completada")
+            queryset = queryset.filter(overdue) if data["overdue"] else queryset.exclude(overdue)
+
+        return queryset
+
+
+# =========================
+# OPERACIONES MASIVAS SOBRE TAREAS
+# =========================
+class TaskBulkFilterSerializer(serializers.Serializer):
+    status = serializers.ChoiceField(choices=Task._meta.get_field("status").choices, required=False)
+    priority = serializers.ChoiceField(choices=Task._meta.get_field("priority").choices, required=False)
+    assigned_to = serializers.IntegerField(required=False)
+    delegated_to = serializers.IntegerField(required=False)
+    due_before = serializers.DateField(required=False)
+    due_after = serializers.DateField(required=False)
+
+
+class TaskBulkActionSerializer(serializers.Serializer):
+    """
+    Acción masiva sobre tareas. status / delegate / reassign se aplican
+    a una lista de ids y/o a un filtro; create recibe la lista de tareas.
+    """
+
+    ACTION_CHOICES = ["status", "delegate", "reassign", "create"]
+    MAX_ITEMS = 1000
+
+    action = serializers.ChoiceField(choices=ACTION_CHOICES)
+    ids = serializers.ListField(
+        child=serializers.IntegerField(),
+        required=False,
+        allow_empty=False,
+        max_length=MAX_ITEMS
+    )
+    filter = TaskBulkFilterSerializer(required=False)
+
+    status = serializers.ChoiceField(choices=Task._meta.get_field("status").choices, required=False)
+    user = serializers.IntegerField(required=False)
+    tasks = serializers.ListField(
+        child=serializers.DictField(),
+        required=False,
+        allow_empty=False,
+        max_length=MAX_ITEMS
+    )
+
+    def validate(self, data):
+        bulk_action = data["action"]
+
+        if bulk_action == "create":
+            if "tasks" not in data:
+                raise serializers.ValidationError("Debes indicar las tareas a crear.")
+            return data
+
+        # Sin ids ni filtro sería "todas": no se permite
+        if "ids" not in data and not data.get("filter"):
+            raise serializers.ValidationError("Debes indicar ids o un filtro.")
+
+        if bulk_action == "status" and "status" not in data:
+            raise serializers.ValidationError({"status": "Debes indicar el nuevo estado."})
+
+        if bulk_action in ("delegate", "reassign") and "user" not in data:
+            raise serializers.ValidationError({"user": "Debes indicar el usuario."})
+
+        return data
+
+    def filter_queryset(self, queryset):
+        data = self.validated_data
+        filters = data.get("filter") or {}
+
+        if "ids" in data:
+            queryset = queryset.filter(id__in=data["ids"])
+        if "status" in filters:
+            queryset = queryset.filter(status=filters["status"])
+        if "priority" in filters:
+            queryset = queryset.filter(priority=filters["priority"])
+        if "assigned_to" in filters:
+            queryset = queryset.filter(assigned_to_id=filters["assigned_to"])
+        if "delegated_to" in filters:
+            queryset = queryset.filter(delegated_to_id=filters["delegated_to"])
+        if "due_before" in filters:
+            queryset = queryset.filter(due_date__lt=filters["due_before"])
+        if "due_after" in filters:
+            queryset = queryset.filter(due_date__gt=filters["due_after"])
+        return queryset
+
+    def validate_new_tasks(self):
+        """
+        Valida cada tarea por separado: las inválidas se informan en el
+        resultado y el resto se crea igual. Los asignados se resuelven
+        con una sola consulta.
+        """
+        items, errors = [], []
+
+        for index, raw in enumerate(self.validated_data["tasks"]):
+            serializer = TaskSerializer(data=raw)
+            if serializer.is_valid():
+                items.append((index, serializer.validated_data))
+            else:
+                errors.append({"index": index, "result": "error", "detail": serializer.errors})
+
+        assigned_ids = {data.get("assigned_to_id") for _, data in items} - {None}
+        users = User.objects.in_bulk(assigned_ids)
+
+        valid = []
+        for index, data in items:
+            data = dict(data)
+            data.pop("delegated_to_id", None)  # no se delega en create
+            assigned_to_id = data.pop("assigned_to_id", None)
+
+            if assigned_to_id and assigned_to_id not in users:
+                errors.append({"index": index, "result": "error", "detail": "Usuario asignado inexistente"})
+                continue
+
+            valid.append((index, data, users.get(assigned_to_id)))
+
+        return valid, errors
+
+
+# =========================
+# IMPORTACIÓN DE TAREAS (CSV)
+# =========================
+class TaskImportRowSerializer(serializers.Serializer):
+    """
+    Una fila del CSV. `assignee` es username o email; vacío = quien importa.
+    """
+
+    title = serializers.CharField(max_length=200)
+    description = serializers.CharField(required=False, default="")
+    status = serializers.ChoiceField(
+        choices=Task._meta.get_field("status").choices, required=False, default="pendiente"
+    )
+    priority = serializers.ChoiceField(
+        choices=Task._meta.get_field("priority").choices, required=False, default="media"
+    )
+    start_date = serializers.DateField(required=False)
+    due_date = serializers.DateField()
+    assignee = serializers.CharField(required=False)
+
+
+class TaskImportJobSerializer(serializers.ModelSerializer):
+    progress = serializers.SerializerMethodField(read_only=True)
+
+    class Meta:
+        model = TaskImportJob
+        fields = [
+            "id",
+            "file",
+            "status",
+            "total_rows",
+            "processed_rows",
+            "progress",
+            "created_count",
+            "error_count",
+            "errors",
+            "last_error",
+            "created_at",
+            "started_at",
+            "finished_at",
+        ]
+        read_only_fields = [field for field in fields if field != "file"]
+        extra_kwargs = {"file": {"write_only": True}}
+
+    def get_progress(self, obj):
+        if not obj.total_rows:
+            return 100 if obj.status == "completado" else 0
+        return round(obj.processed_rows * 100 / obj.total_rows)
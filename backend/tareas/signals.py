@@ -0,0 +1,128 @@
+from django.db import transaction
+from django.db.models import QuerySet
+from django.db.models.signals import pre_delete, post_save, post_delete
+from django.dispatch import receiver
+
+from .list_cache import bump_visibility_versions, task_audience
+from .search import index_tasks, index_comments
+from .models import Task, TaskDelegation, TaskVisibility, Comment, TaskAttachment, Notification
+from .realtime import publish_notifications, publish_task_change
+from .unread import add_unread
+from .visibility import TASK_REASONS, sync_task_visibility
+
+
+# Nombres con y sin "_id": update_fields acepta ambos
+TASK_USER_FIELDS = set(TASK_REASONS) | {field.removesuffix("_id") for field in TASK_REASONS}
+
+
+# =========================
+# VISIBILIDAD DE TAREAS
+# =========================
+def sync_and_bump(task_id):
+    """
+    Recalcula la visibilidad y sube la versión de listados de quienes
+    la tenían y de quienes la tienen ahora (un reasignado deja de verla).
+    """
+    audience = task_audience([task_id])
+    sync_task_visibility([task_id])
+    bump_visibility_versions(audience | task_audience([task_id]))
+
+
+@receiver(post_save, sender=Task)
+def update_task_visibility(sender, instance, update_fields=None, **kwargs):
+    # Guardados parciales que no tocan usuarios no cambian la visibilidad
+    if update_fields is not None and not TASK_USER_FIELDS & set(update_fields):
+        bump_visibility_versions(task_audience([instance.id]))
+        return
+
+    sync_and_bump(instance.id)
+
+
+@receiver(post_save, sender=TaskDelegation)
+def update_delegation_visibility(sender, instance, **kwargs):
+    sync_and_bump(instance.task_id)
+
+
+@receiver(post_delete, sender=TaskDelegation)
+def remove_delegation_visibility(sender, instance, origin=None, **kwargs):
+    # Si el borrado viene en cascada (tarea o usuario), la tarea también
+    # se está borrando y sus filas de visibilidad se van con ella
+    origin_model = origin.model if isinstance(origin, QuerySet) else type(origin)
+    if origin_model is not TaskDelegation:
+        return
+
+    sync_and_bump(instance.task_id)
+
+
+# =========================
+# CACHE DE LISTADOS
+# =========================
+@receiver(pre_delete, sender=Task)
+def bump_deleted_task_audience(sender, instance, **kwargs):
+    # Antes del borrado: después la visibilidad ya no está. Se guarda en
+    # la instancia para avisar en tiempo real a los mismos usuarios
+    instance.deleted_audience = task_audience([instance.id])
+    bump_visibility_versions(instance.deleted_audience)
+
+
+@receiver(post_save, sender=Comment)
+@receiver(post_delete, sender=Comment)
+@receiver(post_save, sender=TaskAttachment)
+@receiver(post_delete, sender=TaskAttachment)
+def bump_task_child_audience(sender, instance, **kwargs):
+    bump_visibility_versions(task_audience([instance.task_id]))
+
+
+# =========================
+# BÚSQUEDA (ÍNDICE INVERTIDO)
+# =========================
+SEARCH_FIELDS = {"title", "description"}
+
+
+@receiver(post_save, sender=Task)
+def update_task_search(sender, instance, update_fields=None, **kwargs):
+    if update_fields is not None and not SEARCH_FIELDS & set(update_fields):
+        return
+    index_tasks([instance.id])
+
+
+@receiver(post_save, sender=Comment)
+def update_comment_search(sender, instance, **kwargs):
+    index_comments([instance.id])
+
+
+# =========================
+# EVENTOS EN TIEMPO REAL
+# =========================
+@receiver(post_save, sender=Notification)
+def push_notification(sender, instance, created, **kwargs):
+    if created:
+        transaction.on_commit(lambda: add_unread([instance]))
+        transaction.on_commit(lambda: publish_notifications([instance]))
+
+
+@receiver(post_save, sender=Task)
+def push_task_change(sender, instance, created, **kwargs):
+    action = "created" if created else "updated"
+
+    def publish():
+        # Después del commit la visibilidad ya está al día
+        user_ids = TaskVisibility.objects.filter(
+            task_id=instance.id
+        ).values_list("user_id", flat=True)
+        publish_task_change(instance.id, action, user_ids)
+
+    transaction.on_commit(publish)
+
+
+@receiver(post_delete, sender=Task)
+def push_task_delete(sender, instance, **kwargs):
+    # Todos los que la veían, también por historial de delegaciones
+    user_ids = getattr(instance, "deleted_audience", set()) | {
+        instance.created_by_id, instance.assigned_to_id, instance.delegated_to_id
+    }
+    user_ids.discard(None)
+
+    # Al terminar delete() Django deja el pk en None: se copia ahora
+    task_id = instance.id
+    transaction.on_commit(lambda: publish_task_change(task_id, "deleted", user_ids))
@@ -0,0 +1,142 @@
+# tareas/single_flight.py
+import hashlib
+import time
+from functools import wraps
+from uuid import uuid4
+
+from django.conf import settings
+from django.core.cache import cache
+from django.http import HttpResponseNotModified
+from rest_framework.response import Response
+
+from users.profile_cache import get_user_role
+
+
+# Headers que se copian a los requests que esperaron el resultado
+HANDOFF_HEADERS = ["ETag", "Last-Modified", "Cache-Control", "Vary"]
+
+
+def lock_key(key):
+    return f"tareas:flight:{key}:lock"
+
+
+def result_key(key, token):
+    return f"tareas:flight:{key}:result:{token}"
+
+
+# =========================
+# SINGLE FLIGHT
+# =========================
+def single_flight(key, compute):
+    """
+    Ejecuta `compute` una sola vez entre todos los workers que lo piden
+    con la misma clave al mismo tiempo. El primero toma el lock en Redis,
+    calcula y deja el resultado; el resto espera y lo reutiliza.
+
+    Si el que tiene el lock muere o falla (el lock desaparece sin
+    resultado) o la espera supera WAIT_TIMEOUT, se calcula directo.
+    El resultado tiene que poder guardarse en el cache (pickle).
+    """
+    config = settings.SINGLE_FLIGHT
+    token = uuid4().hex
+
+    if cache.add(lock_key(key), token, config["LOCK_TIMEOUT"]):
+        try:
+            value = compute()
+            cache.set(result_key(key, token), value, config["RESULT_TTL"])
+            return value
+        finally:
+            # Solo se libera si sigue siendo nuestro (pudo vencer y tomarlo otro)
+            if cache.get(lock_key(key)) == token:
+                cache.delete(lock_key(key))
+
+    holder = cache.get(lock_key(key))
+    deadline = time.monotonic() + config["WAIT_TIMEOUT"]
+
+    while holder is not None and time.monotonic() < deadline:
+        time.sleep(config["POLL_INTERVAL"])
+
+        found = cache.get_many([result_key(key, holder), lock_key(key)])
+        if result_key(key, holder) in found:
+            return found[result_key(key, holder)]
+
+        # Sin resultado y sin lock (o con otro dueño): el cálculo se perdió
+        if found.get(lock_key(key)) != holder:
+            break
+
+    return compute()
+
+
+# =========================
+# VISTAS
+# =========================
+def coalesce_key(request):
+    """
+    Requests "idénticos": mismo usuario y rol, misma URL y mismos
+    headers condicionales (uno puede terminar en 304 y otro no).
+    """
+    user = request.user
+    raw = "|".join([
+        str(user.pk),
+        str(get_user_role(user)),
+        request.build_absolute_uri(),
+        request.headers.get("If-None-Match", ""),
+        request.headers.get("If-Modified-Since", ""),
+    ])
+    return hashlib.sha1(raw.encode()).hexdigest()
+
+
+def coalescable(method):
+    """
+    Marca un método de vista (list, retrieve o una @action GET) para que
+    los requests concurrentes idénticos compartan una sola ejecución.
+    """
+
+    @wraps(method)
+    def wrapper(self, request, *args, **kwargs):
+        if request.method not in ("GET", "HEAD"):
+            return method(self, request, *args, **kwargs)
+
+        own = {}
+
+        def compute():
+            response = own["response"] = method(self, request, *args, **kwargs)
+            headers = {h: response[h] for h in HANDOFF_HEADERS if response.has_header(h)}
+
+            if isinstance(response, Response):
+                return response.status_code, response.data, headers
+            # El 304 de ConditionalListMixin es un HttpResponse sin `data`:
+            # se comparten solo el estado y los headers
+            if response.status_code == 304:
+                return response.status_code, None, headers
+            # Cualquier otra respuesta de Django no se comparte
+            return None
+
+        shared = single_flight(coalesce_key(request), compute)
+
+        # El que calculó devuelve su propia respuesta
+        if "response" in own:
+            return own["response"]
+        if shared is None:
+            return method(self, request, *args, **kwargs)
+
+        status_code, data, headers = shared
+        if status_code == 304:
+            response = HttpResponseNotModified()
+            for header, value in headers.items():
+                response[header] = value
+            return response
+        return Response(data, status=status_code, headers=headers)
+
+    return wrapper
+
+
+class CoalescedListMixin:
+    """
+    `list` coalescable. En el MRO va después de un cache de respuestas
+    (CachedListMixin), así solo se coordina el cálculo de los fallos.
+    """
+
+    @coalescable
+    def list(self, request, *args, **kwargs):
+        return super().list(request, *args, **kwargs)
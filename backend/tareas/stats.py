@@ -0,0 +1,104 @@
+# tareas/stats.py
+from datetime import timedelta
+
+from django.db.models import Count, Q
+from django.db.models.functions import TruncMonth
+
+from .models import Task
+
+
+STATUS_KEYS = [value for value, _ in Task._meta.get_field("status").choices]
+PRIORITY_KEYS = [value for value, _ in Task._meta.get_field("priority").choices]
+
+
+def build_task_stats(queryset, today):
+    """
+    Resume un queryset de tareas con tres consultas GROUP BY: una por
+    (estado, prioridad) con los conteos de vencimiento, otra por mes de
+    vencimiento y prioridad, y otra por usuario asignado.
+
+    "active" es como lo contaba el dashboard: sin completar y sin vencer.
+    "due_next_7_days" cuenta las que vencen de hoy a 7 días, en cualquier estado.
+    """
+    # Se filtra por id para agrupar sobre Task sin arrastrar los
+    # select_related / prefetch que el queryset trae para el serializer.
+    tasks = Task.objects.filter(id__in=queryset.order_by().values("id")).order_by()
+
+    week_end = today + timedelta(days=6 - today.weekday())
+    next_week = today + timedelta(days=7)
+    open_tasks = ~Q(status="completada")
+
+    stats = {
+        "total": 0,
+        "by_status": {key: 0 for key in STATUS_KEYS},
+        "by_priority": {key: 0 for key in PRIORITY_KEYS},
+        "active": 0,
+        "overdue": 0,
+        "due_today": 0,
+        "due_this_week": 0,
+        "due_next_7_days": 0,
+        "by_month": [],
+        "by_assignee": [],
+    }
+
+    # =========================
+    # ESTADO / PRIORIDAD / VENCIMIENTOS
+    # =========================
+    rows = tasks.values("status", "priority").annotate(
+        total=Count("id"),
+        active=Count("id", filter=open_tasks & Q(due_date__gte=today)),
+        overdue=Count("id", filter=open_tasks & Q(due_date__lt=today)),
+        due_today=Count("id", filter=open_tasks & Q(due_date=today)),
+        due_this_week=Count(
+            "id",
+            filter=open_tasks & Q(due_date__gte=today, due_date__lte=week_end)
+        ),
+        due_next_7_days=Count("id", filter=Q(due_date__gte=today, due_date__lte=next_week)),
+    )
+
+    for row in rows:
+        stats["total"] += row["total"]
+        stats["by_status"][row["status"]] = stats["by_status"].get(row["status"], 0) + row["total"]
+        stats["by_priority"][row["priority"]] = stats["by_priority"].get(row["priority"], 0) + row["total"]
+        stats["active"] += row["active"]
+        stats["overdue"] += row["overdue"]
+        stats["due_today"] += row["due_today"]
+        stats["due_this_week"] += row["due_this_week"]
+        stats["due_next_7_days"] += row["due_next_7_days"]
+
+    # =========================
+    # POR MES DE VENCIMIENTO
+    # =========================
+    months = {}
+    rows = tasks.annotate(month=TruncMonth("due_date")).values("month", "priority").annotate(
+        total=Count("id")
+    ).order_by("month")
+
+    for row in rows:
+        key = row["month"].strftime("%Y-%m")
+        month = months.setdefault(key, {"month": key, **{priority: 0 for priority in PRIORITY_KEYS}})
+        month[row["priority"]] = row["total"]
+
+    stats["by_month"] = list(months.values())
+
+    # =========================
+    # POR USUARIO ASIGNADO
+    # =========================
+    assignees = tasks.values("assigned_to", "assigned_to__username").annotate(
+        total=Count("id"),
+        completed=Count("id", filter=Q(status="completada")),
+        overdue=Count("id", filter=open_tasks & Q(due_date__lt=today)),
+    ).order_by("-total", "assigned_to")
+
+    stats["by_assignee"] = [
+        {
+            "user_id": row["assigned_to"],
+            "username": row["assigned_to__username"],
+            "total": row["total"],
+            "completed": row["completed"],
+            "overdue": row["overdue"],
+        }
+        for row in assignees
+    ]
+
+    return stats
@@ -279,119 +279,299 @@ def check_task_due_dates():
     return f"Se revisaron {total_checked} tareas pendientes o en progreso vencidas o por vencer hoy"
 """
 
+import logging
+from datetime import timedelta
+from uuid import uuid4
+
 from celery import shared_task
+from django.conf import settings
+from django.db import transaction
+from django.db.models import Q
 from django.utils import timezone
-from .models import Task, Notification
+from .models import Notification, EmailOutbox, TaskReminder, TaskImportJob
 from .emails import send_task_email
+from .reminders import OPEN_STATUS, stage_text
+from .notification_text import render_notification
+from .realtime import publish_notifications
+from .unread import add_unread, reconcile_unread_counts
+from .retention import archive_notifications_chunk
+from .imports import run_import, fail_stale_imports
 
-@shared_task
-def check_task_due_dates():
-    today = timezone.localdate()  # fecha local según TIME_ZONE
-    total_checked = 0
 
-    # ------------------------
-    # 1️⃣ Tareas vencidas
-    # ------------------------
-    overdue_tasks = Task.objects.filter(
-        status__in=['pendiente', 'en_progreso'],
-        due_date__lt=today,
-        reminder_expired_sent=False
-    )
+logger = logging.getLogger(__name__)
 
-    for task in overdue_tasks:
-        involved_users = {u for u in [task.assigned_to, task.created_by, task.delegated_to] if u}
 
-        for user in involved_users:
-            # Mensaje según rol
-            if user == task.created_by:
-                message_text = f"La tarea '{task.title}' que creaste para {task.assigned_to.username if task.assigned_to else 'N/A'} ha vencido."
-            elif user == task.assigned_to:
-                message_text = f"Tienes la tarea '{task.title}' que ha vencido."
-            elif user == task.delegated_to:
-                message_text = f"La tarea '{task.title}' delegada a ti ha vencido."
-            else:
-                message_text = f"La tarea '{task.title}' ha vencido."
-
-            # Notificación interna
-            Notification.objects.create(
-                user=user,
-                task=task,
-                type="vencimiento",
-                message=message_text
+# ============================================================
+# RECORDATORIOS DE VENCIMIENTO
+# ============================================================
+@shared_task
+def fire_due_reminders():
+    """
+    Toma solo los recordatorios cuya hora ya llegó (índice por fire_at),
+    en bloques. Cada bloque es una transacción: notificaciones con
+    bulk_create, emails al outbox y borrado de los recordatorios enviados.
+    El costo depende de cuántos recordatorios se disparan, no del total de tareas.
+    """
+    chunk_size = settings.DUE_DATE_CHECK_CHUNK_SIZE
+    total = 0
+
+    while True:
+        now = timezone.now()
+
+        with transaction.atomic():
+            reminders = list(
+                TaskReminder.objects
+                .select_for_update(skip_locked=True, of=("self",))
+                .select_related("task__created_by", "task__assigned_to", "task__delegated_to")
+                .filter(fire_at__lte=now)
+                .order_by("fire_at", "id")[:chunk_size]
             )
+            if not reminders:
+                break
 
-            # Email
-            if user.email:
-                try:
-                    send_task_email(
-                        subject=f"Tarea vencida: {task.title}",
-                        message=f"Hola {user.username},\n\n{message_text}\nIngresá al sistema para más detalles.",
-                        recipient_email=user.email
-                    )
-                except Exception as e:
-                    print(f"No se pudo enviar email a {user.email}: {e}")
-                    Notification.objects.create(
+            batch = uuid4().hex
+            notifications = []
+            emails = []
+
+            for reminder in reminders:
+                task = reminder.task
+
+                # Completada después de programarse: se descarta
+                if task.status not in OPEN_STATUS:
+                    continue
+
+                subject, _ = stage_text(reminder.offset_days)
+                involved_users = {u for u in [task.assigned_to, task.created_by, task.delegated_to] if u}
+
+                for user in involved_users:
+                    notification = Notification(
                         user=user,
                         task=task,
-                        type="error",
-                        message=f"No se pudo enviar email a {user.username}"
+                        type="vencimiento",
+                        params={"offset": reminder.offset_days}
                     )
+                    notifications.append(notification)
+
+                    # El email lleva el mismo texto que se muestra en la app
+                    message_text = render_notification(notification, usernames={})
+
+                    if user.email:
+                        emails.append(EmailOutbox(
+                            recipient_email=user.email,
+                            subject=f"{subject}: {task.title}"[:255],
+                            message=f"Hola {user.username},\n\n{message_text}\nIngresá al sistema para más detalles.",
+                            task=task,
+                            batch=batch
+                        ))
+
+            Notification.objects.bulk_create(notifications)
+            EmailOutbox.objects.bulk_create(emails)
+            TaskReminder.objects.filter(id__in=[r.id for r in reminders]).delete()
+
+            # bulk_create no dispara post_save: se avisa a mano
+            transaction.on_commit(lambda notifications=notifications: add_unread(notifications))
+            transaction.on_commit(lambda notifications=notifications: publish_notifications(notifications))
+
+            if emails:
+                transaction.on_commit(lambda batch=batch: deliver_email_batch.delay(batch))
+
+        total += len(reminders)
+
+    return f"Se dispararon {total} recordatorios"
+#gggggggg
+
+
+# ============================================================
+# OUTBOX DE EMAILS
+# ============================================================
+def email_retry_delay(attempts):
+    """
+    Backoff exponencial: base, base*2, base*4... con tope.
+    """
+    config = settings.EMAIL_OUTBOX
+    return min(config["RETRY_BACKOFF"] * 2 ** (attempts - 1), config["RETRY_BACKOFF_MAX"])
+
+
+def claim_email(email_id):
+    """
+    Pasa el email de "pendiente" a "enviando" con un UPDATE condicional:
+    de dos workers con el mismo id solo uno cambia la fila y lo envía.
+    next_attempt_at queda como vencimiento del reclamo, por si el worker muere.
+    """
+    lease_until = timezone.now() + timedelta(seconds=settings.EMAIL_OUTBOX["STALE_AFTER"])
+    claimed = EmailOutbox.objects.filter(id=email_id, status="pendiente").update(
+        status="enviando",
+        next_attempt_at=lease_until
+    )
+    if not claimed:
+        return None
+    return EmailOutbox.objects.get(id=email_id)
+
+
+def attempt_delivery(email):
+    """
+    Intenta enviar un email del outbox (ya reclamado) y guarda el resultado.
+    Devuelve los segundos hasta el próximo reintento, o None si no hay que reintentar.
+    """
+    try:
+        send_task_email(
+            subject=email.subject,
+            message=email.message,
+            recipient_email=email.recipient_email
+        )
+    except Exception as e:
+        email.attempts += 1
+        email.last_error = str(e)
+
+        # Dead-letter: queda como fallido para revisarlo desde el admin
+        if email.attempts >= settings.EMAIL_OUTBOX["MAX_ATTEMPTS"]:
+            email.status = "fallido"
+            email.next_attempt_at = None
+            email.save(update_fields=["attempts", "last_error", "status", "next_attempt_at"])
+            return None
+
+        delay = email_retry_delay(email.attempts)
+        email.status = "pendiente"
+        email.next_attempt_at = timezone.now() + timedelta(seconds=delay)
+        email.save(update_fields=["attempts", "last_error", "status", "next_attempt_at"])
+        return delay
+
+    email.status = "enviado"
+    email.sent_at = timezone.now()
+    email.last_error = ""
+    email.next_attempt_at = None
+    email.save(update_fields=["status", "sent_at", "last_error", "next_attempt_at"])
+    return None
+
+
+@shared_task(bind=True, max_retries=None)
+def deliver_email(self, email_id):
+    email = claim_email(email_id)
+    if email is None:
+        return f"Email {email_id} ya procesado"
+
+    delay = attempt_delivery(email)
+    if delay is not None:
+        raise self.retry(countdown=delay)
+
+    return f"Email {email_id} {email.status}"
 
-        task.reminder_expired_sent = True
-        task.save()
-        total_checked += 1
 
-    # ------------------------
-    # 2️⃣ Tareas por vencer hoy
-    # ------------------------
-    due_today_tasks = Task.objects.filter(
-        status__in=['pendiente', 'en_progreso'],
-        due_date=today,
-        reminder_due_soon_sent=False
+@shared_task
+def deliver_email_batch(batch):
+    """
+    Envía los emails de un bloque de recordatorios. Los que fallan quedan
+    pendientes con next_attempt_at y los retoma dispatch_pending_emails.
+    """
+    email_ids = list(
+        EmailOutbox.objects.filter(batch=batch, status="pendiente")
+        .order_by("id")
+        .values_list("id", flat=True)
     )
 
-    for task in due_today_tasks:
-        involved_users = {u for u in [task.assigned_to, task.created_by, task.delegated_to] if u}
+    sent = 0
+    for email_id in email_ids:
+        # Puede haberlo tomado deliver_email desde el barrido de pendientes
+        email = claim_email(email_id)
+        if email is None:
+            continue
+        attempt_delivery(email)
+        sent += email.status == "enviado"
 
-        for user in involved_users:
-            # Mensaje según rol
-            if user == task.created_by:
-                message_text = f"La tarea '{task.title}' que creaste para {task.assigned_to.username if task.assigned_to else 'N/A'} vence hoy."
-            elif user == task.assigned_to:
-                message_text = f"Tienes la tarea '{task.title}' que vence hoy."
-            elif user == task.delegated_to:
-                message_text = f"La tarea '{task.title}' delegada a ti vence hoy."
-            else:
-                message_text = f"La tarea '{task.title}' vence hoy."
-
-            # Notificación interna
-            Notification.objects.create(
-                user=user,
-                task=task,
-                type="vencimiento",
-                message=message_text
-            )
+    return f"Lote {batch}: {sent} emails enviados"
 
-            # Email
-            if user.email:
-                try:
-                    send_task_email(
-                        subject=f"Tarea por vencer hoy: {task.title}",
-                        message=f"Hola {user.username},\n\n{message_text}\nIngresá al sistema para más detalles.",
-                        recipient_email=user.email
-                    )
-                except Exception as e:
-                    print(f"No se pudo enviar email a {user.email}: {e}")
-                    Notification.objects.create(
-                        user=user,
-                        task=task,
-                        type="error",
-                        message=f"No se pudo enviar email a {user.username}"
-                    )
 
-        task.reminder_due_soon_sent = True
-        task.save()
-        total_checked += 1
+@shared_task
+def dispatch_pending_emails():
+    """
+    Reencola emails pendientes cuyo envío se perdió (por ejemplo si el
+    broker no estaba disponible al hacer commit). Los "enviando" con el
+    reclamo vencido (el worker murió a mitad de camino) vuelven a pendiente.
+    """
+    config = settings.EMAIL_OUTBOX
+    now = timezone.now()
+    stale = now - timedelta(seconds=config["STALE_AFTER"])
+
+    # Sin next_attempt_at entran en este mismo barrido (el reclamo ya tenía STALE_AFTER)
+    EmailOutbox.objects.filter(status="enviando", next_attempt_at__lt=now).update(
+        status="pendiente",
+        next_attempt_at=None
+    )
 
-    return f"Se revisaron {total_checked} tareas pendientes o en progreso vencidas o por vencer hoy"
-#gggggggg
\ No newline at end of file
+    email_ids = list(
+        EmailOutbox.objects.filter(status="pendiente")
+        .filter(
+            Q(next_attempt_at__isnull=True, created_at__lt=stale) |
+            Q(next_attempt_at__lt=stale)
+        )
+        .order_by("id")
+        .values_list("id", flat=True)[:config["DISPATCH_BATCH_SIZE"]]
+    )
+
+    for email_id in email_ids:
+        deliver_email.delay(email_id)
+
+    return f"Se reencolaron {len(email_ids)} emails pendientes"
+
+
+# ============================================================
+# CONTADOR DE NO LEÍDAS
+# ============================================================
+@shared_task
+def reconcile_unread_notifications():
+    total = reconcile_unread_counts()
+    return f"Se reconciliaron {total} contadores de no leídas"
+
+
+# ============================================================
+# RETENCIÓN DE NOTIFICACIONES
+# ============================================================
+@shared_task
+def archive_old_notifications():
+    """
+    Pasa al archivo las notificaciones vencidas por bloques chicos, cada
+    uno en su propia transacción, para no bloquear la tabla caliente.
+    """
+    config = settings.NOTIFICATION_RETENTION
+    now = timezone.now()
+    total = 0
+
+    for _ in range(config["MAX_CHUNKS_PER_RUN"]):
+        moved = archive_notifications_chunk(config["CHUNK_SIZE"], now=now)
+        total += moved
+        if moved < config["CHUNK_SIZE"]:
+            break
+
+    return f"Se archivaron {total} notificaciones"
+
+
+# ============================================================
+# IMPORTACIÓN DE TAREAS (CSV)
+# ============================================================
+@shared_task
+def import_tasks_csv(job_id):
+    job = TaskImportJob.objects.select_related("created_by").filter(
+        id=job_id, status="pendiente"
+    ).first()
+    if job is None:
+        return f"Importación {job_id} ya procesada"
+
+    try:
+        created = run_import(job)
+    except Exception as e:
+        # Los bloques ya confirmados quedan; el job informa hasta dónde llegó
+        logger.exception("No se pudo completar la importación %s", job_id)
+        TaskImportJob.objects.filter(id=job_id).update(
+            status="fallido",
+            last_error=str(e),
+            finished_at=timezone.now()
+        )
+        return f"Importación {job_id} fallida"
+
+    return f"Importación {job_id}: {created} tareas creadas"
+
+
+@shared_task
+def fail_stale_task_imports():
+    failed = fail_stale_imports()
+    return f"{failed} importaciones sin avance marcadas como fallidas"
@@ -1,3 +1,1114 @@
-from django.test import TestCase
+import asyncio
+import json
+import tempfile
+import time
+from datetime import date, timedelta
+from unittest.mock import patch
 
-# Create your tests here.
+from asgiref.sync import async_to_sync
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.files.uploadedfile import SimpleUploadedFile
+from django.db import connection, transaction
+from django.test import override_settings
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from django.utils.http import http_date
+from rest_framework import viewsets
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
+
+from .models import Task, TaskDelegation, TaskReminder, Comment, Notification, EmailOutbox, TaskImportJob
+from .events import emit, collect_events, StatusChanged, TaskCreated
+from .imports import fail_stale_imports, resolve_users
+from .search import boolean_query
+from .conditional import ConditionalListMixin
+from .list_cache import list_cache_stats
+from .single_flight import single_flight, lock_key, result_key
+from .notification_text import render_notification
+from .realtime import get_channel_layer, user_channel
+from .tasks import fire_due_reminders, archive_old_notifications, claim_email, deliver_email, dispatch_pending_emails
+from .unread import reconcile_unread_counts, unread_key
+from .read_state import set_read_state, mark_all_read as mark_all_notifications_read
+from .views import sse_messages
+
+
+IN_MEMORY_REALTIME = {
+    "LAYER": "tareas.realtime.InMemoryChannelLayer",
+    "HEARTBEAT": 15,
+}
+
+
+# =========================
+# LISTADO DE TAREAS
+# =========================
+@override_settings(REALTIME=IN_MEMORY_REALTIME)
+class TaskListQueryCountTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+
+        self.admin = User.objects.create_user("admin", "admin@test.com", "pass")
+        self.admin.userprofile.role = "admin"
+        self.admin.userprofile.save()
+
+        self.employee = User.objects.create_user("empleado", "empleado@test.com", "pass")
+        self.other = User.objects.create_user("otro", "otro@test.com", "pass")
+
+        self.client.force_authenticate(self.admin)
+
+    def create_tasks(self, count):
+        for i in range(count):
+            task = Task.objects.create(
+                title=f"Tarea {i}",
+                description="Descripción",
+                start_date=date.today(),
+                due_date=date.today(),
+                created_by=self.admin,
+                assigned_to=self.employee,
+                delegated_to=self.admin,
+            )
+            TaskDelegation.objects.create(task=task, from_user=self.other, to_user=self.admin)
+            TaskDelegation.objects.create(task=task, from_user=self.employee, to_user=self.admin)
+
+    def count_list_queries(self, selects_only=False):
+        with CaptureQueriesContext(connection) as ctx:
+            response = self.client.get("/api/tasks/")
+        self.assertEqual(response.status_code, 200)
+
+        queries = ctx.captured_queries
+        if selects_only:
+            # Con ATOMIC_REQUESTS todo request abre y libera un savepoint
+            queries = [q for q in queries if q["sql"].lstrip().upper().startswith("SELECT")]
+        return len(queries), response.json()
+
+    def test_list_query_count_is_constant(self):
+        self.create_tasks(2)
+        few_queries, _ = self.count_list_queries()
+
+        self.create_tasks(20)
+        many_queries, data = self.count_list_queries()
+
+        self.assertEqual(len(data), 22)
+        self.assertEqual(few_queries, many_queries)
+
+    def test_delegated_by_uses_latest_delegation(self):
+        self.create_tasks(1)
+        _, data = self.count_list_queries()
+
+        self.assertEqual(data[0]["delegated_by"]["username"], "empleado")
+        self.assertEqual(data[0]["assigned_to"]["role"], "empleado")
+
+    def test_list_is_cached_until_a_visible_task_changes(self):
+        self.create_tasks(2)
+        self.count_list_queries()
+
+        queries, data = self.count_list_queries(selects_only=True)
+        self.assertEqual(queries, 0)
+        self.assertEqual(list_cache_stats()["hits"], 1)
+
+        # Un cambio hecho por otro usuario también invalida al admin
+        task = Task.objects.get(id=data[0]["id"])
+        task.status = "completada"
+        task.save(update_fields=["status"])
+
+        queries, data = self.count_list_queries()
+        self.assertGreater(queries, 0)
+        self.assertEqual(data[0]["status"], "completada")
+
+        # Reasignar saca la tarea del listado del empleado que la tenía
+        self.client.force_authenticate(self.employee)
+        self.assertEqual(len(self.count_list_queries()[1]), 2)
+
+        task.assigned_to = self.other
+        task.save()
+        self.assertEqual(len(self.count_list_queries()[1]), 1)
+
+    def get_list(self, **headers):
+        return self.client.get("/api/tasks/", **headers)
+
+    def test_etag_changes_when_a_task_is_deleted(self):
+        self.create_tasks(2)
+        etag = self.get_list()["ETag"]
+
+        Task.objects.filter(id=Task.objects.first().id).delete()
+
+        response = self.get_list(HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 1)
+
+    def test_etag_changes_when_a_task_is_reassigned_away(self):
+        self.create_tasks(2)
+        self.client.force_authenticate(self.employee)
+        first = self.get_list()
+        self.assertEqual(len(first.json()), 2)
+
+        task = Task.objects.first()
+        task.assigned_to = self.other
+        task.save()
+
+        response = self.get_list(HTTP_IF_NONE_MATCH=first["ETag"])
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.json()), 1)
+
+        # Solo hay ETag: sin Last-Modified, un If-Modified-Since no da 304
+        self.assertNotIn("Last-Modified", first)
+        response = self.get_list(HTTP_IF_MODIFIED_SINCE=http_date(time.time()))
+        self.assertEqual(response.status_code, 200)
+
+    def test_conditional_list_requires_a_validator(self):
+        with self.assertRaises(ImproperlyConfigured):
+            type("SinValidador", (ConditionalListMixin, viewsets.ReadOnlyModelViewSet), {})
+
+
+# =========================
+# SINGLE FLIGHT
+# =========================
+@override_settings(SINGLE_FLIGHT={
+    "LOCK_TIMEOUT": 30, "WAIT_TIMEOUT": 0.2, "POLL_INTERVAL": 0.01, "RESULT_TTL": 10,
+})
+class SingleFlightTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.calls = 0
+
+    def compute(self):
+        self.calls += 1
+        return "propio"
+
+    def test_holder_computes_and_releases_lock(self):
+        self.assertEqual(single_flight("k", self.compute), "propio")
+        self.assertEqual(self.calls, 1)
+        self.assertIsNone(cache.get(lock_key("k")))
+
+    def test_waiter_reuses_holder_result(self):
+        cache.add(lock_key("k"), "otro-worker")
+        cache.set(result_key("k", "otro-worker"), "compartido")
+
+        self.assertEqual(single_flight("k", self.compute), "compartido")
+        self.assertEqual(self.calls, 0)
+
+    def test_falls_back_when_holder_never_answers(self):
+        # Lock tomado por un worker que no termina: se calcula directo
+        cache.add(lock_key("k"), "colgado")
+        self.assertEqual(single_flight("k", self.compute), "propio")
+        self.assertEqual(self.calls, 1)
+
+    @override_settings(TASK_LIST_CACHE={"TIMEOUT": 0})
+    def test_not_modified_after_a_list_cache_miss(self):
+        # Sin cache de listados cada poll llega a ConditionalListMixin,
+        # que responde 304 con un HttpResponse sin `data`
+        user = User.objects.create_user("admin", "admin@test.com", "pass")
+        self.client.force_authenticate(user)
+
+        etag = self.client.get("/api/tasks/")["ETag"]
+        response = self.client.get("/api/tasks/", HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], etag)
+
+    def test_waiter_rebuilds_a_shared_not_modified(self):
+        # Otro worker ya resolvió el mismo request con un 304
+        user = User.objects.create_user("admin", "admin@test.com", "pass")
+        self.client.force_authenticate(user)
+
+        with patch("tareas.single_flight.single_flight", return_value=(304, None, {"ETag": '"x"'})):
+            response = self.client.get("/api/tasks/", HTTP_IF_NONE_MATCH='"x"')
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response["ETag"], '"x"')
+
+
+# =========================
+# RECORDATORIOS
+# =========================
+@override_settings(
+    REALTIME=IN_MEMORY_REALTIME,
+    TASK_REMINDER_POLICIES={"alta": [-3, 0, 1], "media": [0, 1], "baja": [1]},
+)
+class TaskReminderTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user("admin", "admin@test.com", "pass")
+        self.client.force_authenticate(self.user)
+
+    def create_task(self, due_in_days, priority="alta"):
+        response = self.client.post("/api/tasks/", {
+            "title": "Tarea",
+            "description": "Descripción",
+            "priority": priority,
+            "start_date": date.today(),
+            "due_date": date.today() + timedelta(days=due_in_days),
+        })
+        self.assertEqual(response.status_code, 201)
+        return Task.objects.get(id=response.json()["id"])
+
+    def offsets(self, task):
+        return sorted(task.reminders.values_list("offset_days", flat=True))
+
+    def test_create_schedules_stages_by_priority(self):
+        self.assertEqual(self.offsets(self.create_task(10)), [-3, 0, 1])
+        self.assertEqual(self.offsets(self.create_task(10, priority="baja")), [1])
+
+    def test_overdue_task_fires_once(self):
+        task = self.create_task(-2)
+        self.assertEqual(self.offsets(task), [1])
+
+        fire_due_reminders()
+        fire_due_reminders()
+
+        self.assertFalse(TaskReminder.objects.exists())
+        self.assertEqual(
+            Notification.objects.filter(task=task, type="vencimiento").count(), 1
+        )
+
+    def test_due_date_change_rearms_reminders(self):
+        task = self.create_task(-2)
+        fire_due_reminders()
+
+        response = self.client.patch(f"/api/tasks/{task.id}/", {
+            "due_date": date.today() + timedelta(days=10)
+        })
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.offsets(task), [-3, 0, 1])
+
+    def test_completed_task_drops_reminders(self):
+        task = self.create_task(10)
+        self.client.patch(f"/api/tasks/{task.id}/status/", {"status": "completada"})
+        self.assertEqual(self.offsets(task), [])
+
+
+# =========================
+# EVENTOS DE DOMINIO
+# =========================
+@override_settings(REALTIME=IN_MEMORY_REALTIME)
+class DomainEventTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user("admin", "admin@test.com", "pass")
+        self.employee = User.objects.create_user("empleado", "empleado@test.com", "pass")
+        self.client.force_authenticate(self.user)
+
+    def test_task_creation_notifies_once(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post("/api/tasks/", {
+                "title": "Tarea",
+                "description": "Descripción",
+                "start_date": date.today(),
+                "due_date": date.today(),
+                "assigned_to_id": self.employee.id,
+            })
+        self.assertEqual(response.status_code, 201)
+
+        types = sorted(Notification.objects.values_list("user__username", "type"))
+        self.assertEqual(types, [("admin", "creada"), ("empleado", "nueva")])
+
+    def test_self_assigned_task_notifies_its_creator(self):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post("/api/tasks/", {
+                "title": "Tarea",
+                "description": "Descripción",
+                "start_date": date.today(),
+                "due_date": date.today(),
+            })
+        self.assertEqual(response.status_code, 201)
+
+        types = sorted(Notification.objects.values_list("user__username", "type"))
+        self.assertEqual(types, [("admin", "creada"), ("admin", "nueva")])
+        self.assertEqual(EmailOutbox.objects.get().recipient_email, "admin@test.com")
+
+    def test_status_change_skips_the_actor(self):
+        task = Task.objects.create(
+            title="Tarea",
+            description="Descripción",
+            start_date=date.today(),
+            due_date=date.today(),
+            created_by=self.user,
+            assigned_to=self.user,
+            delegated_to=self.employee,
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(f"/api/tasks/{task.id}/", {"status": "en_progreso"})
+        self.assertEqual(response.status_code, 200)
+
+        self.assertEqual(
+            list(Notification.objects.values_list("user__username", "type")),
+            [("empleado", "estado")]
+        )
+
+    def test_request_writes_its_notices_once(self):
+        task = Task.objects.create(
+            title="Tarea",
+            description="Descripción",
+            start_date=date.today(),
+            due_date=date.today(),
+            created_by=self.user,
+            assigned_to=self.user,
+        )
+
+        # Delegación, cambio de estado y edición: un INSERT por tabla
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as queries:
+                response = self.client.patch(f"/api/tasks/{task.id}/", {
+                    "title": "Renombrada",
+                    "status": "en_progreso",
+                    "delegated_to_id": self.employee.id,
+                })
+        self.assertEqual(response.status_code, 200)
+
+        inserts = [q["sql"] for q in queries if q["sql"].startswith("INSERT")]
+        self.assertEqual(sum('"tareas_notification"' in sql for sql in inserts), 1)
+        self.assertEqual(sum('"tareas_emailoutbox"' in sql for sql in inserts), 1)
+        self.assertEqual(
+            sorted(Notification.objects.values_list("user__username", "type")),
+            [("admin", "delegacion"), ("empleado", "delegacion"), ("empleado", "estado")]
+        )
+
+    def test_events_are_coalesced_per_user_task_and_type(self):
+        task = Task.objects.create(
+            title="Tarea",
+            description="Descripción",
+            start_date=date.today(),
+            due_date=date.today(),
+            created_by=self.user,
+            assigned_to=self.employee,
+        )
+
+        with self.captureOnCommitCallbacks(execute=True):
+            with collect_events():
+                emit(StatusChanged(task, self.user, "pendiente", "en_progreso"))
+                emit(StatusChanged(task, self.user, "en_progreso", "completada"))
+
+        notification = Notification.objects.get()
+        self.assertEqual(notification.user, self.employee)
+        self.assertEqual(notification.params, {"old": "en_progreso", "new": "completada"})
+        self.assertEqual(
+            render_notification(notification),
+            "La tarea 'Tarea' cambió de estado: En progreso → Completada"
+        )
+
+
+    def test_notices_are_written_in_the_callers_transaction(self):
+        task = Task.objects.create(
+            title="Tarea",
+            description="Descripción",
+            start_date=date.today(),
+            due_date=date.today(),
+            created_by=self.user,
+            assigned_to=self.employee,
+        )
+
+        with self.captureOnCommitCallbacks(execute=True) as callbacks:
+            with transaction.atomic():
+                emit(TaskCreated(task, self.user))
+                # Antes del commit la notificación y el email ya están escritos
+                self.assertEqual(Notification.objects.filter(user=self.employee).count(), 1)
+                self.assertEqual(EmailOutbox.objects.filter(task=task).count(), 1)
+
+                # Lo emitido en un savepoint que vuelve atrás se descarta
+                try:
+                    with transaction.atomic():
+                        emit(StatusChanged(task, self.user, "pendiente", "completada"))
+                        raise RuntimeError
+                except RuntimeError:
+                    pass
+
+                emit(StatusChanged(task, self.user, "pendiente", "en_progreso"))
+
+        self.assertEqual(
+            sorted(Notification.objects.values_list("type", "params")),
+            [("creada", {}), ("estado", {"old": "pendiente", "new": "en_progreso"}), ("nueva", {})]
+        )
+        self.assertEqual(EmailOutbox.objects.filter(task=task).count(), 1)
+        self.assertTrue(callbacks)
+
+    def test_notification_text_is_rendered_at_read_time(self):
+        task = Task.objects.create(
+            title="Tarea",
+            description="Descripción",
+            start_date=date.today(),
+            due_date=date.today(),
+            created_by=self.user,
+            assigned_to=self.user,
+        )
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.patch(f"/api/tasks/{task.id}/", {"delegated_to_id": self.employee.id})
+        self.assertEqual(response.status_code, 200)
+
+        Task.objects.filter(id=task.id).update(title="Renombrada")
+        messages = [n["message"] for n in self.client.get("/api/notifications/").json()]
+        self.assertEqual(messages, ["Delegaste la tarea 'Renombrada' a empleado"])
+
+
+# =========================
+# OUTBOX DE EMAILS
+# =========================
+class EmailOutboxTests(APITestCase):
+
+    def setUp(self):
+        self.email = EmailOutbox.objects.create(
+            recipient_email="empleado@test.com",
+            subject="Asunto",
+            message="Mensaje",
+        )
+
+    @patch("tareas.tasks.send_task_email")
+    def test_claimed_email_is_not_sent_twice(self, send):
+        # Otro worker ya lo reclamó: este no lo envía
+        self.assertIsNotNone(claim_email(self.email.id))
+        deliver_email(self.email.id)
+        send.assert_not_called()
+
+        EmailOutbox.objects.filter(id=self.email.id).update(status="pendiente")
+        deliver_email(self.email.id)
+        deliver_email(self.email.id)
+        send.assert_called_once()
+
+        self.email.refresh_from_db()
+        self.assertEqual(self.email.status, "enviado")
+        self.assertIsNone(self.email.next_attempt_at)
+
+    @patch("tareas.tasks.deliver_email.delay")
+    def test_expired_claim_is_requeued(self, delay):
+        past = timezone.now() - timedelta(seconds=settings.EMAIL_OUTBOX["STALE_AFTER"] + 1)
+        EmailOutbox.objects.filter(id=self.email.id).update(
+            status="enviando", next_attempt_at=timezone.now() + timedelta(minutes=5), created_at=past
+        )
+        dispatch_pending_emails()
+        delay.assert_not_called()
+
+        EmailOutbox.objects.filter(id=self.email.id).update(next_attempt_at=timezone.now())
+        dispatch_pending_emails()
+        delay.assert_called_once_with(self.email.id)
+
+        self.email.refresh_from_db()
+        self.assertEqual(self.email.status, "pendiente")
+
+
+# =========================
+# OPERACIONES MASIVAS
+# =========================
+@override_settings(REALTIME=IN_MEMORY_REALTIME)
+class TaskBulkActionTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+
+        self.admin = User.objects.create_user("admin", "admin@test.com", "pass", is_staff=True)
+        self.admin.userprofile.role = "admin"
+        self.admin.userprofile.save()
+
+        self.employee = User.objects.create_user("empleado", "empleado@test.com", "pass")
+        self.other = User.objects.create_user("otro", "otro@test.com", "pass")
+        self.client.force_authenticate(self.admin)
+
+    def create_tasks(self, count):
+        return [
+            Task.objects.create(
+                title=f"Tarea {i}",
+                description="Descripción",
+                start_date=date.today(),
+                due_date=date.today() + timedelta(days=5),
+                created_by=self.admin,
+                assigned_to=self.employee,
+            )
+            for i in range(count)
+        ]
+
+    def bulk(self, payload):
+        with self.captureOnCommitCallbacks(execute=True):
+            with CaptureQueriesContext(connection) as ctx:
+                response = self.client.post("/api/tasks/bulk/", payload, format="json")
+        self.assertEqual(response.status_code, 200, response.data)
+        return len(ctx.captured_queries), response.data
+
+    def test_status_change_query_count_does_not_grow(self):
+        few = [t.id for t in self.create_tasks(2)]
+        many = [t.id for t in self.create_tasks(20)]
+
+        few_queries, _ = self.bulk({"action": "status", "ids": few, "status": "completada"})
+        many_queries, data = self.bulk({"action": "status", "ids": many + [999999], "status": "completada"})
+
+        self.assertEqual(few_queries, many_queries)
+        self.assertEqual(data["summary"], {"updated": 20, "not_found": 1})
+        self.assertEqual(Task.objects.filter(status="completada").count(), 22)
+        self.assertEqual(Notification.objects.filter(user=self.employee, type="estado").count(), 22)
+        self.assertFalse(TaskReminder.objects.filter(task_id__in=many).exists())
+
+    def test_reassign_by_filter_updates_visibility_and_history(self):
+        tasks = self.create_tasks(3)
+
+        _, data = self.bulk({
+            "action": "reassign",
+            "filter": {"assigned_to": self.employee.id},
+            "user": self.other.id,
+        })
+        self.assertEqual(data["summary"], {"updated": 3})
+
+        self.assertEqual(Task.objects.filter(assigned_to=self.other).count(), 3)
+        self.assertEqual(TaskDelegation.objects.filter(to_user=self.other).count(), 3)
+
+        self.client.force_authenticate(self.employee)
+        self.assertEqual(self.client.get("/api/tasks/").json(), [])
+        self.client.force_authenticate(self.other)
+        self.assertEqual(len(self.client.get("/api/tasks/").json()), len(tasks))
+
+    def test_create_reports_invalid_items(self):
+        task = {
+            "title": "Nueva",
+            "description": "Descripción",
+            "start_date": str(date.today()),
+            "due_date": str(date.today()),
+            "assigned_to_id": self.employee.id,
+        }
+        _, data = self.bulk({"action": "create", "tasks": [task, {"title": "Incompleta"}, task]})
+
+        self.assertEqual([item["result"] for item in data["results"]], ["created", "error", "created"])
+        self.assertEqual(Task.objects.filter(assigned_to=self.employee).count(), 2)
+        self.assertEqual(Notification.objects.filter(user=self.employee, type="nueva").count(), 2)
+
+
+# =========================
+# EXPORTACIÓN
+# =========================
+@override_settings(REALTIME=IN_MEMORY_REALTIME, TASK_EXPORT={"CHUNK_SIZE": 2})
+class TaskExportTests(APITestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create_user("admin", "admin@test.com", "pass")
+        self.employee = User.objects.create_user("empleado", "empleado@test.com", "pass")
+
+        for i in range(5):
+            Task.objects.create(
+                title=f"=Tarea {i}",
+                description="Descripción",
+                start_date=date.today(),
+                due_date=date.today(),
+                created_by=self.admin,
+                assigned_to=self.employee if i < 3 else self.admin,
+            )
+
+    def export(self, user, output):
+        # Como en producción (ASGI): el contenido es un iterador async
+        token = AccessToken.for_user(user)
+
+        async def read_export():
+            response = await self.async_client.get(
+                f"/api/tasks/export/?output={output}",
+                headers={"Authorization": f"Bearer {token}"}
+            )
+            self.assertEqual(response.status_code, 200)
+            self.assertTrue(response.is_async)
+            self.assertTrue(hasattr(response.streaming_content, "__aiter__"))
+            return [chunk async for chunk in response.streaming_content]
+
+        return b"".join(async_to_sync(read_export)()).decode()
+
+    def test_csv_streams_flat_rows_in_chunks(self):
+        lines = self.export(self.employee, "csv").splitlines()
+
+        self.assertEqual(lines[0].split(",")[:3], ["id", "title", "description"])
+        self.assertEqual(len(lines), 4)
+        self.assertIn("'=Tarea 0,Descripción,pendiente,media", lines[1])
+        self.assertIn("admin,empleado,,", lines[1])
+
+    def test_ndjson_follows_visibility(self):
+        rows = [json.loads(line) for line in self.export(self.admin, "ndjson").splitlines()]
+
+        self.assertEqual([row["title"] for row in rows], ["=Tarea 3", "=Tarea 4"])
+        self.assertEqual(rows[0]["assigned_to"], "admin")
+        self.assertIsNone(rows[0]["delegated_to"])
+
+
+# =========================
+# IMPORTACIÓN CSV
+# =========================
+@override_settings(
+    REALTIME=IN_MEMORY_REALTIME,
+    MEDIA_ROOT=tempfile.mkdtemp(),
+    TASK_IMPORT={"BATCH_SIZE": 2, "MAX_ERRORS": 10, "STALE_AFTER": 60},
+)
+class TaskImportTests(APITestCase):
+
+    def setUp(self):
+        self.admin = User.objects.create_user("admin", "admin@test.com", "pass")
+        self.employee = User.objects.create_user("empleado", "Empleado@test.com", "pass")
+        self.client.force_authenticate(self.admin)
+
+    def test_import_creates_tasks_and_one_summary_per_assignee(self):
+        content = (
+            "title,description,priority,due_date,assignee\n"
+            "Uno,,alta,2030-01-01,empleado\n"
+            "Dos,,,2030-01-02,empleado@test.com\n"
+            "Tres,,urgente,2030-01-03,empleado\n"
+            "Cuatro,,,2030-01-04,\n"
+            "Cinco,,,2030-01-05,nadie\n"
+        )
+        upload = SimpleUploadedFile("tareas.csv", content.encode(), content_type="text/csv")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post("/api/task-imports/", {"file": upload}, format="multipart")
+        self.assertEqual(response.status_code, 202)
+
+        job = self.client.get(f"/api/task-imports/{response.data['id']}/").json()
+        self.assertEqual(job["status"], "completado")
+        self.assertEqual((job["total_rows"], job["created_count"], job["error_count"]), (5, 3, 2))
+        self.assertEqual([error["row"] for error in job["errors"]], [4, 6])
+        self.assertEqual(job["progress"], 100)
+
+        self.assertEqual(Task.objects.filter(assigned_to=self.employee).count(), 2)
+        self.assertEqual(Task.objects.filter(assigned_to=self.admin).count(), 1)
+
+        notification = Notification.objects.get()
+        self.assertEqual(notification.user, self.employee)
+        self.assertEqual(render_notification(notification), "admin te asignó 2 tareas nuevas por importación")
+
+    def test_missing_columns_fail_the_job(self):
+        upload = SimpleUploadedFile("tareas.csv", b"titulo\nUno\n", content_type="text/csv")
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post("/api/task-imports/", {"file": upload}, format="multipart")
+
+        job = self.client.get(f"/api/task-imports/{response.data['id']}/").json()
+        self.assertEqual(job["status"], "fallido")
+        self.assertIn("due_date", job["last_error"])
+
+    def test_assignees_match_regardless_of_case(self):
+        # El email guardado tiene mayúsculas y el del CSV no (y al revés el username)
+        users = resolve_users({"empleado@test.com", "ADMIN"})
+        self.assertEqual(users, {
+            "empleado@test.com": self.employee,
+            "empleado": self.employee,
+            "admin": self.admin,
+            "admin@test.com": self.admin,
+        })
+
+    def test_stale_processing_jobs_are_failed(self):
+        job = TaskImportJob.objects.create(
+            file=SimpleUploadedFile("tareas.csv", b"title,due_date\n"),
+            created_by=self.admin,
+            status="procesando",
+        )
+        later = timezone.now() + timedelta(seconds=settings.TASK_IMPORT["STALE_AFTER"] + 1)
+
+        self.assertEqual(fail_stale_imports(now=timezone.now()), 0)
+        self.assertEqual(fail_stale_imports(now=later), 1)
+
+        job.refresh_from_db()
+        self.assertEqual(job.status, "fallido")
+        self.assertTrue(job.last_error)
+
+
+# =========================
+# BÚSQUEDA
+# =========================
+@override_settings(REALTIME=IN_MEMORY_REALTIME)
+class TaskSearchTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+
+        self.admin = User.objects.create_user("admin", "admin@test.com", "pass")
+        self.employee = User.objects.create_user("empleado", "empleado@test.com", "pass")
+        self.other = User.objects.create_user("otro", "otro@test.com", "pass")
+
+        self.budget = self.create_task("Presupuesto anual", "Revisión del presupuesto", self.employee)
+        self.report = self.create_task("Informe", "Incluye el presupuesto", self.employee)
+        self.hidden = self.create_task("Presupuesto ajeno", "No es mío", self.other)
+
+        Comment.objects.create(task=self.report, user=self.admin, message="Falta la revision final")
+        Comment.objects.create(task=self.hidden, user=self.admin, message="Revision pendiente")
+
+        self.client.force_authenticate(self.employee)
+
+    def create_task(self, title, description, assigned_to):
+        return Task.objects.create(
+            title=title,
+            description=description,
+            start_date=date.today(),
+            due_date=date.today(),
+            created_by=self.admin,
+            assigned_to=assigned_to,
+        )
+
+    def search(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        return [item["id"] for item in response.json()["results"]]
+
+    def test_ranked_and_limited_to_visible_tasks(self):
+        self.assertEqual(
+            self.search("/api/tasks/?search=presupuesto"),
+            [self.budget.id, self.report.id]
+        )
+
+    def test_boolean_mode_and_accents(self):
+        self.assertEqual(
+            self.search("/api/tasks/?search=%2Bpresup*%20-revisión&search_mode=boolean"),
+            [self.report.id]
+        )
+
+    def test_boolean_query_drops_invalid_syntax(self):
+        self.assertEqual(boolean_query('"foo +- +presup* -revisión (x'), "foo +presup* -revision")
+        self.assertEqual(boolean_query('+- "'), "")
+        self.assertEqual(self.search("/api/tasks/?search=%22%2B-&search_mode=boolean"), [])
+
+    def test_comment_search_respects_visibility(self):
+        results = self.client.get("/api/comments/?search=revisión").json()["results"]
+        self.assertEqual([item["task"] for item in results], [self.report.id])
+
+
+# =========================
+# ESTADÍSTICAS (DASHBOARD)
+# =========================
+class TaskStatsTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+
+        self.admin = User.objects.create_user("admin", "admin@test.com", "pass")
+        self.employee = User.objects.create_user("empleado", "empleado@test.com", "pass")
+        self.other = User.objects.create_user("otro", "otro@test.com", "pass")
+        today = date.today()
+
+        self.create_task("pendiente", "alta", today - timedelta(days=3), self.employee)
+        self.create_task("completada", "alta", today - timedelta(days=1), self.employee)
+        self.create_task("en_progreso", "media", today + timedelta(days=2), self.employee)
+        self.create_task("pendiente", "baja", today + timedelta(days=30), self.employee)
+        # No la ve el empleado
+        self.create_task("pendiente", "alta", today - timedelta(days=3), self.other)
+
+        self.client.force_authenticate(self.employee)
+
+    def create_task(self, status, priority, due_date, assigned_to):
+        return Task.objects.create(
+            title="Tarea",
+            description="",
+            status=status,
+            priority=priority,
+            start_date=date.today() - timedelta(days=10),
+            due_date=due_date,
+            created_by=self.admin,
+            assigned_to=assigned_to,
+        )
+
+    def test_counts_only_visible_tasks(self):
+        response = self.client.get("/api/tasks/stats/")
+        self.assertEqual(response.status_code, 200)
+        data = response.json()
+
+        self.assertEqual(data["total"], 4)
+        self.assertEqual(data["by_status"], {"pendiente": 2, "en_progreso": 1, "completada": 1})
+        self.assertEqual(data["by_priority"], {"baja": 1, "media": 1, "alta": 2})
+        self.assertEqual(data["active"], 2)
+        self.assertEqual(data["overdue"], 1)
+        self.assertEqual(data["due_next_7_days"], 1)
+        self.assertEqual(sum(month["alta"] for month in data["by_month"]), 2)
+        self.assertEqual(
+            [(row["username"], row["total"]) for row in data["by_assignee"]],
+            [("empleado", 4)]
+        )
+
+    def test_cached_stats_follow_task_changes(self):
+        self.assertEqual(self.client.get("/api/tasks/stats/").json()["total"], 4)
+
+        self.create_task("pendiente", "media", date.today(), self.employee)
+        self.assertEqual(self.client.get("/api/tasks/stats/").json()["total"], 5)
+
+
+# =========================
+# FILTROS Y ORDEN DEL LISTADO
+# =========================
+class TaskListFilterTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+
+        self.admin = User.objects.create_user("admin", "admin@test.com", "pass")
+        self.employee = User.objects.create_user("empleado", "empleado@test.com", "pass")
+        today = date.today()
+
+        self.late = self.create_task("Vencida", "pendiente", "alta", today - timedelta(days=2))
+        self.done = self.create_task("Cerrada", "completada", "alta", today - timedelta(days=1))
+        self.soon = self.create_task("Pronto", "en_progreso", "media", today + timedelta(days=3))
+        self.later = self.create_task("Después", "pendiente", "baja", today + timedelta(days=20))
+
+        self.client.force_authenticate(self.employee)
+
+    def create_task(self, title, status, priority, due_date):
+        return Task.objects.create(
+            title=title,
+            description="",
+            status=status,
+            priority=priority,
+            start_date=date.today() - timedelta(days=5),
+            due_date=due_date,
+            created_by=self.admin,
+            assigned_to=self.employee,
+        )
+
+    def ids(self, url):
+        response = self.client.get(url)
+        self.assertEqual(response.status_code, 200)
+        # Sin cursor ni page_size el listado viene completo, sin envoltorio
+        return [item["id"] for item in response.json()]
+
+    def test_filters_combine_in_the_query(self):
+        today = date.today()
+        self.assertEqual(
+            self.ids(f"/api/tasks/?status=pendiente,en_progreso&due_from={today}"
+                     f"&due_to={today + timedelta(days=7)}&ordering=due_date"),
+            [self.soon.id]
+        )
+        self.assertEqual(
+            self.ids("/api/tasks/?priority=alta&priority=media&ordering=-due_date"),
+            [self.soon.id, self.done.id, self.late.id]
+        )
+        self.assertEqual(self.ids("/api/tasks/?overdue=true"), [self.late.id])
+        self.assertEqual(
+            self.ids(f"/api/tasks/?created_by={self.admin.id}&overdue=false&ordering=due_date"),
+            [self.done.id, self.soon.id, self.later.id]
+        )
+
+    def test_invalid_parameters_are_rejected(self):
+        for query in ("status=abierta", "due_from=ayer", "ordering=title", "ordering=--due_date",
+                      f"due_from={date.today()}&due_to={date.today() - timedelta(days=1)}"):
+            self.assertEqual(self.client.get(f"/api/tasks/?{query}").status_code, 400, query)
+
+    def test_cursor_follows_ordering(self):
+        first = self.client.get("/api/tasks/?ordering=due_date&page_size=2").json()
+        self.assertEqual([item["id"] for item in first["results"]], [self.late.id, self.done.id])
+
+        second = self.client.get(
+            f"/api/tasks/?ordering=due_date&page_size=2&cursor={first['next_cursor']}"
+        ).json()
+        self.assertEqual([item["id"] for item in second["results"]], [self.soon.id, self.later.id])
+        self.assertIsNone(second["next_cursor"])
+
+        # Un cursor de otro orden no se reutiliza
+        response = self.client.get(f"/api/tasks/?page_size=2&cursor={first['next_cursor']}")
+        self.assertEqual(response.status_code, 404)
+
+
+# =========================
+# EVENTOS EN TIEMPO REAL
+# =========================
+@override_settings(REALTIME=IN_MEMORY_REALTIME)
+class RealtimeEventTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user("admin", "admin@test.com", "pass")
+        self.employee = User.objects.create_user("empleado", "empleado@test.com", "pass")
+        self.client.force_authenticate(self.user)
+
+    def test_task_creation_publishes_events(self):
+        layer = get_channel_layer()
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post("/api/tasks/", {
+                "title": "Tarea",
+                "description": "Descripción",
+                "start_date": date.today(),
+                "due_date": date.today(),
+                "assigned_to_id": self.employee.id,
+            })
+        self.assertEqual(response.status_code, 201)
+
+        events = {(channel, message["event"]) for channel, message in layer.sent}
+        self.assertIn((user_channel(self.user.id), "task"), events)
+        self.assertIn((user_channel(self.employee.id), "task"), events)
+        self.assertIn((user_channel(self.employee.id), "notification"), events)
+
+    def test_task_delete_reaches_delegation_history(self):
+        third = User.objects.create_user("tercero", "tercero@test.com", "pass")
+        task = Task.objects.create(
+            title="Tarea",
+            description="",
+            start_date=date.today(),
+            due_date=date.today(),
+            created_by=self.user,
+            assigned_to=self.employee,
+        )
+        # Solo la ve por el historial de delegaciones (TaskVisibility)
+        TaskDelegation.objects.create(task=task, from_user=third, to_user=self.employee)
+        task_id = task.id
+
+        with self.captureOnCommitCallbacks(execute=True):
+            task.delete()
+
+        deleted = {
+            channel for channel, message in get_channel_layer().sent
+            if message["event"] == "task" and message["data"] == {"id": task_id, "action": "deleted"}
+        }
+        self.assertEqual(
+            deleted,
+            {user_channel(user.id) for user in (self.user, self.employee, third)}
+        )
+
+    def test_stream_delivers_published_events(self):
+        async def read_one_event():
+            stream = sse_messages(self.user.id)
+            self.assertEqual(await anext(stream), "retry: 5000\n\n")
+
+            next_chunk = asyncio.ensure_future(anext(stream))
+            for _ in range(5):
+                await asyncio.sleep(0)
+
+            get_channel_layer().publish(
+                user_channel(self.user.id),
+                {"event": "task", "data": {"id": 1, "action": "updated"}}
+            )
+            chunk = await next_chunk
+            await stream.aclose()
+            return chunk
+
+        chunk = async_to_sync(read_one_event)()
+        self.assertEqual(chunk, 'event: task\ndata: {"id": 1, "action": "updated"}\n\n')
+
+    def test_stream_requires_token(self):
+        self.client.force_authenticate(None)
+        response = self.client.get("/api/events/")
+        self.assertEqual(response.status_code, 401)
+
+
+# =========================
+# CONTADOR DE NO LEÍDAS
+# =========================
+@override_settings(REALTIME=IN_MEMORY_REALTIME)
+class UnreadCounterTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        self.user = User.objects.create_user("admin", "admin@test.com", "pass")
+        self.client.force_authenticate(self.user)
+        self.task = Task.objects.create(
+            title="Tarea",
+            description="Descripción",
+            start_date=date.today(),
+            due_date=date.today(),
+            created_by=self.user,
+        )
+
+    def notify(self, count):
+        with self.captureOnCommitCallbacks(execute=True):
+            return [
+                Notification.objects.create(user=self.user, task=self.task, message="Aviso", type="nueva")
+                for _ in range(count)
+            ]
+
+    def unread(self):
+        return self.client.get("/api/notifications/unread_count/").json()["unread"]
+
+    def test_counter_follows_creates_and_reads(self):
+        self.assertEqual(self.unread(), 0)
+        notifications = self.notify(3)
+        self.assertEqual(self.unread(), 3)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            self.client.post(f"/api/notifications/{notifications[0].id}/mark-read/")
+            self.client.post(f"/api/notifications/{notifications[0].id}/mark-read/")
+        self.assertEqual(self.unread(), 2)
+
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post("/api/notifications/mark-all-read/")
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.unread(), 0)
+
+    def test_read_state_follows_watermark(self):
+        first, second = self.notify(2)
+        self.client.post("/api/notifications/mark-all-read/")
+        newer, = self.notify(1)
+        set_read_state(self.user.id, [first.id], is_read=False)
+
+        with CaptureQueriesContext(connection) as ctx:
+            mark_all_notifications_read(self.user.id)
+        self.assertFalse(any(
+            q["sql"].startswith('UPDATE "tareas_notification"') for q in ctx.captured_queries
+        ))
+
+        set_read_state(self.user.id, [first.id], is_read=False)
+        data = self.client.get("/api/notifications/").json()
+        states = {n["id"]: n["is_read"] for n in data}
+        self.assertEqual(states, {first.id: False, second.id: True, newer.id: True})
+
+    def bulk(self, payload):
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client.post("/api/notifications/bulk/", payload, format="json")
+        return response
+
+    def test_bulk_actions_by_ids_and_filter(self):
+        notifications = self.notify(4)
+        ids = [n.id for n in notifications[:3]]
+
+        response = self.bulk({"action": "read", "ids": ids})
+        self.assertEqual(response.json(), {"action": "read", "affected": 3})
+        self.assertEqual(self.unread(), 1)
+
+        response = self.bulk({"action": "unread", "ids": ids[:1]})
+        self.assertEqual(response.json()["affected"], 1)
+        self.assertEqual(self.unread(), 2)
+
+        response = self.bulk({"action": "delete", "task": self.task.id})
+        self.assertEqual(response.json()["affected"], 4)
+        self.assertEqual(self.unread(), 0)
+
+    def test_bulk_requires_a_criterion(self):
+        response = self.bulk({"action": "delete"})
+        self.assertEqual(response.status_code, 400)
+
+    def test_reconcile_fixes_drift(self):
+        self.notify(2)
+        cache.set(unread_key(self.user.id), 10)
+
+        reconcile_unread_counts()
+        self.assertEqual(self.unread(), 2)
+
+
+# =========================
+# RETENCIÓN DE NOTIFICACIONES
+# =========================
+@override_settings(
+    REALTIME=IN_MEMORY_REALTIME,
+    NOTIFICATION_RETENTION={
+        "READ_AFTER_DAYS": 30,
+        "UNREAD_AFTER_DAYS": None,
+        "CHUNK_SIZE": 2,
+        "MAX_CHUNKS_PER_RUN": 10,
+    },
+)
+class NotificationRetentionTests(APITestCase):
+
+    def setUp(self):
+        self.user = User.objects.create_user("admin", "admin@test.com", "pass")
+        self.client.force_authenticate(self.user)
+        self.task = Task.objects.create(
+            title="Tarea",
+            description="Descripción",
+            start_date=date.today(),
+            due_date=date.today(),
+            created_by=self.user,
+        )
+
+    def notify(self, days_ago):
+        notification = Notification.objects.create(
+            user=self.user, task=self.task, message="Aviso", type="nueva"
+        )
+        Notification.objects.filter(id=notification.id).update(
+            created_at=timezone.now() - timedelta(days=days_ago)
+        )
+        return notification
+
+    def test_only_old_read_notifications_are_archived(self):
+        old_read = [self.notify(40) for _ in range(3)]
+        old_unread = self.notify(40)
+        recent = self.notify(1)
+        set_read_state(self.user.id, [n.id for n in old_read] + [recent.id])
+
+        archive_old_notifications()
+
+        self.assertEqual(
+            set(Notification.objects.values_list("id", flat=True)), {old_unread.id, recent.id}
+        )
+        archived = self.client.get("/api/notifications/archived/").json()
+        self.assertEqual(sorted(n["id"] for n in archived), [n.id for n in old_read])
@@ -0,0 +1,82 @@
+# tareas/unread.py
+from collections import Counter
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db.models import Count
+
+from .models import Notification
+from .read_state import unread_filter, unread_notifications
+
+
+def unread_key(user_id):
+    return f"tareas:unread:{user_id}"
+
+
+def count_unread_in_db(user_id):
+    return unread_notifications(user_id).count()
+
+
+def get_unread_count(user_id):
+    """
+    Un GET al cache. Si la clave no existe (primer uso, reinicio de
+    Redis) se recalcula desde la base y queda guardada sin vencimiento.
+    """
+    count = cache.get(unread_key(user_id))
+    if count is None:
+        count = count_unread_in_db(user_id)
+        cache.add(unread_key(user_id), count, timeout=None)
+    return count
+
+
+def add_unread(notifications):
+    """
+    Suma las notificaciones nuevas (create o bulk_create) al contador
+    de cada destinatario.
+    """
+    per_user = Counter(n.user_id for n in notifications)
+
+    for user_id, amount in per_user.items():
+        try:
+            cache.incr(unread_key(user_id), amount)
+        except ValueError:
+            # Sin clave: se calcula completa en el próximo get_unread_count
+            pass
+
+
+def remove_unread(user_id, amount=1):
+    try:
+        if cache.decr(unread_key(user_id), amount) < 0:
+            cache.delete(unread_key(user_id))
+    except ValueError:
+        pass
+
+
+def reset_unread(user_id):
+    cache.set(unread_key(user_id), 0, timeout=None)
+
+
+def invalidate_unread(user_id):
+    cache.delete(unread_key(user_id))
+
+
+def reconcile_unread_counts(batch_size=1000):
+    """
+    Reescribe todos los contadores desde la base con un solo GROUP BY.
+    Corrige cualquier desvío por incrementos perdidos.
+    """
+    counts = dict(
+        Notification.objects.filter(unread_filter())
+        .order_by()
+        .values_list("user_id")
+        .annotate(total=Count("id"))
+    )
+
+    user_ids = list(User.objects.values_list("id", flat=True))
+    for start in range(0, len(user_ids), batch_size):
+        cache.set_many(
+            {unread_key(uid): counts.get(uid, 0) for uid in user_ids[start:start + batch_size]},
+            timeout=None
+        )
+
+    return len(user_ids)
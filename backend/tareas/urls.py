@@ -2,13 +2,13 @@ from django.urls import path, include
 from rest_framework.routers import DefaultRouter
 
 from django.urls import path
-from .views import update_task_status
+from .views import update_task_status, event_stream
 
 
 from .views import (
     TaskViewSet, CommentViewSet,
     AttachmentViewSet, NotificationViewSet,
-    NotificationActionsViewSet
+    NotificationActionsViewSet, TaskImportViewSet
 )
 
 router = DefaultRouter()
@@ -16,8 +16,22 @@ router.register(r'tasks', TaskViewSet, basename='task')
 router.register(r'comments', CommentViewSet, basename='comment')
 router.register(r'attachments', AttachmentViewSet, basename='attachment')
 router.register(r'notifications', NotificationViewSet, basename='notification')
+router.register(r'task-imports', TaskImportViewSet, basename='task-import')
 
 urlpatterns = [
+    # Antes del router: si no, "mark-all-read" se toma como pk del detalle
+    path(
+        'notifications/mark-all-read/',
+        NotificationActionsViewSet.as_view({'post': 'mark_all_read'}),
+        name='notification-mark-all-read'
+    ),
+
+    path(
+        'notifications/bulk/',
+        NotificationActionsViewSet.as_view({'post': 'bulk'}),
+        name='notification-bulk'
+    ),
+
     path('', include(router.urls)),
 
     # Endpoint custom para marcar notificación como leída
@@ -29,4 +43,7 @@ urlpatterns = [
     
     path("tasks/<int:task_id>/status/", update_task_status),
 
+    # Eventos en tiempo real (Server-Sent Events, requiere ASGI)
+    path("events/", event_stream, name="event-stream"),
+
 ]
@@ -2,16 +2,28 @@
 # IMPORTS DJANGO / DRF
 # =========================
 from django.shortcuts import get_object_or_404
-from django.db.models import Q
+from django.db.models import Q, Prefetch, OuterRef, Subquery, Count, Max
 from django.contrib.auth.models import User
 from django.contrib.auth import authenticate
-
-from rest_framework import viewsets, status, permissions, serializers
+from django.core.cache import cache
+from django.conf import settings
+from django.utils import timezone
+from django.db import transaction
+from django.http import JsonResponse, StreamingHttpResponse
+from django.core.serializers.json import DjangoJSONEncoder
+from asgiref.sync import sync_to_async
+
+import asyncio
+import json
+
+from rest_framework import viewsets, mixins, status, permissions, serializers
 from rest_framework.response import Response
 from rest_framework.permissions import IsAuthenticated, AllowAny
 from rest_framework.decorators import action, api_view, permission_classes
 from rest_framework.views import APIView
-from rest_framework_simplejwt.tokens import RefreshToken
+from users.authentication import VersionedJWTAuthentication
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework.exceptions import AuthenticationFailed
 
 # =========================
 # MODELS
@@ -21,10 +33,12 @@ from .models import (
     TaskDelegation,
     Comment,
     TaskAttachment,
-    Notification
+    Notification,
+    ArchivedNotification,
+    TaskImportJob
 )
 
-from users.models import UserProfile
+from users.tokens import ROLE_CLAIM, tokens_for_user
 
 # =========================
 # SERIALIZERS
@@ -34,8 +48,28 @@ from .serializers import (
     TaskDetailSerializer,
     CommentSerializer,
     TaskAttachmentSerializer,
-    NotificationSerializer
+    NotificationSerializer,
+    ArchivedNotificationSerializer,
+    NotificationBulkActionSerializer,
+    TaskBulkActionSerializer,
+    TaskImportJobSerializer
 )
+from .stats import build_task_stats
+from .pagination import KeysetPagination
+from .filters import TaskFilterBackend, get_ordering
+from .visibility import tasks_for
+from .reminders import reschedule_task_reminders
+from .conditional import ConditionalListMixin
+from .list_cache import CachedListMixin, get_visibility_version
+from .single_flight import CoalescedListMixin, coalesce_key, single_flight
+from .bulk import bulk_change_status, bulk_move, bulk_create_tasks
+from .tasks import import_tasks_csv
+from .export import EXPORT_FORMATS, export_rows, render_export
+from .search import SearchMixin, search_tasks, search_comments
+from .realtime import get_channel_layer, user_channel
+from .unread import get_unread_count, remove_unread, reset_unread, invalidate_unread
+from .events import emit, CollectEventsMixin, TaskDelegated, StatusChanged
+from .read_state import with_read_state, set_read_state, mark_all_read as mark_all_notifications_read
 
 # ============================================================
 # PERMISOS
@@ -66,9 +100,56 @@ class IsHRorOwner(permissions.BasePermission):
 
 from .emails import send_task_email
 
-class TaskViewSet(viewsets.ModelViewSet):
+
+def latest_delegations():
+    """
+    Solo la última delegación de cada tarea (la que muestra `delegated_by`).
+    """
+    latest = TaskDelegation.objects.filter(
+        task=OuterRef("task")
+    ).order_by("-delegated_at", "-id").values("id")[:1]
+
+    return TaskDelegation.objects.filter(
+        id=Subquery(latest)
+    ).select_related("from_user__userprofile")
+
+
+def task_list_validator(request, queryset):
+    """
+    Validador del ETag del listado de tareas (ConditionalListMixin).
+    """
+    # updated_at y el total no alcanzan (una baja y un alta, una tarea que
+    # deja de verse): va también la versión de visibilidad del usuario,
+    # que sube con cualquier cambio en sus tareas (list_cache.py).
+    # ?overdue= cambia con el día aunque no se toque ninguna tarea
+    summary = Task.objects.filter(
+        id__in=queryset.order_by().values("id")
+    ).aggregate(last=Max("updated_at"), total=Count("id"))
+    return (
+        summary["last"],
+        summary["total"],
+        get_visibility_version(request.user.pk),
+        timezone.localdate(),
+    )
+
+
+class TaskViewSet(
+    CollectEventsMixin,
+    CachedListMixin,
+    CoalescedListMixin,
+    ConditionalListMixin,
+    SearchMixin,
+    viewsets.ModelViewSet
+):
 
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    filter_backends = [TaskFilterBackend]
+    search_function = staticmethod(search_tasks)
+    list_validator = staticmethod(task_list_validator)
+
+    def get_keyset_ordering(self):
+        return get_ordering(self.request)
 
     def get_serializer_class(self):
         if self.action == "retrieve":
@@ -76,61 +157,47 @@ class TaskViewSet(viewsets.ModelViewSet):
         return TaskSerializer
 
     def get_queryset(self):
-        user = self.request.user
-
-        try:
-            role = user.userprofile.role
-        except UserProfile.DoesNotExist:
-            role = None
-
-        # =========================
-        # ADMIN
-        # =========================
-        if role == "admin":
-            return Task.objects.filter(
-                Q(created_by=user) |
-                Q(assigned_to=user) |
-                Q(delegated_to=user) |
-                Q(delegations__from_user=user) |
-                Q(delegations__to_user=user)
-            ).distinct().order_by("-created_at")
-
-        # =========================
-        # EMPLEADO
-        # =========================
-        return Task.objects.filter(
-            Q(assigned_to=user) |
-            Q(delegated_to=user)
-        ).order_by("-created_at")
+        # Admin: TaskVisibility; empleado: asignadas o delegadas (visibility.py)
+        return self.with_related(tasks_for(self.request.user)).order_by("-created_at")
+
+    def with_related(self, queryset):
+        """
+        Trae en la misma consulta (o en un prefetch fijo) todo lo que
+        usa el serializer, para no hacer consultas por fila.
+        """
+        queryset = queryset.select_related(
+            "created_by__userprofile",
+            "assigned_to__userprofile",
+            "delegated_to__userprofile",
+        ).prefetch_related(
+            Prefetch(
+                "delegations",
+                queryset=latest_delegations(),
+                to_attr="latest_delegations"
+            )
+        )
+
+        if self.action == "retrieve":
+            queryset = queryset.prefetch_related(
+                Prefetch(
+                    "attachments",
+                    queryset=TaskAttachment.objects.select_related(
+                        "uploaded_by__userprofile"
+                    )
+                )
+            )
+
+        return queryset
 
     # =========================
     # CREATE
     # =========================
     def perform_create(self, serializer):
-        assigned_admin = serializer.validated_data.get("assigned_to")
-
-        task = serializer.save(
+        # Las notificaciones las emite TaskSerializer.create (TaskCreated)
+        serializer.save(
             created_by=self.request.user
         )
 
-        if assigned_admin:
-            Notification.objects.create(
-                user=assigned_admin,
-                task=task,
-                type="nueva",
-                message=f"Nueva tarea asignada: {task.title}"
-            )
-        
-        # Notificar al creador (solo si es otro usuario)
-        if assigned_admin != self.request.user:
-            Notification.objects.create(
-                user=self.request.user,
-                task=task,
-                type="creada",
-                message=f"Creaste la tarea: {task.title}"
-            )
-
-        
 
         """    # Email
         assigned_admin = task.assigned_to
@@ -152,6 +219,53 @@ class TaskViewSet(viewsets.ModelViewSet):
                 recipient_email=assigned_admin.email
             )
 """
+    # =========================
+    # ESTADÍSTICAS (DASHBOARD)
+    # =========================
+    @action(detail=False, methods=["get"])
+    def stats(self, request):
+        # Con la versión de visibilidad: cualquier cambio en sus tareas la invalida
+        user_id = request.user.id
+        cache_key = f"tareas:stats:{user_id}:{get_visibility_version(user_id)}"
+        data = cache.get(cache_key)
+
+        if data is None:
+            # Un solo cálculo aunque varios clientes lleguen a la vez
+            data = single_flight(
+                coalesce_key(request),
+                lambda: build_task_stats(self.get_queryset(), timezone.localdate())
+            )
+            cache.set(cache_key, data, settings.TASK_STATS_CACHE_TIMEOUT)
+
+        return Response(data)
+
+    # =========================
+    # EXPORTAR (CSV / NDJSON)
+    # =========================
+    @action(detail=False, methods=["get"])
+    def export(self, request):
+        """
+        Todas las tareas visibles (con los mismos filtros del listado)
+        como CSV o NDJSON, en streaming: la memoria no crece con el total.
+        ?output=csv (por defecto) o ?output=ndjson
+        """
+        export_format = request.query_params.get("output", "csv")
+        if export_format not in EXPORT_FORMATS:
+            return Response(
+                {"detail": "Formato inválido (csv o ndjson)"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        rows = export_rows(self.filter_queryset(self.get_queryset()))
+
+        response = StreamingHttpResponse(
+            render_export(rows, export_format),
+            content_type=EXPORT_FORMATS[export_format]
+        )
+        filename = f"tareas-{timezone.localdate():%Y%m%d}.{export_format}"
+        response["Content-Disposition"] = f'attachment; filename="{filename}"'
+        return response
+
     # =========================
     # DELEGAR
     # =========================
@@ -184,47 +298,140 @@ class TaskViewSet(viewsets.ModelViewSet):
             task.assigned_to = new_user
             task.save()
 
+            emit(TaskDelegated(task=task, actor=request.user, to_user=new_user))
 
-            Notification.objects.create(
-                user=new_user,
-                task=task,
-                type="delegacion",
-                message=f"La tarea '{task.title}' fue delegada por {request.user.username}"
-            )
-
-            
 
         return Response(
             {"message": "Tarea delegada correctamente"},
             status=status.HTTP_200_OK
         )
 
+    # =========================
+    # OPERACIONES MASIVAS
+    # =========================
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        """
+        Cambio de estado, delegación, reasignación o alta de muchas tareas
+        en una transacción y pocas consultas. Devuelve un resultado por ítem.
+        """
+        serializer = TaskBulkActionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        data = serializer.validated_data
+        bulk_action = data["action"]
+
+        if bulk_action in ("delegate", "reassign") and not request.user.is_staff:
+            return Response(
+                {"detail": "No tiene permisos"},
+                status=status.HTTP_403_FORBIDDEN
+            )
+
+        if bulk_action == "create":
+            items, errors = serializer.validate_new_tasks()
+            with transaction.atomic():
+                created = bulk_create_tasks(items, request.user)
+
+            results = sorted(created + errors, key=lambda item: item["index"])
+            return self.bulk_response(bulk_action, results)
+
+        # Solo tareas que el usuario ve; sin los prefetch del listado
+        visible = self.get_queryset().order_by().values("id")
+        tasks = list(
+            serializer.filter_queryset(Task.objects.filter(id__in=visible))
+            .select_related("created_by", "assigned_to", "delegated_to")
+            .order_by("id")[:serializer.MAX_ITEMS + 1]
+        )
+
+        if len(tasks) > serializer.MAX_ITEMS:
+            return Response(
+                {"detail": f"El filtro abarca más de {serializer.MAX_ITEMS} tareas"},
+                status=status.HTTP_400_BAD_REQUEST
+            )
+
+        # Una transacción: los eventos se despachan juntos al hacer commit
+        with transaction.atomic():
+            if bulk_action == "status":
+                results = bulk_change_status(tasks, data["status"], request.user)
+            else:
+                to_user = get_object_or_404(User, id=data["user"])
+                field = "delegated_to" if bulk_action == "delegate" else "assigned_to"
+                results = bulk_move(tasks, field, to_user, request.user)
+
+        found = {task.id for task in tasks}
+        results += [
+            {"id": task_id, "result": "not_found"}
+            for task_id in data.get("ids", []) if task_id not in found
+        ]
+        return self.bulk_response(bulk_action, results)
+
+    def bulk_response(self, bulk_action, results):
+        summary = {}
+        for item in results:
+            summary[item["result"]] = summary.get(item["result"], 0) + 1
+
+        return Response({"action": bulk_action, "summary": summary, "results": results})
+
+
+# ============================================================
+# IMPORTACIÓN DE TAREAS (CSV)
+# ============================================================
+class TaskImportViewSet(
+    mixins.CreateModelMixin,
+    mixins.RetrieveModelMixin,
+    mixins.ListModelMixin,
+    viewsets.GenericViewSet
+):
+    """
+    POST sube el CSV y encola la importación; GET /<id>/ devuelve el
+    progreso y los errores por fila.
+    """
+
+    serializer_class = TaskImportJobSerializer
+    permission_classes = [IsAuthenticated]
+
+    def get_queryset(self):
+        return TaskImportJob.objects.filter(
+            created_by=self.request.user
+        ).order_by("-created_at")
+
+    def create(self, request, *args, **kwargs):
+        serializer = self.get_serializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+        job = serializer.save(created_by=request.user)
+
+        transaction.on_commit(lambda: import_tasks_csv.delay(job.id))
+
+        return Response(self.get_serializer(job).data, status=status.HTTP_202_ACCEPTED)
+
 
 # ============================================================
 # COMMENTS
 # ============================================================
-class CommentViewSet(viewsets.ModelViewSet):
-    queryset = Comment.objects.all().order_by("-created_at")
+class CommentViewSet(SearchMixin, viewsets.ModelViewSet):
+    queryset = Comment.objects.select_related(
+        "user__userprofile"
+    ).order_by("-created_at")
     serializer_class = CommentSerializer
     permission_classes = [AllowAny]  # desarrollo
+    pagination_class = KeysetPagination
 
-    def perform_create(self, serializer):
-        comment = serializer.save(user=self.request.user)
+    def search_queryset(self, queryset, query, mode):
+        # La búsqueda solo devuelve comentarios de tareas que el usuario ve
+        visible = tasks_for(self.request.user).values("id")
+        return search_comments(queryset.filter(task_id__in=visible), query, mode)
 
-        if comment.task.assigned_to:
-            Notification.objects.create(
-                user=comment.task.assigned_to,
-                task=comment.task,
-                type="comentario",
-                message=f"Nuevo comentario en: {comment.task.title}"
-            )
+    def perform_create(self, serializer):
+        # CommentSerializer.create emite CommentAdded
+        serializer.save(user=self.request.user)
 
 
 # ============================================================
 # ATTACHMENTS
 # ============================================================
 class AttachmentViewSet(viewsets.ModelViewSet):
-    queryset = TaskAttachment.objects.all().order_by("-uploaded_at")
+    queryset = TaskAttachment.objects.select_related(
+        "uploaded_by__userprofile"
+    ).order_by("-uploaded_at")
     serializer_class = TaskAttachmentSerializer
     permission_classes = [AllowAny]  # desarrollo
 
@@ -243,13 +450,54 @@ class AttachmentViewSet(viewsets.ModelViewSet):
 # ============================================================
 # NOTIFICATIONS
 # ============================================================
-class NotificationViewSet(viewsets.ReadOnlyModelViewSet):
+def notification_list_validator(request, queryset):
+    """
+    Validador del ETag del listado de notificaciones (ConditionalListMixin).
+    """
+    # Marcar como leída no cambia fechas, por eso va el total de no leídas.
+    # El texto se arma al leer con el título y estado actuales de la tarea:
+    # cualquier edición mueve task_updated
+    summary = queryset.order_by().aggregate(
+        last=Max("id"),
+        total=Count("id"),
+        unread=Count("id", filter=Q(is_read=False)),
+        task_updated=Max("task__updated_at"),
+    )
+    return summary["last"], summary["total"], summary["unread"], summary["task_updated"]
+
+
+class NotificationViewSet(ConditionalListMixin, viewsets.ReadOnlyModelViewSet):
     serializer_class = NotificationSerializer
     permission_classes = [IsAuthenticated]
+    pagination_class = KeysetPagination
+    list_validator = staticmethod(notification_list_validator)
+
+    @action(detail=False, methods=["get"])
+    def unread_count(self, request):
+        return Response({"unread": get_unread_count(request.user.id)})
+
+    @action(detail=False, methods=["get"])
+    def archived(self, request):
+        """
+        Historial archivado por el job de retención (admite cursor).
+        """
+        queryset = ArchivedNotification.objects.filter(
+            user=request.user
+        ).order_by("-created_at", "-id")
+
+        page = self.paginate_queryset(queryset)
+        if page is not None:
+            serializer = ArchivedNotificationSerializer(page, many=True)
+            return self.get_paginated_response(serializer.data)
+
+        serializer = ArchivedNotificationSerializer(queryset, many=True)
+        return Response(serializer.data)
 
     def get_queryset(self):
-        return Notification.objects.filter(
-            user=self.request.user
+        # task y actor alcanzan para armar el texto sin consultas extra
+        return with_read_state(
+            Notification.objects.filter(user=self.request.user)
+            .select_related("task__assigned_to", "actor")
         ).order_by("-created_at")
 
 
@@ -263,17 +511,49 @@ class NotificationActionsViewSet(viewsets.ViewSet):
             id=pk,
             user=request.user
         )
-        notification.is_read = True
-        notification.save()
+        if set_read_state(request.user.id, [notification.id], is_read=True):
+            transaction.on_commit(lambda: remove_unread(request.user.id))
+
         return Response({"message": "Notificación marcada como leída"})
     
     # 🔹 NUEVO: marcar todas
     @action(detail=False, methods=["post"])
     def mark_all_read(self, request):
-        # Marca todas las notificaciones no leídas del usuario como leídas
-        Notification.objects.filter(user=request.user, is_read=False).update(is_read=True)
+        # Mueve la marca de agua: una fila, sin importar cuántas haya
+        mark_all_notifications_read(request.user.id)
+        transaction.on_commit(lambda: reset_unread(request.user.id))
         return Response({"message": "Todas las notificaciones marcadas como leídas"})
 
+    @action(detail=False, methods=["post"])
+    def bulk(self, request):
+        """
+        Marca como leídas / no leídas o elimina en una sola operación
+        las notificaciones que coinciden con los ids o filtros.
+        """
+        serializer = NotificationBulkActionSerializer(data=request.data)
+        serializer.is_valid(raise_exception=True)
+
+        notifications = serializer.filter_queryset(
+            Notification.objects.filter(user=request.user)
+        )
+        bulk_action = serializer.validated_data["action"]
+
+        if bulk_action == "delete":
+            _, deleted = notifications.delete()
+            affected = deleted.get(Notification._meta.label, 0)
+        else:
+            affected = set_read_state(
+                request.user.id,
+                notifications.values("id"),
+                is_read=bulk_action == "read"
+            )
+
+        # El contador se recalcula en la próxima lectura
+        if affected:
+            transaction.on_commit(lambda: invalidate_unread(request.user.id))
+
+        return Response({"action": bulk_action, "affected": affected})
+
 
 # ============================================================
 # LOGIN CON EMAIL + JWT
@@ -283,17 +563,11 @@ class EmailLoginSerializer(serializers.Serializer):
     password = serializers.CharField()
 
     def validate(self, attrs):
-        email = attrs.get("email")
-        password = attrs.get("password")
-
-        try:
-            user_obj = User.objects.get(email=email)
-        except User.DoesNotExist:
-            raise serializers.ValidationError("Email o contraseña incorrectos")
-
+        # Una sola búsqueda por email (users.backends.EmailBackend)
         user = authenticate(
-            username=user_obj.username,
-            password=password
+            self.context.get("request"),
+            email=attrs.get("email"),
+            password=attrs.get("password")
         )
 
         if not user:
@@ -307,16 +581,12 @@ class EmailTokenObtainPairView(APIView):
     permission_classes = [AllowAny]
 
     def post(self, request):
-        serializer = EmailLoginSerializer(data=request.data)
+        serializer = EmailLoginSerializer(data=request.data, context={"request": request})
         serializer.is_valid(raise_exception=True)
 
         user = serializer.validated_data["user"]
-        refresh = RefreshToken.for_user(user)
-
-        try:
-            role = user.userprofile.role
-        except UserProfile.DoesNotExist:
-            role = None
+        refresh = tokens_for_user(user)
+        role = refresh[ROLE_CLAIM]
 
         return Response({
             "refresh": str(refresh),
@@ -342,18 +612,94 @@ def update_task_status(request, task_id):
             status=status.HTTP_400_BAD_REQUEST
         )
 
+    old_status = task.status
     task.status = new_status
     task.save()
 
-    if task.created_by != request.user:
-        Notification.objects.create(
-            user=task.created_by,
+    reschedule_task_reminders(
+        task,
+        old_due_date=task.due_date,
+        old_priority=task.priority,
+        old_status=old_status
+    )
+
+    if old_status != new_status:
+        emit(StatusChanged(
             task=task,
-            type="estado",
-            message=f"La tarea '{task.title}' cambió de estado"
-        )
+            actor=request.user,
+            old_status=old_status,
+            new_status=new_status
+        ))
 
     return Response(
         {"message": "Estado actualizado", "status": task.status},
         status=status.HTTP_200_OK
     )
+
+
+# ============================================================
+# EVENTOS EN TIEMPO REAL (SSE)
+# ============================================================
+def get_stream_user(request):
+    """
+    EventSource no permite mandar headers: el token JWT puede venir
+    en Authorization o como ?token=
+    """
+    auth = VersionedJWTAuthentication()
+    header = auth.get_header(request)
+    raw_token = auth.get_raw_token(header) if header else request.GET.get("token")
+
+    if not raw_token:
+        return None
+
+    try:
+        return auth.get_user(auth.get_validated_token(raw_token))
+    except (InvalidToken, AuthenticationFailed):
+        return None
+
+
+async def sse_messages(user_id):
+    layer = get_channel_layer()
+    subscription = layer.subscribe(user_channel(user_id))
+    heartbeat = settings.REALTIME["HEARTBEAT"]
+    pending = None
+
+    yield "retry: 5000\n\n"
+
+    try:
+        while True:
+            if pending is None:
+                pending = asyncio.ensure_future(anext(subscription))
+
+            done, _ = await asyncio.wait({pending}, timeout=heartbeat)
+            if not done:
+                # Mantiene viva la conexión a través de proxies
+                yield ": ping\n\n"
+                continue
+
+            message = pending.result()
+            pending = None
+            data = json.dumps(message["data"], cls=DjangoJSONEncoder)
+            yield f"event: {message['event']}\ndata: {data}\n\n"
+    finally:
+        if pending is not None:
+            pending.cancel()
+        await subscription.aclose()
+
+
+@transaction.non_atomic_requests
+async def event_stream(request):
+    user = await sync_to_async(get_stream_user)(request)
+    if user is None:
+        return JsonResponse(
+            {"detail": "Token inválido o ausente"},
+            status=status.HTTP_401_UNAUTHORIZED
+        )
+
+    response = StreamingHttpResponse(
+        sse_messages(user.id),
+        content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
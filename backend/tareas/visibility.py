@@ -0,0 +1,93 @@
+# tareas/visibility.py
+from django.db import transaction
+from django.db.models import Q
+
+from users.profile_cache import get_user_role
+
+from .models import Task, TaskDelegation, TaskVisibility
+
+
+# Campos de Task que dan visibilidad directa
+TASK_REASONS = {
+    "created_by_id": "creador",
+    "assigned_to_id": "asignado",
+    "delegated_to_id": "delegado",
+}
+
+# Campos de TaskDelegation (historial)
+DELEGATION_REASONS = {
+    "from_user_id": "delegacion_origen",
+    "to_user_id": "delegacion_destino",
+}
+
+
+def build_visibility_rows(task_ids):
+    """
+    Calcula las filas de TaskVisibility de un grupo de tareas
+    con dos consultas, sin instanciar modelos completos.
+    """
+    rows = set()
+
+    tasks = Task.objects.filter(id__in=task_ids).values("id", *TASK_REASONS)
+    for task in tasks:
+        for field, reason in TASK_REASONS.items():
+            if task[field]:
+                rows.add((task[field], task["id"], reason))
+
+    delegations = TaskDelegation.objects.filter(
+        task_id__in=task_ids
+    ).values("task_id", *DELEGATION_REASONS)
+    for delegation in delegations:
+        for field, reason in DELEGATION_REASONS.items():
+            if delegation[field]:
+                rows.add((delegation[field], delegation["task_id"], reason))
+
+    return [
+        TaskVisibility(user_id=user_id, task_id=task_id, reason=reason)
+        for user_id, task_id, reason in rows
+    ]
+
+
+def sync_task_visibility(task_ids):
+    """
+    Recalcula desde cero la visibilidad de las tareas indicadas.
+    Es idempotente: sirve tanto para mantenerla al día como para repararla.
+    """
+    task_ids = list(task_ids)
+    if not task_ids:
+        return 0
+
+    with transaction.atomic():
+        rows = build_visibility_rows(task_ids)
+        TaskVisibility.objects.filter(task_id__in=task_ids).delete()
+        TaskVisibility.objects.bulk_create(rows, ignore_conflicts=True)
+
+    return len(rows)
+
+
+def visible_tasks(user):
+    """
+    Tareas que ve un admin: un semi-join indexado sobre TaskVisibility,
+    sin OR ni DISTINCT.
+    """
+    return Task.objects.filter(
+        id__in=TaskVisibility.objects.filter(user=user).values("task_id")
+    )
+
+
+def tasks_for(user):
+    """
+    Tareas que puede ver el usuario según su rol: los admin por
+    TaskVisibility, el resto solo las asignadas o delegadas a él.
+    """
+    if not user or not user.is_authenticated:
+        return Task.objects.none()
+
+    if get_user_role(user) == "admin":
+        # creó, tiene asignada, le delegaron o participó en una delegación
+        return visible_tasks(user)
+
+    return Task.objects.filter(
+        Q(assigned_to=user) |
+        Q(delegated_to=user)
+    )
@@ -0,0 +1,19 @@
+# users/authentication.py
+from rest_framework_simplejwt.authentication import JWTAuthentication
+
+from .tokens import ROLE_CLAIM, check_token_version
+
+
+class VersionedJWTAuthentication(JWTAuthentication):
+    """
+    JWT que además valida la versión del perfil (desde el cache, sin
+    consultas) y deja el rol del token en `user.token_role` para que
+    get_user_role no tenga que buscarlo.
+    """
+
+    def get_user(self, validated_token):
+        check_token_version(validated_token)
+
+        user = super().get_user(validated_token)
+        user.token_role = validated_token.get(ROLE_CLAIM)
+        return user
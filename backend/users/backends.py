@@ -0,0 +1,26 @@
+# users/backends.py
+from django.contrib.auth.backends import ModelBackend
+from django.contrib.auth.models import User
+
+
+class EmailBackend(ModelBackend):
+    """
+    Login por email con una sola consulta (índice sobre auth_user.email).
+    El email no es único en auth_user: si se repite gana el más antiguo.
+    """
+
+    def authenticate(self, request, email=None, password=None, **kwargs):
+        if email is None or password is None:
+            return None
+
+        user = User.objects.filter(email__iexact=email).order_by("id").first()
+
+        if user is None:
+            # Mismo costo que un login válido para no revelar qué emails existen
+            User().set_password(password)
+            return None
+
+        if user.check_password(password) and self.user_can_authenticate(user):
+            return user
+
+        return None
@@ -0,0 +1,107 @@
+import statistics
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from django.contrib.auth.hashers import make_password
+from django.contrib.auth.models import User
+from django.core.management.base import BaseCommand
+from django.db import connection, reset_queries
+from django.test import Client
+from django.test.utils import override_settings
+
+from users.models import UserProfile
+
+
+PASSWORD = "bench-pass-123"
+
+
+class Command(BaseCommand):
+    help = (
+        "Mide /api/token/email/ y /api/token/refresh/ con varios clientes "
+        "en paralelo. Crea usuarios de prueba (confirmados, para que los "
+        "vean todos los hilos) y los borra al terminar."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--users", type=int, default=20)
+        parser.add_argument("--requests", type=int, default=200)
+        parser.add_argument("--concurrency", type=int, default=8)
+
+    def handle(self, *args, **options):
+        users = self.create_users(options["users"])
+
+        try:
+            with override_settings(DEBUG=True, ALLOWED_HOSTS=["*"]):
+                self.run(users, options)
+        finally:
+            User.objects.filter(id__in=[u.id for u in users]).delete()
+            self.stdout.write("Usuarios de prueba borrados.")
+
+    def run(self, users, options):
+        total = options["requests"]
+
+        def login(i):
+            user = users[i % len(users)]
+            # Mayúsculas a propósito: la búsqueda es case-insensitive
+            return Client().post(
+                "/api/token/email/",
+                {"email": user.email.upper(), "password": PASSWORD},
+                content_type="application/json",
+            )
+
+        self.report("POST /api/token/email/", login, total, options["concurrency"])
+
+        refresh_tokens = [login(i).json()["refresh"] for i in range(len(users))]
+
+        def refresh(i):
+            return Client().post(
+                "/api/token/refresh/",
+                {"refresh": refresh_tokens[i % len(refresh_tokens)]},
+                content_type="application/json",
+            )
+
+        self.report("POST /api/token/refresh/", refresh, total, options["concurrency"])
+        self.stdout.write(
+            "El login está dominado por el hash de la contraseña (PBKDF2), "
+            "no por la base: comparar la cantidad de consultas, no solo la latencia."
+        )
+
+    def report(self, label, func, total, concurrency):
+        def timed(i):
+            reset_queries()
+            start = time.perf_counter()
+            response = func(i)
+            elapsed = (time.perf_counter() - start) * 1000
+            return elapsed, len(connection.queries), response.status_code
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as pool:
+            results = list(pool.map(timed, range(total)))
+        wall = time.perf_counter() - started
+
+        timings = sorted(r[0] for r in results)
+        errors = sum(1 for r in results if r[2] != 200)
+
+        self.stdout.write(
+            f"{label:<28} mediana {statistics.median(timings):7.1f} ms   "
+            f"p95 {timings[int(len(timings) * 0.95) - 1]:7.1f} ms   "
+            f"máx {timings[-1]:7.1f} ms   "
+            f"{total / wall:7.1f} req/s   "
+            f"consultas/req {statistics.mean(r[1] for r in results):4.1f}   "
+            f"errores {errors}"
+        )
+
+    def create_users(self, count):
+        prefix = f"bench_auth_{int(time.time())}"
+        # Un solo hash para todos: crear usuarios no es lo que se mide
+        password = make_password(PASSWORD)
+
+        User.objects.bulk_create([
+            User(username=f"{prefix}_{i}", email=f"{prefix}_{i}@bench.local", password=password)
+            for i in range(count)
+        ])
+        users = list(User.objects.filter(username__startswith=prefix).order_by("id"))
+
+        # bulk_create no dispara la señal que crea el perfil
+        UserProfile.objects.bulk_create([UserProfile(user=u, role="empleado") for u in users])
+        return users
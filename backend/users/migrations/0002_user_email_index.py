@@ -0,0 +1,33 @@
+# Login por email: EmailLoginSerializer busca User por email.
+# auth_user no tiene índice en esa columna y el modelo no es nuestro,
+# así que el índice se crea a mano desde esta app.
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+EMAIL_INDEX = models.Index(fields=['email'], name='users_auth_user_email_idx')
+
+
+def get_user_model(apps):
+    return apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+
+
+def add_email_index(apps, schema_editor):
+    schema_editor.add_index(get_user_model(apps), EMAIL_INDEX)
+
+
+def remove_email_index(apps, schema_editor):
+    schema_editor.remove_index(get_user_model(apps), EMAIL_INDEX)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('users', '0001_initial'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.RunPython(add_email_index, remove_email_index),
+    ]
@@ -12,6 +12,9 @@ class UserProfile(models.Model):
     created_by = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='created_users')
     assigned_to = models.ForeignKey(User, on_delete=models.SET_NULL, null=True, blank=True, related_name='assigned_employees')
 
+    # Va en el JWT: si cambia (rol, contraseña, baja) los tokens viejos dejan de valer
+    version = models.PositiveIntegerField(default=1)
+
 
     def __str__(self):
         return f"{self.user.username} - {self.role}"
@@ -0,0 +1,137 @@
+# users/profile_cache.py
+import threading
+import time
+from collections import OrderedDict
+
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import transaction
+
+from .models import UserProfile
+
+
+# Se sube si cambia la forma de lo guardado: las claves viejas quedan huérfanas
+PROFILE_CACHE_KEY_VERSION = 1
+
+
+def profile_key(user_id):
+    return f"users:profile:v{PROFILE_CACHE_KEY_VERSION}:{user_id}"
+
+
+# =========================
+# LRU EN PROCESO
+# =========================
+class LocalLRU:
+    """
+    LRU chico por proceso con vencimiento corto: evita ir a Redis en
+    cada acceso dentro del mismo worker, y el TTL acota cuánto puede
+    quedar desactualizado un worker al que no le llegó la invalidación.
+    """
+
+    def __init__(self):
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+
+            expires_at, value = item
+            if expires_at < time.monotonic():
+                del self._data[key]
+                return None
+
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key, value):
+        config = settings.PROFILE_CACHE
+
+        with self._lock:
+            self._data[key] = (time.monotonic() + config["LOCAL_TTL"], value)
+            self._data.move_to_end(key)
+            while len(self._data) > config["LOCAL_SIZE"]:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        with self._lock:
+            self._data.pop(key, None)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+local_profiles = LocalLRU()
+
+
+# =========================
+# LECTURA
+# =========================
+def load_profile_data(user_id):
+    row = UserProfile.objects.filter(user_id=user_id).values(
+        "role", "assigned_to_id", "version"
+    ).first()
+    if row is None:
+        return {"role": None, "assigned_to": None, "version": None}
+    return {"role": row["role"], "assigned_to": row["assigned_to_id"], "version": row["version"]}
+
+
+def get_profile_data(user_id):
+    """
+    Rol, admin asignado y versión del perfil: LRU local, después Redis
+    y recién al final la base.
+    """
+    key = profile_key(user_id)
+
+    data = local_profiles.get(key)
+    if data is not None:
+        return data
+
+    data = cache.get(key)
+    if data is None:
+        data = load_profile_data(user_id)
+        cache.set(key, data, settings.PROFILE_CACHE["TIMEOUT"])
+
+    local_profiles.set(key, data)
+    return data
+
+
+def get_user_role(user, default=None):
+    """
+    Rol del usuario. Si vino en el JWT (VersionedJWTAuthentication) o el
+    perfil ya está cargado con select_related, no se consulta nada.
+    """
+    if user is None or not user.pk:
+        return default
+
+    token_role = getattr(user, "token_role", None)
+    if token_role:
+        return token_role
+
+    if User.userprofile.is_cached(user):
+        profile = getattr(user, "userprofile", None)
+        return profile.role if profile else default
+
+    return get_profile_data(user.pk)["role"] or default
+
+
+# =========================
+# INVALIDACIÓN
+# =========================
+def invalidate_profile(user_id):
+    """
+    Borra ahora y otra vez al hacer commit: así un request concurrente
+    no deja cacheado el valor anterior mientras la transacción sigue abierta.
+    """
+    key = profile_key(user_id)
+
+    def clear():
+        local_profiles.delete(key)
+        cache.delete(key)
+
+    clear()
+    transaction.on_commit(clear)
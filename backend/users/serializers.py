@@ -1,6 +1,7 @@
 from rest_framework import serializers
 from django.contrib.auth.models import User
 from users.models import UserProfile
+from users.profile_cache import get_user_role, invalidate_profile
 
 class UserSerializer(serializers.ModelSerializer):
     role = serializers.CharField(write_only=True, required=False)
@@ -36,8 +37,7 @@ class UserSerializer(serializers.ModelSerializer):
         }
 
     def get_role_display(self, obj):
-        profile = getattr(obj, "userprofile", None)
-        return profile.role if profile else "empleado"
+        return get_user_role(obj, default="empleado")
 
     def get_assigned_to(self, obj):
         profile = getattr(obj, "userprofile", None)
@@ -81,4 +81,8 @@ class UserSerializer(serializers.ModelSerializer):
         profile.assigned_to = assigned_to
         profile.save()
 
+        # La señal ya invalida, pero se deja explícito por si el perfil
+        # se actualiza alguna vez sin save()
+        invalidate_profile(instance.id)
+
         return instance
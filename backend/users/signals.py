@@ -1,7 +1,9 @@
-from django.db.models.signals import post_save
+from django.db.models import F
+from django.db.models.signals import pre_save, post_save, post_delete
 from django.dispatch import receiver
 from django.contrib.auth.models import User
 from .models import UserProfile
+from .profile_cache import invalidate_profile
 
 @receiver(post_save, sender=User)
 def create_user_profile(sender, instance, created, **kwargs):
@@ -13,3 +15,35 @@ def create_user_profile(sender, instance, created, **kwargs):
             role = 'empleado'
 
         UserProfile.objects.create(user=instance, role=role)
+
+
+@receiver(post_save, sender=UserProfile)
+@receiver(post_delete, sender=UserProfile)
+def clear_cached_profile(sender, instance, **kwargs):
+    # Rol o admin asignado pueden haber cambiado
+    invalidate_profile(instance.user_id)
+
+
+# =========================
+# VERSIÓN DEL PERFIL (JWT)
+# =========================
+@receiver(pre_save, sender=UserProfile)
+def bump_version_on_role_change(sender, instance, **kwargs):
+    if instance.pk is None:
+        return
+
+    old = UserProfile.objects.filter(pk=instance.pk).values("role", "version").first()
+    if old and old["role"] != instance.role:
+        instance.version = old["version"] + 1
+
+
+@receiver(pre_save, sender=User)
+def bump_version_on_credentials_change(sender, instance, update_fields=None, **kwargs):
+    # last_login y similares no cambian nada del token
+    if instance.pk is None or (update_fields and not {"password", "is_active"} & set(update_fields)):
+        return
+
+    old = User.objects.filter(pk=instance.pk).values("password", "is_active").first()
+    if old and (old["password"] != instance.password or old["is_active"] != instance.is_active):
+        UserProfile.objects.filter(user_id=instance.pk).update(version=F("version") + 1)
+        invalidate_profile(instance.pk)
@@ -1,3 +1,97 @@
-from django.test import TestCase
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from rest_framework.test import APITestCase
+from rest_framework_simplejwt.tokens import AccessToken
 
-# Create your tests here.
+from .profile_cache import get_user_role, local_profiles
+from .tokens import ROLE_CLAIM, VERSION_CLAIM
+
+
+# =========================
+# CACHE DE PERFIL / ROL
+# =========================
+class ProfileCacheTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        local_profiles.clear()
+
+        self.admin = User.objects.create_user("admin", "admin@test.com", "pass")
+        self.admin.userprofile.role = "admin_general"
+        self.admin.userprofile.save()
+
+        self.employee = User.objects.create_user("empleado", "empleado@test.com", "pass")
+        self.client.force_authenticate(self.admin)
+
+    def fresh(self, user):
+        # Sin el perfil precargado en la instancia
+        return User.objects.get(id=user.id)
+
+    def test_role_lookups_hit_the_cache(self):
+        self.assertEqual(get_user_role(self.fresh(self.employee)), "empleado")
+
+        user = self.fresh(self.employee)
+        with self.assertNumQueries(0):
+            self.assertEqual(get_user_role(user), "empleado")
+
+        local_profiles.clear()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_user_role(user), "empleado")
+
+    def test_update_invalidates_cached_role(self):
+        self.assertEqual(get_user_role(self.fresh(self.employee)), "empleado")
+
+        response = self.client.patch(
+            f"/api/users/{self.employee.id}/", {"role": "admin", "is_active": True}
+        )
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(get_user_role(self.fresh(self.employee)), "admin")
+
+
+# =========================
+# LOGIN POR EMAIL / JWT CON ROL
+# =========================
+class TokenVersionTests(APITestCase):
+
+    def setUp(self):
+        cache.clear()
+        local_profiles.clear()
+
+        self.user = User.objects.create_user("empleado", "Empleado@Test.com", "pass")
+
+    def login(self):
+        response = self.client.post(
+            "/api/token/email/", {"email": "empleado@test.com", "password": "pass"}, format="json"
+        )
+        self.assertEqual(response.status_code, 200)
+        return response.data
+
+    def test_email_login_is_case_insensitive_and_carries_role(self):
+        data = self.login()
+        token = AccessToken(data["access"])
+
+        self.assertEqual(token[ROLE_CLAIM], "empleado")
+        self.assertEqual(token[VERSION_CLAIM], 1)
+
+        response = self.client.post(
+            "/api/token/email/", {"email": "empleado@test.com", "password": "mal"}, format="json"
+        )
+        self.assertEqual(response.status_code, 400)
+
+    def test_role_change_rejects_old_tokens(self):
+        data = self.login()
+        self.client.credentials(HTTP_AUTHORIZATION=f"Bearer {data['access']}")
+        self.assertEqual(self.client.get("/api/tasks/").status_code, 200)
+
+        profile = self.user.userprofile
+        profile.role = "admin"
+        profile.save()
+
+        # 403 y no 401 porque SessionAuthentication va primero (el frontend trata ambos igual)
+        self.assertIn(self.client.get("/api/tasks/").status_code, (401, 403))
+
+        self.client.credentials()
+        response = self.client.post("/api/token/refresh/", {"refresh": data["refresh"]}, format="json")
+        self.assertEqual(response.status_code, 401)
+
+        self.assertEqual(AccessToken(self.login()["access"])[ROLE_CLAIM], "admin")
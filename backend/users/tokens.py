@@ -0,0 +1,77 @@
+# users/tokens.py
+from django.utils.translation import gettext_lazy as _
+from rest_framework_simplejwt.exceptions import InvalidToken
+from rest_framework_simplejwt.serializers import TokenObtainPairSerializer, TokenRefreshSerializer
+from rest_framework_simplejwt.settings import api_settings
+from rest_framework_simplejwt.tokens import RefreshToken
+
+from .profile_cache import get_profile_data
+
+
+ROLE_CLAIM = "role"
+VERSION_CLAIM = "ver"
+
+
+def add_profile_claims(token, user):
+    profile = get_profile_data(user.id)
+    token[ROLE_CLAIM] = profile["role"]
+    token[VERSION_CLAIM] = profile["version"]
+    return token
+
+
+def tokens_for_user(user):
+    """
+    Refresh + access con rol y versión del perfil como claims
+    (el access copia los claims del refresh).
+    """
+    return add_profile_claims(RefreshToken.for_user(user), user)
+
+
+def check_token_version(token):
+    """
+    Rechaza el token si la versión del perfil cambió desde que se emitió.
+    Los tokens emitidos antes de existir el claim se aceptan hasta que vencen.
+    """
+    if VERSION_CLAIM not in token:
+        return
+
+    profile = get_profile_data(token[api_settings.USER_ID_CLAIM])
+    if token[VERSION_CLAIM] != profile["version"]:
+        raise InvalidToken(_("El perfil del usuario cambió, volvé a iniciar sesión."))
+
+
+class RoleTokenObtainPairSerializer(TokenObtainPairSerializer):
+    @classmethod
+    def get_token(cls, user):
+        return add_profile_claims(super().get_token(user), user)
+
+
+class VersionedTokenRefreshSerializer(TokenRefreshSerializer):
+    """
+    Con el claim de versión no hace falta traer al usuario: una baja o un
+    cambio de contraseña o de rol suben la versión y el refresh se rechaza.
+    """
+
+    def validate(self, attrs):
+        refresh = self.token_class(attrs["refresh"])
+
+        if VERSION_CLAIM not in refresh:
+            return super().validate(attrs)
+
+        check_token_version(refresh)
+        data = {"access": str(refresh.access_token)}
+
+        if api_settings.ROTATE_REFRESH_TOKENS:
+            if api_settings.BLACKLIST_AFTER_ROTATION:
+                try:
+                    refresh.blacklist()
+                except AttributeError:
+                    pass
+
+            refresh.set_jti()
+            refresh.set_exp()
+            refresh.set_iat()
+            refresh.outstand()
+            data["refresh"] = str(refresh)
+
+        return data
@@ -2,6 +2,7 @@ from rest_framework import viewsets
 from rest_framework.permissions import IsAuthenticated
 from django.contrib.auth.models import User
 from .serializers import UserSerializer
+from .profile_cache import get_user_role
 
 class UserViewSet(viewsets.ModelViewSet):
     serializer_class = UserSerializer
@@ -9,7 +10,7 @@ class UserViewSet(viewsets.ModelViewSet):
 
     def get_queryset(self):
         user = self.request.user
-        role = getattr(user.userprofile, "role", "empleado")
+        role = get_user_role(user, default="empleado")
 
         # ADMIN GENERAL → ve TODOS los usuarios
         if role == "admin_general":
@@ -1,50 +1,9 @@
-import React, { useEffect, useState } from "react";
+import React from "react";
 import { FiList, FiCheckCircle, FiClock, FiTrendingUp, FiAlertTriangle } from "react-icons/fi";
-import api from "../services/api";
 
-export default function DashboardCards() {
-  const [tasks, setTasks] = useState([]);
-  const [stats, setStats] = useState(null);
-  const [loading, setLoading] = useState(true);
-
-  // Traer tareas del backend
-  useEffect(() => {
-    async function fetchTasks() {
-      try {
-        const res = await api.get("/tasks/");
-        setTasks(res.data);
-      } catch (err) {
-        console.error("Error al cargar tareas:", err);
-      }
-    }
-    fetchTasks();
-  }, []);
-
-  // Calcular estadísticas
-  useEffect(() => {
-    if (!tasks.length) return;
-
-    const now = new Date();
-    const upcomingThreshold = new Date(now.getTime() + 7 * 24 * 60 * 60 * 1000);
-
-    const statsObj = tasks.reduce(
-      (acc, t) => {
-        const due = new Date(t.due_date);
-        acc.total += 1;
-        if (t.status === "completada") acc.completed += 1;
-        if (t.status !== "completada" && due < now) acc.overdue += 1;
-        if ((t.status === "pendiente" || t.status === "en_progreso") && due >= now) acc.active += 1;
-        if ((t.status === "pendiente" || t.status === "en_progreso") && due >= now && due <= upcomingThreshold) acc.upcoming += 1;
-        return acc;
-      },
-      { total: 0, active: 0, overdue: 0, upcoming: 0, completed: 0 }
-    );
-
-    setStats(statsObj);
-    setLoading(false);
-  }, [tasks]);
-
-  if (loading || !stats) {
+// Los conteos llegan de Dashboard, que los trae de /tasks/stats/
+export default function DashboardCards({ stats }) {
+  if (!stats) {
     return <div className="text-gray-600 text-center py-10">Cargando estadísticas...</div>;
   }
 
@@ -16,6 +16,7 @@ export default function Navbar({ setIsAuthenticated }) {
 
   const [notificationsOpen, setNotificationsOpen] = useState(false);
   const [notifications, setNotifications] = useState([]);
+  const [unreadCount, setUnreadCount] = useState(0);
   const [loadingNotifications, setLoadingNotifications] = useState(false);
 
   const notifRef = useRef(null);
@@ -35,6 +36,7 @@ export default function Navbar({ setIsAuthenticated }) {
         (a, b) => new Date(b.created_at) - new Date(a.created_at)
       );
       setNotifications(sorted);
+      setUnreadCount(sorted.filter((n) => !n.is_read).length);
     } catch (err) {
       console.error("Error al traer notificaciones", err);
     } finally {
@@ -42,12 +44,24 @@ export default function Navbar({ setIsAuthenticated }) {
     }
   };
 
+  // El badge solo necesita el contador: el listado se pide al abrir
+  const fetchUnreadCount = async () => {
+    try {
+      const res = await api.get("notifications/unread_count/");
+      setUnreadCount(res.data.unread);
+    } catch (err) {
+      console.error("Error al traer el contador de notificaciones", err);
+    }
+  };
+
   const markAsRead = async (id) => {
     try {
       await api.post(`notifications/${id}/mark-read/`);
+      const wasUnread = notifications.some((n) => n.id === id && !n.is_read);
       setNotifications((prev) =>
         prev.map((n) => (n.id === id ? { ...n, is_read: true } : n))
       );
+      if (wasUnread) setUnreadCount((c) => Math.max(c - 1, 0));
     } catch (err) {
       console.error("Error al marcar notificación", err);
     }
@@ -55,20 +69,17 @@ export default function Navbar({ setIsAuthenticated }) {
 
   const markAllAsRead = async () => {
     try {
-      await Promise.all(
-        notifications.filter(n => !n.is_read).map(n => api.post(`notifications/${n.id}/mark-read/`))
-      );
+      await api.post("notifications/mark-all-read/");
       setNotifications((prev) => prev.map(n => ({ ...n, is_read: true })));
+      setUnreadCount(0);
     } catch (err) {
       console.error("Error al marcar todas las notificaciones", err);
     }
   };
 
-  const unreadCount = notifications.filter((n) => !n.is_read).length;
-
   useEffect(() => {
-    fetchNotifications();
-    const interval = setInterval(fetchNotifications, 10000);
+    fetchUnreadCount();
+    const interval = setInterval(fetchUnreadCount, 10000);
     return () => clearInterval(interval);
   }, []);
 
@@ -28,27 +28,14 @@ const CONFIG = {
   },
 };
 
-export default function TaskStatusChart({ tasks = [] }) {
-  const now = new Date();
-
+// Conteos de /tasks/stats/ (los pasa Dashboard): sin recorrer tareas en el navegador
+export default function TaskStatusChart({ stats }) {
   const counts = {
-    completed: 0,
-    active: 0,
-    overdue: 0,
+    completed: stats?.completed || 0,
+    active: stats?.active || 0,
+    overdue: stats?.overdue || 0,
   };
 
-  tasks.forEach((t) => {
-    const due = new Date(t.due_date);
-
-    if (t.status === "completada") {
-      counts.completed++;
-    } else if (due < now) {
-      counts.overdue++;
-    } else {
-      counts.active++;
-    }
-  });
-
   const total = Object.values(counts).reduce((a, b) => a + b, 0);
 
   const data = Object.entries(counts)
@@ -1,4 +1,4 @@
-import React, { useEffect, useState } from "react";
+import React from "react";
 import {
   BarChart,
   Bar,
@@ -9,54 +9,20 @@ import {
   Legend,
   CartesianGrid,
 } from "recharts";
-import api from "../services/api";
-
-export default function TasksGroupedBarChart() {
-  const [data, setData] = useState([]);
 
+// `data` es by_month de /tasks/stats/: [{ month: "2025-03", alta, media, baja }]
+export default function TasksGroupedBarChart({ data: months }) {
   const COLORS = {
     alta: "#ff7f50",  // naranja suave
     media: "#facc15", // amarillo
     baja: "#34d399",  // verde
   };
 
-  useEffect(() => {
-    const fetchTasks = async () => {
-      try {
-        const res = await api.get("/tasks/");
-        const monthCounts = {};
-
-        res.data.forEach((t) => {
-          const date = new Date(t.due_date);
-          const monthKey = `${date.getFullYear()}-${(date.getMonth() + 1)
-            .toString()
-            .padStart(2, "0")}`;
-
-          if (!monthCounts[monthKey]) monthCounts[monthKey] = { alta: 0, media: 0, baja: 0 };
-          monthCounts[monthKey][t.priority] += 1;
-        });
-
-        // Filtrar solo meses con al menos una tarea
-        const filteredKeys = Object.keys(monthCounts).filter(
-          (key) => monthCounts[key].alta + monthCounts[key].media + monthCounts[key].baja > 0
-        );
-
-        const sortedData = filteredKeys
-          .sort((a, b) => new Date(a + "-01") - new Date(b + "-01"))
-          .map((key) => {
-            const [year, month] = key.split("-");
-            const monthName = new Date(year, month - 1).toLocaleString("es-ES", { month: "short" });
-            return { name: monthName, ...monthCounts[key] };
-          });
-
-        setData(sortedData);
-      } catch (err) {
-        console.error("Error al traer tareas:", err);
-      }
-    };
-
-    fetchTasks();
-  }, []);
+  const data = (months || []).map(({ month, ...counts }) => {
+    const [year, monthNumber] = month.split("-");
+    const monthName = new Date(year, monthNumber - 1).toLocaleString("es-ES", { month: "short" });
+    return { name: monthName, ...counts };
+  });
 
   if (!data.length) return <p className="text-gray-500 text-center">Cargando gráfico...</p>;
 
@@ -35,18 +35,16 @@ export default function UpcomingDue({ tasks, fullHeight = false }) {
     return Math.ceil((dueDate - today) / (1000 * 60 * 60 * 24));
   };
 
+  // Las tareas ya llegan filtradas (próximos 7 días) y ordenadas por vencimiento
   useEffect(() => {
-    const processed = (tasks || [])
-      .map((task) => {
-        const due_in_days = calculateDueInDays(task.due_date);
-        return {
-          ...task,
-          due_in_days,
-          due_in: `${due_in_days} ${due_in_days === 1 ? "día" : "días"}`,
-        };
-      })
-      .filter((task) => task.due_in_days >= 0 && task.due_in_days <= 7)
-      .sort((a, b) => a.due_in_days - b.due_in_days);
+    const processed = (tasks || []).map((task) => {
+      const due_in_days = calculateDueInDays(task.due_date);
+      return {
+        ...task,
+        due_in_days,
+        due_in: `${due_in_days} ${due_in_days === 1 ? "día" : "días"}`,
+      };
+    });
 
     setUpcomingTasks(processed);
   }, [tasks]);
@@ -7,39 +7,45 @@ import PriorityBreakdown from "../components/PriorityBreakdown";
 import UpcomingDue from "../components/UpcomingDue";
 import RecentActivity from "../components/RecentActivity";
 
+// YYYY-MM-DD en hora local, como espera el filtro de fechas del backend
+const isoDate = (date) => {
+  const pad = (n) => String(n).padStart(2, "0");
+  return `${date.getFullYear()}-${pad(date.getMonth() + 1)}-${pad(date.getDate())}`;
+};
+
 export default function Dashboard() {
   const [stats, setStats] = useState(null);
-  const [tasks, setTasks] = useState([]);
   const [upcoming, setUpcoming] = useState([]);
 
   useEffect(() => {
     async function fetchData() {
       try {
-        const { data } = await api.get("/tasks/");
-        setTasks(data);
-
         const now = new Date();
-        const tasksWithDays = data.map((t) => ({
-          ...t,
-          due_in_days: Math.ceil((new Date(t.due_date) - now) / (1000 * 60 * 60 * 24)),
-        }));
-
-        const upcomingTasks = tasksWithDays
-          .filter((t) => t.due_in_days >= 0 && t.due_in_days <= 7)
-          .map((t) => ({
+        const weekEnd = new Date(now);
+        weekEnd.setDate(weekEnd.getDate() + 7);
+
+        // Conteos agregados por el backend; de tareas solo bajan las que vencen en 7 días
+        const [{ data }, { data: dueSoon }] = await Promise.all([
+          api.get("/tasks/stats/"),
+          api.get("/tasks/", {
+            params: { due_from: isoDate(now), due_to: isoDate(weekEnd), ordering: "due_date" },
+          }),
+        ]);
+
+        setUpcoming(
+          dueSoon.map((t) => ({
             ...t,
             priority: t.priority.charAt(0).toUpperCase() + t.priority.slice(1),
           }))
-          .sort((a, b) => a.due_in_days - b.due_in_days);
-
-        setUpcoming(upcomingTasks);
+        );
 
         setStats({
-          total: data.length,
-          completed: data.filter((t) => t.status === "completada").length,
-          overdue: data.filter((t) => new Date(t.due_date) < now && t.status !== "completada").length,
-          active: data.filter((t) => new Date(t.due_date) >= now && t.status !== "completada").length,
-          upcoming: upcomingTasks.length,
+          total: data.total,
+          completed: data.by_status.completada,
+          overdue: data.overdue,
+          active: data.active,
+          upcoming: data.due_next_7_days,
+          byMonth: data.by_month,
         });
       } catch (err) {
         console.error("Error al cargar datos:", err);
@@ -66,7 +72,7 @@ export default function Dashboard() {
                           shadow-[0_10px_15px_-3px_rgba(251,146,60,0.4),0_4px_6px_-2px_rgba(251,146,60,0.3)]
                           hover:shadow-[0_25px_50px_-12px_rgba(251,146,60,0.4),0_10px_10px_-5px_rgba(251,146,60,0.3)]
                           transition-shadow duration-300">
-            <TasksChart />
+            <TasksChart data={stats?.byMonth} />
           </div>
 
           {/* ACTIVIDAD RECIENTE */}
@@ -86,7 +92,7 @@ export default function Dashboard() {
                           shadow-[0_10px_15px_-3px_rgba(251,146,60,0.4),0_4px_6px_-2px_rgba(251,146,60,0.3)]
                           hover:shadow-[0_25px_50px_-12px_rgba(251,146,60,0.4),0_10px_10px_-5px_rgba(251,146,60,0.3)]
                           transition-shadow duration-300">
-            <PriorityBreakdown tasks={tasks} compact />
+            <PriorityBreakdown stats={stats} compact />
           </div>
 
           {/* PRÓXIMOS VENCIMIENTOS */}
@@ -40,7 +40,13 @@ const EmployeeTaskList = () => {
         const token = localStorage.getItem("access");
         if (!token) throw new Error("No se encontró token");
 
-        const response = await api.get("/tasks/");
+        // Filtra y ordena el backend: solo llegan las tareas que se muestran
+        const params = { ordering: "-created_at" };
+        if (statusFilter === "vencida") params.overdue = true;
+        else if (statusFilter) params.status = statusFilter;
+        if (priorityFilter) params.priority = priorityFilter;
+
+        const response = await api.get("/tasks/", { params });
 
         const tasksFromBackend = response.data.map((t) => ({
           ...t,
@@ -51,11 +57,6 @@ const EmployeeTaskList = () => {
           comments: t.comments || [],
         }));
 
-        // Ordenar por fecha de creación (más recientes primero)
-        tasksFromBackend.sort(
-          (a, b) => new Date(b.created_at) - new Date(a.created_at)
-        );
-
         setTasks(tasksFromBackend);
       } catch (error) {
         console.error("Error al traer tareas:", error);
@@ -66,7 +67,7 @@ const EmployeeTaskList = () => {
     };
 
     fetchTasks();
-  }, []);
+  }, [statusFilter, priorityFilter]);
 
   const openModal = (task) => {
     setSelectedTask(task);
@@ -92,16 +93,6 @@ const EmployeeTaskList = () => {
       .replace(/\b\w/g, (c) => c.toUpperCase());
   };
 
-  const filteredTasks = tasks.filter((task) => {
-    const statusMatch =
-      statusFilter === "" ||
-      task.status === statusFilter ||
-      (statusFilter === "vencida" && isOverdue(task.due_date));
-    const priorityMatch =
-      priorityFilter === "" || task.priority === priorityFilter;
-    return statusMatch && priorityMatch;
-  });
-
   if (loading)
     return (
       <p className="text-orange-700 font-medium p-6 text-center">
@@ -153,8 +144,8 @@ const EmployeeTaskList = () => {
 
       {/* LISTA DE TAREAS */}
       <div className="grid grid-cols-1 md:grid-cols-2 lg:grid-cols-3 gap-6">
-        {filteredTasks.length > 0 ? (
-          filteredTasks.map((task) => {
+        {tasks.length > 0 ? (
+          tasks.map((task) => {
             const leftDays = daysLeft(task.due_date);
             const urgent =
               leftDays !== null && leftDays <= 7 && !isOverdue(task.due_date);
@@ -25,9 +25,22 @@ export default function TasksManagement() {
     setTimeout(() => setToast(""), duration);
   };
 
+  const [filters, setFilters] = useState({
+    priority: "",
+    status: "",
+    assigned_to: "",
+  });
+
+  // Los filtros van como parámetros: el backend devuelve solo esas tareas
   const fetchTasks = async () => {
     try {
-      const res = await api.get("/tasks/");
+      const params = {};
+      if (filters.priority) params.priority = filters.priority;
+      if (filters.status === "vencida") params.overdue = true;
+      else if (filters.status) params.status = filters.status;
+      if (filters.assigned_to) params.assigned_to = filters.assigned_to;
+
+      const res = await api.get("/tasks/", { params });
       setTasks(res.data);
     } catch (err) {
       console.error("Error al traer tareas:", err);
@@ -43,11 +56,14 @@ export default function TasksManagement() {
     }
   };
 
+  useEffect(() => {
+    fetchUsers();
+  }, []);
+
   useEffect(() => {
   
-     // carga inicial
+     // carga inicial (y cada vez que cambian los filtros)
       fetchTasks();
-      fetchUsers();
 
       // polling de tareas cada 5 segundos
       const interval = setInterval(() => {
@@ -57,7 +73,7 @@ export default function TasksManagement() {
       // limpieza
       return () => clearInterval(interval);
 
-  }, []);
+  }, [filters]);
 
  const addTask = async (taskData) => {
   try {
@@ -107,23 +123,6 @@ export default function TasksManagement() {
     return words.slice(0, numWords).join(" ") + "...";
   };
 
-  const [filters, setFilters] = useState({
-    priority: "",
-    status: "",
-    assigned_to: "",
-  });
-
-  const filteredTasks = tasks.filter((task) => {
-    if (filters.priority && task.priority !== filters.priority) return false;
-    const isOverdue = new Date(task.due_date) < new Date() && task.status !== "completada";
-    if (filters.status) {
-      if (filters.status === "vencida" && !isOverdue) return false;
-      else if (filters.status !== "vencida" && task.status !== filters.status) return false;
-    }
-    if (filters.assigned_to && task.assigned_to?.id.toString() !== filters.assigned_to) return false;
-    return true;
-  });
-
   return (
     <div className="bg-orange-50 min-h-screen p-4">
       {/* Sticky header */}
@@ -188,11 +187,11 @@ export default function TasksManagement() {
 
       {/* LISTADO */}
       <div className="space-y-2 pb-8 mt-2">
-        {filteredTasks.length === 0 && (
+        {tasks.length === 0 && (
           <p className="text-center text-gray-500">No hay tareas cargadas.</p>
         )}
 
-        {filteredTasks.map((task) => {
+        {tasks.map((task) => {
           const isOverdue = new Date(task.due_date) < new Date() && task.status !== "completada";
 
           return (